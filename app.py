@@ -2,21 +2,25 @@ import base64
 import zipfile
 import io
 import time
-import nest_asyncio
 import streamlit as st
-import asyncio
+import queue
 import datetime
 
 from data_fetchers.stock_data_handler.stock_data_handler import StockDataHandler
-from logic.download_data.download_data import HistoricalDataDownloader
+from logic.download_data.export_writers import EXPORT_FORMATS
+from logic.cache.symbol_registry import get_symbol_registry
 from utils.remove_streamlit_logo_and_footer import remove_streamlit_logo_and_footer
 from utils.set_black_background import set_black_background
+from utils.event_loop import run_coroutine, submit
+from utils.metrics import start_metrics_server
+from utils.performance_panel import render_performance_panel
 from constants.nifty_50_stock_symbols import NIFTY_50_STOCKS
 from streamlit_autorefresh import st_autorefresh
 from logging_config import logger
 
-# Allow nested event loops (needed for async code in Streamlit)
-nest_asyncio.apply()
+# Columns offered for export (the index/date is always included)
+EXPORT_COLUMNS = ["Open", "High", "Low", "Close", "Volume", "Dividends", "Stock Splits",
+                  "RSI_14", "RSI_9", "CCI_20", "ADX_20", "WT1", "WT2", "LC_Prediction"]
 
 # ----------------------------------------
 # Page Configuration & Global Styling
@@ -31,12 +35,22 @@ set_black_background()
 
 logger.info("Page configured and styling applied.")
 
+# Prometheus scrape endpoint, when METRICS_PORT is set (started once per process)
+start_metrics_server()
+
 # ---------------------------------------
 # Sidebar: Stock Selection & Parameters
 # ---------------------------------------
 st.sidebar.header("⚡ Stock Selection")
 selected_stock = st.sidebar.selectbox("Select NIFTY 50 Stock", list(NIFTY_50_STOCKS.keys()))
 manual_stock_input = st.sidebar.text_input("Or enter a different stock symbol (e.g., TSLA, AAPL)").strip().upper()
+if manual_stock_input and get_symbol_registry().lookup(manual_stock_input) is None:
+    # Unknown symbol: suggest known tickers instead of waiting on a failed lookup
+    suggestions = get_symbol_registry().search(manual_stock_input)
+    if suggestions:
+        st.sidebar.caption("Did you mean: " + ", ".join(
+            f"{symbol} ({name})" if name else symbol for symbol, name in suggestions
+        ))
 ticker_symbol = manual_stock_input if manual_stock_input else NIFTY_50_STOCKS[selected_stock]
 
 st.sidebar.header("⏳ Interval & Refresh")
@@ -50,26 +64,15 @@ selected_indicators = st.sidebar.multiselect(
     default=[]
 )
 
+st.sidebar.header("🛠️ Diagnostics")
+show_performance_panel = st.sidebar.checkbox("Show performance panel", value=False)
+
 logger.info("Sidebar configured. Ticker: %s, Interval: %s, Indicators: %s", ticker_symbol, interval, selected_indicators)
 
 # -----------------------------------
 # Tabs: Chart & Download Section
 # -----------------------------------
-tab_chart, tab_download = st.tabs(["📈 Chart", "📥 Download Historical Data"])
-
-# --------------------------------------
-# Async Runner Helper (for async calls)
-# --------------------------------------
-def run_async(coro):
-    try:
-        loop = asyncio.get_event_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-    if loop.is_closed():
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-    return loop.run_until_complete(coro)
+tab_chart, tab_scanner, tab_download = st.tabs(["📈 Chart", "🔎 NIFTY 50 Scanner", "📥 Download Historical Data"])
 
 # -----------------------------------
 # 📈 Chart Tab (Auto-Refresh & Loader)
@@ -94,13 +97,28 @@ with tab_chart:
     # Initialize StockDataHandler and fetch data
     stock_data_handler = StockDataHandler(ticker_symbol, interval, selected_indicators)
 
-    async def update_stock_data():
-        with st.spinner("📊 Loading Chart... Please wait."):
-            await stock_data_handler.fetch_and_plot_data()
-            logger.info("Stock data updated and chart plotted for %s", ticker_symbol)
-
-    run_async(update_stock_data())
+    with st.spinner("📊 Loading Chart... Please wait."):
+        stock_data_handler.fetch_and_plot_data()
+        logger.info("Stock data updated and chart plotted for %s", ticker_symbol)
     update_time()
+    if show_performance_panel:
+        render_performance_panel()
+
+# -----------------------------------
+# 🔎 Scanner Tab (All NIFTY 50 Symbols)
+# -----------------------------------
+with tab_scanner:
+    st.title("🔎 NIFTY 50 Scanner")
+    # Scanning fetches all 50 symbols, so only do it when the user asks for it
+    if st.checkbox("Scan all NIFTY 50 stocks on every refresh", key="scanner_enabled"):
+        # Imported on first use: the scanner pulls in yfinance and the panel indicators
+        from logic.scanner.watchlist_scanner import WatchlistScanner, style_scan_results
+
+        scanner = WatchlistScanner(NIFTY_50_STOCKS, interval)
+        with st.spinner("🔎 Scanning NIFTY 50... Please wait."):
+            scan_results = run_coroutine(scanner.scan())
+        st.dataframe(style_scan_results(scan_results), use_container_width=True, hide_index=True, height=600)
+        logger.info("Scanner table rendered for %d symbols", len(scan_results))
 
 # -----------------------------------
 # 📥 Download Tab (Persistent Download Link & Loader)
@@ -112,6 +130,11 @@ with tab_download:
     # Persistent date input
     start_date = st.date_input("Start Date", value=datetime.date.today() - datetime.timedelta(days=30), key="download_start_date")
     end_date = st.date_input("End Date", value=datetime.date.today(), key="download_end_date")
+    include_ml_predictions = st.checkbox("Include Lorentzian ML predictions (walk-forward)", key="download_ml_predictions")
+    export_format = st.selectbox("File Format", list(EXPORT_FORMATS.keys()), format_func=str.capitalize,
+                                 key="download_export_format")
+    export_columns = st.multiselect("Columns to Export (leave empty for all)", EXPORT_COLUMNS, key="download_export_columns")
+    export_extension = EXPORT_FORMATS[export_format][0]
 
     # Ensure session state exists for storing download data
     if "download_link" not in st.session_state:
@@ -127,17 +150,21 @@ with tab_download:
             logger.error("Download error: Invalid date range. Start: %s, End: %s", start_date, end_date)
         else:
             with st.spinner("📥 Fetching historical data... Please wait."):
-                downloader = HistoricalDataDownloader(ticker_symbol, str(start_date), str(end_date))
-                excel_data = asyncio.run(downloader.generate_excel_file())
+                # Imported on first use: downloads pull in yfinance, TA-Lib and the export libraries
+                from logic.download_data.download_data import HistoricalDataDownloader
 
-                if excel_data:
+                downloader = HistoricalDataDownloader(ticker_symbol, str(start_date), str(end_date),
+                                                      include_ml_predictions=include_ml_predictions)
+                file_data = run_coroutine(downloader.generate_file(export_format, export_columns or None))
+
+                if file_data:
                     logger.info("Historical data downloaded successfully for %s", ticker_symbol)
 
-                    # Create a zip file containing the Excel file
+                    # Create a zip file containing the exported file
                     buf = io.BytesIO()
                     with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zipf:
                         # Create a file name
-                        zipf.writestr(f"{ticker_symbol}_historical_data.xlsx", excel_data)
+                        zipf.writestr(f"{ticker_symbol}_historical_data.{export_extension}", file_data)
                     zip_data = buf.getvalue()
 
                     # Convert zip file bytes to a base64-encoded download link and store in session state
@@ -148,8 +175,69 @@ with tab_download:
                     )
                 else:
                     st.error("⚠️ Failed to fetch historical data. Please try again.")
-                    logger.error("Failed to generate Excel file for historical data of %s", ticker_symbol)
+                    logger.error("Failed to generate %s file for historical data of %s", export_format, ticker_symbol)
 
     # Show the download link if available (even after refresh)
     if st.session_state["download_link"]:
         st.markdown(st.session_state["download_link"], unsafe_allow_html=True)
+
+    # -----------------------------------
+    # 📦 Bulk Export (Many Symbols, One ZIP)
+    # -----------------------------------
+    st.header("📦 Bulk Export")
+    export_all = st.checkbox("Export all NIFTY 50 stocks", key="bulk_export_all")
+    bulk_stocks = list(NIFTY_50_STOCKS.keys()) if export_all else st.multiselect(
+        "Select stocks to export", list(NIFTY_50_STOCKS.keys()), key="bulk_export_stocks"
+    )
+    bulk_concurrency = st.slider("Concurrent downloads", 1, 10, 5, key="bulk_export_concurrency")
+
+    if "bulk_export_zip" not in st.session_state:
+        st.session_state["bulk_export_zip"] = None
+
+    if st.button("Export Selected Stocks"):
+        if not bulk_stocks:
+            st.error("⚠️ Please select at least one stock.")
+            logger.error("Bulk export error: No stocks selected.")
+        elif start_date >= end_date:
+            st.error("⚠️ End date must be after start date.")
+            logger.error("Bulk export error: Invalid date range. Start: %s, End: %s", start_date, end_date)
+        else:
+            progress_bar = st.progress(0.0, text="📦 Exporting historical data...")
+            # The export runs on the event loop thread; progress is handed back to this script thread
+            progress_updates = queue.Queue()
+
+            from logic.download_data.bulk_export import BulkHistoricalExporter
+
+            exporter = BulkHistoricalExporter(
+                [NIFTY_50_STOCKS[name] for name in bulk_stocks], str(start_date), str(end_date),
+                max_concurrency=bulk_concurrency, include_ml_predictions=include_ml_predictions,
+                export_format=export_format, columns=export_columns or None
+            )
+            export_future = submit(exporter.generate_zip(lambda *update: progress_updates.put(update)))
+            while True:
+                try:
+                    completed, total, symbol = progress_updates.get(timeout=0.1)
+                except queue.Empty:
+                    if export_future.done():
+                        break
+                    continue
+                progress_bar.progress(completed / total, text=f"📦 Exported {symbol} ({completed}/{total})")
+            st.session_state["bulk_export_zip"] = export_future.result()
+
+            if st.session_state["bulk_export_zip"]:
+                logger.info("Bulk export finished for %d stocks", len(bulk_stocks))
+                if exporter.failed_symbols:
+                    st.warning(f"⚠️ No data exported for: {', '.join(exporter.failed_symbols)}")
+            else:
+                st.error("⚠️ Failed to export historical data. Please try again.")
+                logger.error("Bulk export produced no files for %s", bulk_stocks)
+
+    # Keep the archive available across reruns until a new export replaces it
+    if st.session_state["bulk_export_zip"]:
+        st.download_button(
+            "📥 Download bulk export (ZIP)",
+            data=st.session_state["bulk_export_zip"],
+            file_name=f"historical_data_{start_date}_{end_date}.zip",
+            mime="application/zip",
+        )
+
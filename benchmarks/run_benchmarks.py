@@ -0,0 +1,177 @@
+"""
+Benchmarks for the dashboard's hot paths on synthetic OHLCV data.
+
+Usage:
+    python -m benchmarks.run_benchmarks                      # 1k to 100k bars, compare with baselines
+    python -m benchmarks.run_benchmarks --max-bars 10000000  # up to 10M bars
+    python -m benchmarks.run_benchmarks --update-baselines   # record the current timings
+
+Each benchmark reports the best of ``--repeat`` runs. A timing more than ``--threshold``
+(default 25%) above its stored baseline is flagged as a regression and the run exits with
+status 1. Baselines are machine-specific; record them on the host you compare on.
+Runs use the production log profile unless LOG_PROFILE is set, so the table is not buried in debug logs.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from unittest import mock
+
+import numpy as np
+
+# Set before any project module imports logging_config
+os.environ.setdefault("LOG_PROFILE", "production")
+
+from benchmarks.synthetic_data import make_ohlcv  # noqa: E402
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+DEFAULT_THRESHOLD = 0.25
+
+
+def bench_indicators(df):
+    """IndicatorCalculator.compute_all_indicators without the memoized results of earlier runs."""
+    from logic.indicators.indicator_pipeline import indicator_pipeline
+    from logic.indicators.indicators import IndicatorCalculator
+
+    frame = df.copy()
+    indicator_pipeline.clear()
+    start = time.perf_counter()
+    IndicatorCalculator(frame).compute_all_indicators()
+    return time.perf_counter() - start
+
+
+def bench_lorentzian_predict(df, lookback=500):
+    """LorentzianClassifier.predict for every bar against a ``lookback``-row training window."""
+    from ml_models.lorentzian_classifier.lorentzian_classifier import LorentzianClassifier
+
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(len(df), 4))
+    model = LorentzianClassifier(lookback=lookback).fit(X, np.where(rng.random(len(df)) > 0.5, 1, -1))
+    start = time.perf_counter()
+    model.predict(X)
+    return time.perf_counter() - start
+
+
+def bench_excel_export(df):
+    """HistoricalDataDownloader.generate_excel_file with the Yahoo fetch stubbed out."""
+    from logic.download_data.download_data import HistoricalDataDownloader
+
+    downloader = HistoricalDataDownloader("BENCH.NS", "2020-01-01", "2020-12-31")
+
+    async def fetch():
+        return df.copy()
+
+    with mock.patch.object(downloader, "fetch_yahoo_finance_data", fetch):
+        start = time.perf_counter()
+        file_data = asyncio.run(downloader.generate_excel_file())
+        elapsed = time.perf_counter() - start
+    if file_data is None:
+        raise RuntimeError("Excel export failed; see the log.")
+    return elapsed
+
+
+def bench_fetch_path(df):
+    """StockDataHandler fetch plus indicators on a cold cache, against a stubbed provider."""
+    from data_fetchers.stock_data_handler import stock_data_handler as module
+    from logic.cache.market_data_cache import market_data_cache
+    from logic.cache import shared_snapshots
+    from logic.indicators.streaming_indicators import streaming_engines
+    from services.provider_router.provider_router import ProviderRouter
+
+    async def provider(symbol, interval):
+        return df.copy()
+
+    handler = module.StockDataHandler("BENCH.NS", "1min", list(module.INDICATOR_COLUMNS))
+    market_data_cache.clear()
+    streaming_engines.get_engine("BENCH.NS", "1min").reset()
+    # A fresh snapshot directory per run: starts cold and never publishes into ./cache/snapshots
+    with tempfile.TemporaryDirectory(prefix="bench-snapshots-") as directory, \
+            mock.patch.object(shared_snapshots, "_store", shared_snapshots.SharedSnapshotStore(directory)), \
+            mock.patch.object(module, "provider_router", ProviderRouter({"stub": provider})), \
+            mock.patch.object(module.prefetch_scheduler, "watch"):
+        start = time.perf_counter()
+        stock_data = asyncio.run(handler.prepare_chart_data())
+        elapsed = time.perf_counter() - start
+    if stock_data is None or stock_data.empty or handler.indicator_error:
+        raise RuntimeError("Fetch path returned no data or failed to compute indicators; see the log.")
+    return elapsed
+
+
+# name -> (function, largest size it is run at)
+BENCHMARKS = {
+    "indicators": (bench_indicators, 10_000_000),
+    "lorentzian_predict": (bench_lorentzian_predict, 1_000_000),
+    "excel_export": (bench_excel_export, 1_000_000),  # Excel sheets stop at 1,048,576 rows
+    "fetch_path": (bench_fetch_path, 100_000),  # streaming indicators fold bars in one at a time
+}
+
+
+def run(names, max_bars, repeat):
+    results = {}
+    for size in [size for size in SIZES if size <= max_bars]:
+        df = make_ohlcv(size)
+        for name in names:
+            function, limit = BENCHMARKS[name]
+            if size > limit:
+                continue
+            timings = [function(df) for _ in range(repeat)]
+            results.setdefault(name, {})[str(size)] = min(timings)
+            print(f"{name:<20} {size:>12,} bars  {min(timings) * 1000:>12.2f} ms", flush=True)
+    return results
+
+
+def compare(results, baselines, threshold):
+    """Return (name, size, seconds, baseline) for every timing above its baseline by more than ``threshold``."""
+    regressions = []
+    for name, timings in results.items():
+        for size, seconds in timings.items():
+            baseline = baselines.get(name, {}).get(size)
+            if baseline is not None and seconds > baseline * (1 + threshold):
+                regressions.append((name, size, seconds, baseline))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--max-bars", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--baselines", default=BASELINES_PATH)
+    parser.add_argument("--update-baselines", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = run(args.benchmarks, args.max_bars, args.repeat)
+
+    stored = {}
+    if os.path.exists(args.baselines):
+        with open(args.baselines) as f:
+            stored = json.load(f)
+    baselines = stored.get("timings", {})
+
+    if args.update_baselines:
+        for name, timings in results.items():
+            baselines.setdefault(name, {}).update({size: round(seconds, 6) for size, seconds in timings.items()})
+        with open(args.baselines, "w") as f:
+            json.dump({"machine": f"{platform.node()} ({platform.processor() or platform.machine()}, "
+                                  f"Python {platform.python_version()})",
+                       "timings": baselines}, f, indent=2, sort_keys=True)
+        print(f"Baselines written to {args.baselines}")
+        return 0
+
+    regressions = compare(results, baselines, args.threshold)
+    for name, size, seconds, baseline in regressions:
+        print(f"REGRESSION {name} at {int(size):,} bars: {seconds * 1000:.2f} ms "
+              f"vs baseline {baseline * 1000:.2f} ms (+{seconds / baseline - 1:.0%})")
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%}.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Cold-start benchmark: how long a fresh process takes to render the dashboard's first page.
+
+Usage:
+    python -m benchmarks.startup                      # compare with the stored baseline
+    python -m benchmarks.startup --update-baselines   # record the current timings
+
+Each run starts a new interpreter in an empty working directory (so no caches or logs
+carry over), imports Streamlit and runs ``app.py`` once with Streamlit's AppTest, with
+Alpha Vantage answered by the local provider stand-in. It reports the time to import
+Streamlit, the time for the first script run (imports, fetch, indicators and chart) and
+which heavy optional libraries that first run loaded.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.run_benchmarks import BASELINES_PATH, DEFAULT_THRESHOLD, compare
+from loadtest.provider_standin import ProviderStandIn
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Libraries the first page should not need
+DEFERRED_MODULES = ["yfinance", "talib", "sklearn", "openpyxl"]
+
+PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+app = AppTest.from_file({os.path.join(ROOT, "app.py")!r}, default_timeout=60).run()
+rendered = time.perf_counter()
+print(json.dumps({{
+    "import_streamlit": imported - start,
+    "first_render": rendered - imported,
+    "exceptions": [str(e.value) for e in app.exception],
+    "loaded": [m for m in {DEFERRED_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure_startup(standin_url):
+    """Run the probe in a fresh interpreter and return its measurements."""
+    env = dict(os.environ, ALPHA_VANTAGE_BASE_URL=f"{standin_url}/query", LOG_PROFILE="production",
+               PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.getenv("PYTHONPATH")])))
+    with tempfile.TemporaryDirectory() as workdir:
+        output = subprocess.run([sys.executable, "-c", PROBE], cwd=workdir, env=env, capture_output=True,
+                                text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--baselines", default=BASELINES_PATH)
+    parser.add_argument("--update-baselines", action="store_true")
+    args = parser.parse_args(argv)
+
+    with ProviderStandIn(latency=0.05) as standin:
+        runs = [measure_startup(standin.url) for _ in range(args.repeat)]
+
+    for run in runs:
+        if run["exceptions"]:
+            print(f"The first page raised: {run['exceptions']}")
+            return 1
+    timings = {name: min(run[name] for run in runs) for name in ("import_streamlit", "first_render")}
+    for name, seconds in timings.items():
+        print(f"{name:<20} {seconds * 1000:>12.2f} ms")
+    print(f"Deferred libraries loaded by the first page: {runs[0]['loaded'] or 'none'}")
+
+    with open(args.baselines) as f:
+        stored = json.load(f)
+    if args.update_baselines:
+        stored["timings"]["startup"] = {name: round(seconds, 6) for name, seconds in timings.items()}
+        with open(args.baselines, "w") as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+        print(f"Baselines written to {args.baselines}")
+        return 0
+
+    regressions = compare({"startup": timings}, stored["timings"], args.threshold)
+    for name, stage, seconds, baseline in regressions:
+        print(f"REGRESSION {stage}: {seconds * 1000:.2f} ms vs baseline {baseline * 1000:.2f} ms "
+              f"(+{seconds / baseline - 1:.0%})")
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%}.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
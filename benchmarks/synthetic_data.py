@@ -0,0 +1,17 @@
+import numpy as np
+import pandas as pd
+
+
+def make_ohlcv(bars: int, seed: int = 0, freq: str = "1min", start: str = "2020-01-01 09:15"):
+    """Random-walk OHLCV bars with a DatetimeIndex, shaped like the providers' frames."""
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(0, 0.5, bars).cumsum()
+    close = np.abs(close) + 1  # Keep prices positive over long walks
+    spread = rng.random(bars)
+    return pd.DataFrame({
+        "Open": close + rng.normal(0, 0.1, bars),
+        "High": close + spread,
+        "Low": close - spread,
+        "Close": close,
+        "Volume": rng.integers(1_000, 100_000, bars),
+    }, index=pd.date_range(start, periods=bars, freq=freq, name="Date"))
@@ -1,6 +1,26 @@
+import os
 import json
+from functools import lru_cache
 
-with open("secrets.json", "r") as file:
-    secrets = json.load(file)
+SECRETS_PATH = "secrets.json"
 
-ALPHA_VANTAGE_API_KEY = secrets["ALPHA_VANTAGE_API_KEY"]
+
+@lru_cache(maxsize=None)
+def load_secrets():
+    """Read ``secrets.json`` on first use rather than at import; empty if the file does not exist."""
+    if not os.path.exists(SECRETS_PATH):
+        return {}
+    with open(SECRETS_PATH, "r") as file:
+        return json.load(file)
+
+
+def get_secret(name: str, default=None):
+    """The environment variable ``name`` if it is set, else the value from ``secrets.json``."""
+    return os.getenv(name) or load_secrets().get(name, default)
+
+
+def __getattr__(name):
+    # Keeps ``config.ALPHA_VANTAGE_API_KEY`` working without reading secrets.json at import time
+    if name == "ALPHA_VANTAGE_API_KEY":
+        return get_secret(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
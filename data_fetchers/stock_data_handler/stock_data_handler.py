@@ -1,12 +1,56 @@
 import time
 import asyncio
+import pandas as pd
 import streamlit as st
 import plotly.graph_objects as go
 
-from services.alpha_vantage_fetcher.alpha_vantage_fetcher import AlphaVantageFetcher
-from logic.indicators.indicators import IndicatorCalculator
+from logic.charting.chart_downsampler import ChartDownsampler
+from logic.indicators.streaming_indicators import streaming_engines
+from logic.cache.market_data_cache import market_data_cache
+from logic.cache.shared_snapshots import get_shared_snapshots, snapshot_name
+from logic.scheduler.prefetch_scheduler import prefetch_scheduler
+from services.provider_router.provider_router import provider_router
 from services.yahoo_finance_fetcher.yahoo_finance_fetcher import YahooFinanceFetcher
-from logging_config import logger, alpha_logger, yahoo_logger
+from utils.event_loop import run_coroutine
+from utils.metrics import metrics
+from logging_config import logger, yahoo_logger
+
+# Sidebar indicator names and the StreamingIndicatorEngine columns that back them
+INDICATOR_COLUMNS = {
+    "RSI 14": "RSI_14",
+    "RSI 9": "RSI_9",
+    "CCI 20": "CCI_20",
+    "ADX 20": "ADX_20",
+    "WaveTrend 1": "WT1",
+    "WaveTrend 2": "WT2",
+}
+
+
+async def fetch_from_providers(ticker_symbol, interval):
+    """Race the market data providers for a ticker and keep the first usable answer.
+
+    Runs once per cache miss on behalf of every session waiting on this ticker, so it
+    must not touch per-session UI state. Returns None when the symbol is invalid.
+    """
+    stock_data, data_source = await provider_router.fetch(ticker_symbol, interval)
+
+    if stock_data is None:
+        logger.warning("No provider returned data for %s; validating the symbol.", ticker_symbol)
+        yahoo_fetcher = YahooFinanceFetcher(ticker_symbol, interval)
+        if not await yahoo_fetcher.validate_symbol():
+            yahoo_logger.error("Invalid symbol: %s. Aborting operation.", ticker_symbol)
+            return None
+        stock_data = pd.DataFrame()
+
+    stock_data.attrs["data_source"] = data_source
+    return stock_data
+
+
+async def fetch_market_data(ticker_symbol, interval):
+    """Fetch through the process-wide cache, joining any fetch of the same bars already in flight."""
+    return await market_data_cache.get_or_fetch(
+        ticker_symbol, interval, lambda: fetch_from_providers(ticker_symbol, interval), share=True
+    )
 
 
 class StockDataHandler:
@@ -16,118 +60,169 @@ class StockDataHandler:
         self.selected_indicators = selected_indicators
         self.data_source = None  # Tracks whether AlphaVantage or Yahoo was used
         self.last_fetched_data = None  # Cache for faster subsequent calls
-        logger.info(f"Initialized StockDataHandler for ticker {self.ticker_symbol} with interval {self.interval}")
+        self.indicator_error = False  # Set when indicators could not be computed
+        logger.debug("Initialized StockDataHandler for ticker %s with interval %s", self.ticker_symbol, self.interval)
 
     async def fetch_stock_data(self):
-        """Fetch stock data from AlphaVantage; fall back to Yahoo Finance if needed."""
-        if self.last_fetched_data:
+        """Return the scheduler's latest snapshot, or fetch through the process-wide cache shared by all sessions.
+
+        Runs on the application event loop, so it must not touch Streamlit. Returns None when
+        the symbol is invalid.
+        """
+        if self.last_fetched_data is not None:
             logger.debug("Returning cached stock data.")
             return self.last_fetched_data
 
-        # Initialize session state for the warning message
-        if "alpha_vantage_fail" not in st.session_state:
-            st.session_state["alpha_vantage_fail"] = False
-
-        alpha_logger.info(f"Fetching stock data for {self.ticker_symbol} from AlphaVantage.")
-        fetcher = AlphaVantageFetcher(self.ticker_symbol, self.interval)
-        stock_data = await fetcher.fetch_intraday_data()
+        # The background scheduler refreshes watched tickers at every bar close; read its
+        # snapshot while it is fresh, otherwise fetch the forming bar through the cache.
+        stock_data = prefetch_scheduler.latest(self.ticker_symbol, self.interval)
+        metrics.increment("cache_requests", cache="prefetch_snapshot", result="miss" if stock_data is None else "hit")
+        if stock_data is None:
+            stock_data = await fetch_market_data(self.ticker_symbol, self.interval)
+        if stock_data is None:
+            return None
+
+        prefetch_scheduler.watch(self.ticker_symbol, self.interval)
+        self.data_source = stock_data.attrs.get("data_source")
+        self.last_fetched_data = stock_data
+        logger.debug("Successfully fetched data for %s.", self.ticker_symbol)
+        return stock_data
 
+    async def prepare_chart_data(self):
+        """Fetch stock data and add the selected indicator columns, without any UI calls."""
+        stock_data = await self.fetch_stock_data()
         if stock_data is None or stock_data.empty:
-            alpha_logger.warning(f"No data found for {self.ticker_symbol} on AlphaVantage. Switching to Yahoo Finance.")
-            if not st.session_state["alpha_vantage_fail"]:  # Show message only once
-                st.warning(f"⚠️ No data found for {self.ticker_symbol} on AlphaVantage. Switching to Yahoo Finance.")
-                st.session_state["alpha_vantage_fail"] = True  # Prevent duplicate messages
-
-            yahoo_logger.info(f"Attempting to fetch data for {self.ticker_symbol} from Yahoo Finance.")
-            yahoo_fetcher = YahooFinanceFetcher(self.ticker_symbol, self.interval)
-            if not await yahoo_fetcher.validate_symbol():
-                yahoo_logger.error(f"Invalid symbol: {self.ticker_symbol}. Aborting operation.")
-                st.error(f"❌ Invalid symbol: {self.ticker_symbol}. Please enter a valid symbol.")
-                st.stop()
-            stock_data = await yahoo_fetcher.fetch_stock_data()
-
-        self.last_fetched_data = stock_data
-        logger.info(f"Successfully fetched data for {self.ticker_symbol}.")
+            return stock_data
+
+        # The cached frame is shared with other sessions (and may be a read-only mapping of
+        # another process's snapshot); add indicator columns to a shallow copy.
+        stock_data = stock_data.copy(deep=False)
+
+        logger.debug("Selected indicators: %s", self.selected_indicators)
+        if self.selected_indicators:
+            try:
+                indicators = await asyncio.to_thread(self._indicator_frame, stock_data)
+                logger.debug("Indicator calculations complete.")
+            except Exception as e:
+                logger.error("Error computing indicators: %s", e, exc_info=True)
+                self.indicator_error = True
+                indicators = pd.DataFrame(index=stock_data.index)
+
+            for indicator in self.selected_indicators:
+                column = INDICATOR_COLUMNS.get(indicator)
+                if column in indicators:
+                    stock_data[indicator.replace(" ", "_")] = indicators[column].to_numpy()
+                    logger.debug("Indicator %s computed successfully.", indicator)
         return stock_data
 
-    async def fetch_and_plot_data(self):
-        """Fetch stock data, compute selected indicators, and plot the candlestick chart."""
+    def _indicator_frame(self, stock_data):
+        """Indicator columns for ``stock_data``, reusing another process's snapshot computed from the same bars."""
+        shared = market_data_cache.share_across_processes
+        name = snapshot_name("indicators", self.ticker_symbol, self.interval)
+        version = _bars_version(stock_data)
+        if shared:
+            indicators = get_shared_snapshots().read(name)
+            found = indicators is not None and indicators.attrs.get("bars_version") == version
+            metrics.increment("cache_requests", cache="shared_indicators", result="hit" if found else "miss")
+            if found:
+                return indicators
+
+        # Only bars newer than the previous refresh are folded into the shared engine.
+        engine = streaming_engines.get_engine(self.ticker_symbol, self.interval)
+        with metrics.span("indicators", engine="streaming"):
+            indicators = engine.update_frame(stock_data)
+        if shared:
+            indicators.attrs["bars_version"] = version
+            try:
+                get_shared_snapshots().publish(name, indicators)
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning("Could not publish shared indicators for %s: %s", self.ticker_symbol, e)
+        return indicators
+
+    def fetch_and_plot_data(self):
+        """Fetch stock data on the application event loop, then report and plot it in the script thread."""
         start_time = time.time()
-        logger.info(f"Starting fetch and plot for {self.ticker_symbol}.")
-        stock_data = await self.fetch_stock_data()
+        logger.debug("Starting fetch and plot for %s.", self.ticker_symbol)
+        stock_data = run_coroutine(self.prepare_chart_data())
 
-        if stock_data is None or stock_data.empty:
-            logger.warning(f"No data available for {self.ticker_symbol}.")
+        if stock_data is None:
+            st.error(f"❌ Invalid symbol: {self.ticker_symbol}. Please enter a valid symbol.")
+            st.stop()
+
+        # Initialize session state for the warning message
+        if "alpha_vantage_fail" not in st.session_state:
+            st.session_state["alpha_vantage_fail"] = False
+        if self.data_source == "yahoo_finance" and not st.session_state["alpha_vantage_fail"]:
+            # Show message only once per session
+            st.warning(f"⚠️ AlphaVantage had no data for {self.ticker_symbol} in time. Showing Yahoo Finance data.")
+            st.session_state["alpha_vantage_fail"] = True  # Prevent duplicate messages
+
+        if stock_data.empty:
+            logger.warning("No data available for %s.", self.ticker_symbol)
             st.warning(f"No data found for {self.ticker_symbol}.")
             return
-
-        indicator_calculator = IndicatorCalculator(stock_data)
-        tasks = []
-        indicator_map = {}
-
-        logger.info(f"Selected indicators: {self.selected_indicators}")
-        if "RSI 14" in self.selected_indicators:
-            tasks.append(asyncio.to_thread(indicator_calculator.calculate_rsi, 14))
-            indicator_map[len(tasks) - 1] = "RSI_14"
-        if "RSI 9" in self.selected_indicators:
-            tasks.append(asyncio.to_thread(indicator_calculator.calculate_rsi, 9))
-            indicator_map[len(tasks) - 1] = "RSI_9"
-        if "CCI 20" in self.selected_indicators:
-            tasks.append(asyncio.to_thread(indicator_calculator.calculate_cci, 20))
-            indicator_map[len(tasks) - 1] = "CCI_20"
-        if "ADX 20" in self.selected_indicators:
-            tasks.append(asyncio.to_thread(indicator_calculator.calculate_adx, 20))
-            indicator_map[len(tasks) - 1] = "ADX_20"
-        if "WaveTrend 1" in self.selected_indicators or "WaveTrend 2" in self.selected_indicators:
-            # For WaveTrend, passing the period parameter (adjust as needed)
-            tasks.append(asyncio.to_thread(indicator_calculator.calculate_wavetrend, 10))
-            indicator_map[len(tasks) - 1] = "WaveTrend"
-
-        results = await asyncio.gather(*tasks)
-        logger.info("Indicator calculations complete.")
-
-        for i, key in indicator_map.items():
-            if key == "WaveTrend":
-                if results[i] and isinstance(results[i], tuple) and len(results[i]) == 2:
-                    stock_data["WaveTrend_1"], stock_data["WaveTrend_2"] = results[i]
-                    logger.debug("WaveTrend indicators calculated successfully.")
-                else:
-                    logger.warning("Error computing WaveTrend indicator.")
-                    st.warning("⚠️ Error computing WaveTrend. Check input data.")
-                    stock_data["WaveTrend_1"], stock_data["WaveTrend_2"] = None, None
-            else:
-                stock_data[key] = results[i] if results[i] is not None else None
-                logger.debug(f"Indicator {key} computed successfully.")
+        if self.indicator_error:
+            st.warning("⚠️ Error computing indicators. Check input data.")
 
         self.plot_stock_chart(stock_data)
         end_time = time.time()
-        logger.info(f"Fetch and plot complete for {self.ticker_symbol}. Elapsed time: {end_time - start_time:.2f} seconds.")
+        metrics.observe("refresh", end_time - start_time)
+        logger.info("Fetch and plot complete for %s. Elapsed time: %.2f seconds.", self.ticker_symbol, end_time - start_time)
 
     def plot_stock_chart(self, df):
-        """Plot a candlestick chart (with indicators) using Plotly."""
-        logger.info("Plotting candlestick chart.")
+        """Plot a candlestick chart (with indicators) using Plotly.
+
+        The series is reduced to the chart's pixel budget by a per-session ChartDownsampler,
+        which only re-buckets the bars that changed since the previous refresh.
+        """
+        logger.debug("Plotting candlestick chart.")
+        with metrics.span("chart_build"):
+            fig = self._build_figure(df)
+        # Plotly serializes the figure to JSON here
+        with metrics.span("chart_render"):
+            st.plotly_chart(fig, use_container_width=True, key=f"price_chart:{self.ticker_symbol}")
+        logger.debug("Chart plotted successfully.")
+
+    def _build_figure(self, df):
+        state_key = f"chart_downsampler:{self.ticker_symbol}:{self.interval}"
+        if state_key not in st.session_state:
+            st.session_state[state_key] = ChartDownsampler()
+        indicator_columns = [indicator.replace(" ", "_") for indicator in self.selected_indicators]
+        candles, lines = st.session_state[state_key].update(df, indicator_columns)
+        logger.debug("Downsampled %d bars to %d candles.", len(df), len(candles))
+
         fig = go.Figure()
         fig.add_trace(go.Candlestick(
-            x=df.index,
-            open=df["Open"],
-            high=df["High"],
-            low=df["Low"],
-            close=df["Close"],
+            x=candles.index,
+            open=candles["Open"],
+            high=candles["High"],
+            low=candles["Low"],
+            close=candles["Close"],
             name="Candlestick",
             increasing_line_color='green',
             decreasing_line_color='red'
         ))
         for indicator in self.selected_indicators:
             column_name = indicator.replace(" ", "_")
-            if column_name in df:
-                fig.add_trace(go.Scatter(x=df.index, y=df[column_name], mode='lines', name=indicator))
-                logger.debug(f"Added {indicator} trace to chart.")
+            if column_name in lines:
+                x, y = lines[column_name]
+                fig.add_trace(go.Scatter(x=x, y=y, mode='lines', name=indicator))
+                logger.debug("Added %s trace to chart.", indicator)
         fig.update_layout(
             title=f"{self.ticker_symbol} Stock Chart",
             xaxis_title="Time",
             yaxis_title="Price",
             template="plotly_dark",
-            height=600
+            height=600,
+            uirevision=self.ticker_symbol,  # Keep zoom/pan across refreshes
         )
-        st.plotly_chart(fig, use_container_width=True)
-        logger.info("Chart plotted successfully.")
+        return fig
+
+
+def _bars_version(df):
+    """Identifies a bar series by its length, first and last timestamps and its last (possibly forming) bar.
+
+    Bars only change at the end of the series, which is what the streaming engine relies on too.
+    """
+    last = df.iloc[-1]
+    return f"{len(df)}|{df.index[0]}|{df.index[-1]}|{last['High']}|{last['Low']}|{last['Close']}"
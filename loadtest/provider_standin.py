@@ -0,0 +1,313 @@
+"""
+Local stand-in for the Alpha Vantage and Yahoo Finance endpoints, for offline load tests.
+
+Usage:
+    python -m loadtest.provider_standin --port 8765 --latency 0.2 --error-rate 0.05 --quota-per-minute 5
+    ALPHA_VANTAGE_BASE_URL=http://127.0.0.1:8765/query streamlit run app.py
+
+Serves ``/query?function=TIME_SERIES_INTRADAY`` in Alpha Vantage's format and
+``/v8/finance/chart/<symbol>`` in Yahoo's chart format. Responses are replayed from
+``<recordings>/alpha_vantage/<SYMBOL>_<interval>.json`` and
+``<recordings>/yahoo_finance/<SYMBOL>_<interval>.json`` when those files exist, and
+synthesized otherwise.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from collections import Counter, deque
+
+import numpy as np
+import pandas as pd
+from aiohttp import web
+
+from logic.cache.frame_schema import compact_ohlcv
+from logic.cache.tiered_cache import INTERVAL_SECONDS
+from services.http_client.http_client import get_http_session
+from logging_config import logger
+
+RATE_LIMIT_NOTE = ("Thank you for using Alpha Vantage! Our standard API rate limit is 25 requests per day. "
+                   "Please subscribe to any of the premium plans to instantly remove all daily rate limits.")
+
+
+def yahoo_interval(interval: str):
+    """Yahoo's name for one of the dashboard's intervals, e.g. "5min" -> "5m"."""
+    return interval.replace("min", "m")
+
+
+def synthetic_bars(symbol: str, interval_seconds: int, bars: int, now: float = None, seed: int = 0):
+    """
+    The ``bars`` most recent bars of ``symbol``, ending with the bar open at ``now``.
+
+    Prices are a deterministic function of the symbol and each bar's position in time, so
+    consecutive responses agree on the bars they share, like a real feed.
+    """
+    now = time.time() if now is None else now
+    last = int(now // interval_seconds)
+    positions = np.arange(last - bars + 1, last + 1)
+    symbol_seed = zlib.crc32(symbol.encode()) ^ seed
+    base = 50 + symbol_seed % 2000
+    phase = (symbol_seed % 628) / 100
+    noise = ((positions * 2654435761 + symbol_seed) % 10007) / 10007 - 0.5
+    close = base * (1 + 0.02 * np.sin(2 * np.pi * positions / 390 + phase)) + noise * base * 0.002
+    spread = np.abs(noise) * base * 0.004 + base * 0.0005
+    return pd.DataFrame({
+        "Open": close - noise * spread,
+        "High": close + spread,
+        "Low": close - spread,
+        "Close": close,
+        "Volume": (1_000 + (positions * 7919 + symbol_seed) % 50_000).astype("int64"),
+    }, index=pd.to_datetime(positions * interval_seconds, unit="s"))
+
+
+class ProviderStandIn:
+    """
+    aiohttp server replaying provider responses with configurable latency and failures.
+
+    Every request waits ``latency`` seconds plus up to ``jitter``, then fails with HTTP 500
+    with probability ``error_rate``. Alpha Vantage requests beyond ``quota_per_minute`` in
+    the last minute, or with probability ``note_rate``, get the rate limit "Note" payload;
+    Yahoo answers those with HTTP 429. Symbols in ``invalid_symbols`` get each provider's
+    "no such symbol" answer. Requests are counted per (provider, outcome) in ``calls``.
+
+    ``start`` runs the server on its own thread and event loop, so it does not compete
+    with the application loop it is serving.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.05, jitter: float = 0.0,
+                 error_rate: float = 0.0, note_rate: float = 0.0, quota_per_minute: int = None,
+                 recordings: str = None, invalid_symbols=(), bars: int = 100, seed: int = 0):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.note_rate = note_rate
+        self.quota_per_minute = quota_per_minute
+        self.recordings = recordings
+        self.invalid_symbols = set(invalid_symbols)
+        self.bars = bars
+        self.seed = seed
+        self._random = random.Random(seed)
+        self._quota_window = deque()  # monotonic times of Alpha Vantage requests in the last minute
+        self._calls = Counter()  # (provider, outcome) -> requests
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._runner = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def calls(self):
+        """Requests served so far, as ``{provider: {outcome: count}}``."""
+        with self._lock:
+            calls = {}
+            for (provider, outcome), count in self._calls.items():
+                calls.setdefault(provider, {})[outcome] = count
+            return calls
+
+    def reset_calls(self):
+        with self._lock:
+            self._calls.clear()
+
+    def _count(self, provider, outcome):
+        with self._lock:
+            self._calls[provider, outcome] += 1
+
+    def _app(self):
+        app = web.Application()
+        app.router.add_get("/query", self._alpha_vantage)
+        app.router.add_get("/v8/finance/chart/{symbol}", self._yahoo_chart)
+        return app
+
+    async def _delay_or_fail(self):
+        """Wait for the configured latency; return True if this request should fail."""
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            fail = self._random.random() < self.error_rate
+        await asyncio.sleep(delay)
+        return fail
+
+    def _over_quota(self):
+        with self._lock:
+            now = time.monotonic()
+            while self._quota_window and self._quota_window[0] <= now - 60:
+                self._quota_window.popleft()
+            self._quota_window.append(now)
+            over = self.quota_per_minute is not None and len(self._quota_window) > self.quota_per_minute
+            return over or self._random.random() < self.note_rate
+
+    def _recording(self, provider, symbol, interval):
+        if not self.recordings:
+            return None
+        path = os.path.join(self.recordings, provider, f"{symbol}_{interval}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    async def _alpha_vantage(self, request):
+        symbol = request.query.get("symbol", "")
+        interval = request.query.get("interval", "5min")
+        if await self._delay_or_fail():
+            self._count("alpha_vantage", "error")
+            return web.json_response({"error": "stand-in failure"}, status=500)
+        if self._over_quota():
+            self._count("alpha_vantage", "rate_limited")
+            return web.json_response({"Note": RATE_LIMIT_NOTE})
+        if (request.query.get("function") != "TIME_SERIES_INTRADAY" or symbol in self.invalid_symbols
+                or interval not in INTERVAL_SECONDS):
+            self._count("alpha_vantage", "invalid")
+            return web.json_response({"Error Message": "Invalid API call. Please retry or visit the documentation "
+                                                       "(https://www.alphavantage.co/documentation/) "
+                                                       "for TIME_SERIES_INTRADAY."})
+
+        self._count("alpha_vantage", "ok")
+        payload = self._recording("alpha_vantage", symbol, interval)
+        if payload is None:
+            df = synthetic_bars(symbol, INTERVAL_SECONDS[interval], self.bars, seed=self.seed)
+            payload = {
+                "Meta Data": {"2. Symbol": symbol, "4. Interval": interval, "6. Time Zone": "UTC"},
+                f"Time Series ({interval})": {
+                    timestamp.strftime("%Y-%m-%d %H:%M:%S"): {
+                        "1. open": f"{bar.Open:.4f}", "2. high": f"{bar.High:.4f}", "3. low": f"{bar.Low:.4f}",
+                        "4. close": f"{bar.Close:.4f}", "5. volume": str(bar.Volume),
+                    }
+                    for timestamp, bar in zip(df.index[::-1], df.iloc[::-1].itertuples())
+                },
+            }
+        return web.json_response(payload)
+
+    async def _yahoo_chart(self, request):
+        symbol = request.match_info["symbol"]
+        interval = request.query.get("interval", "5m")
+        if await self._delay_or_fail():
+            self._count("yahoo_finance", "error")
+            return web.json_response({"error": "stand-in failure"}, status=500)
+        if self._random.random() < self.note_rate:
+            self._count("yahoo_finance", "rate_limited")
+            return web.Response(text="Too Many Requests", status=429)
+        interval_seconds = INTERVAL_SECONDS.get(interval.replace("m", "min"))
+        if symbol in self.invalid_symbols or interval_seconds is None:
+            self._count("yahoo_finance", "invalid")
+            return web.json_response({"chart": {"result": None, "error": {
+                "code": "Not Found", "description": "No data found, symbol may be delisted"}}}, status=404)
+
+        self._count("yahoo_finance", "ok")
+        payload = self._recording("yahoo_finance", symbol, interval)
+        if payload is None:
+            df = synthetic_bars(symbol, interval_seconds, self.bars, seed=self.seed)
+            payload = {"chart": {"result": [{
+                "meta": {"symbol": symbol, "dataGranularity": interval, "exchangeTimezoneName": "UTC"},
+                "timestamp": (df.index.asi8 // 10 ** 9).tolist(),
+                "indicators": {"quote": [{
+                    "open": df["Open"].round(4).tolist(), "high": df["High"].round(4).tolist(),
+                    "low": df["Low"].round(4).tolist(), "close": df["Close"].round(4).tolist(),
+                    "volume": df["Volume"].tolist(),
+                }]},
+            }], "error": None}}
+        return web.json_response(payload)
+
+    async def yahoo_provider(self, symbol: str, interval: str):
+        """
+        Provider coroutine for ``ProviderRouter`` reading this server's Yahoo chart endpoint.
+
+        yfinance cannot be pointed at another host, so load tests route Yahoo requests
+        through this instead. Like the real provider, it returns None on errors and an
+        empty frame for unknown symbols.
+        """
+        url = f"{self.url}/v8/finance/chart/{symbol}"
+        async with get_http_session().get(url, params={"interval": yahoo_interval(interval)}) as response:
+            if response.status == 404:
+                return pd.DataFrame()
+            if response.status != 200:
+                return None
+            payload = await response.json()
+
+        result = payload["chart"]["result"][0]
+        quote = result["indicators"]["quote"][0]
+        return compact_ohlcv(pd.DataFrame({
+            "Open": quote["open"], "High": quote["high"], "Low": quote["low"],
+            "Close": quote["close"], "Volume": quote["volume"],
+        }, index=pd.to_datetime(result["timestamp"], unit="s", utc=True)))
+
+    def start(self):
+        """Start serving on a background thread; returns once the port is bound."""
+        started = threading.Event()
+
+        async def serve():
+            self._runner = web.AppRunner(self._app(), access_log=None)
+            await self._runner.setup()
+            site = web.TCPSite(self._runner, self.host, self.port)
+            await site.start()
+            self.port = self._runner.addresses[0][1]
+            started.set()
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="provider-standin", daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(serve(), self._loop).result(10)
+        started.wait()
+        logger.info("Provider stand-in listening on %s.", self.url)
+        return self
+
+    def stop(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def add_arguments(parser):
+    """Stand-in options, shared with the load test harness."""
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many more seconds, at random")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with HTTP 500")
+    parser.add_argument("--note-rate", type=float, default=0.0, help="share of requests answered as rate limited")
+    parser.add_argument("--quota-per-minute", type=int, default=None, help="Alpha Vantage requests per minute "
+                                                                           "before rate limit notes")
+    parser.add_argument("--recordings", default=None, help="directory of recorded responses to replay")
+    parser.add_argument("--invalid-symbols", nargs="*", default=[])
+    parser.add_argument("--bars", type=int, default=100, help="bars per synthetic response")
+
+
+def standin_from_arguments(args, port: int = 0):
+    return ProviderStandIn(port=port, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                           note_rate=args.note_rate, quota_per_minute=args.quota_per_minute,
+                           recordings=args.recordings, invalid_symbols=args.invalid_symbols, bars=args.bars)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with standin_from_arguments(args, args.port) as standin:
+        print(f"Serving on {standin.url}; press Ctrl+C to stop.")
+        try:
+            while True:
+                time.sleep(60)
+                print(f"Calls so far: {standin.calls}", flush=True)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
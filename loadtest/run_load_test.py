@@ -0,0 +1,153 @@
+"""
+Simulate concurrent dashboard sessions against the local provider stand-in.
+
+Usage:
+    python -m loadtest.run_load_test --sessions 50 --duration 120 --interval 1min --refresh 5 15
+    python -m loadtest.run_load_test --sessions 200 --tickers 10 --latency 0.3 --jitter 0.2 --quota-per-minute 5
+
+Each session is a thread that refreshes one ticker's chart data every few seconds, the way
+an auto-refreshing page does: it builds a fresh StockDataHandler and blocks on
+``prepare_chart_data`` on the application event loop. Alpha Vantage requests go to the
+stand-in through the real fetcher (cache, rate limiter and retries included); Yahoo
+requests go to the stand-in's chart endpoint. The report gives refresh latency
+percentiles and the upstream calls the stand-in received.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from unittest import mock
+
+import numpy as np
+
+from constants.nifty_50_stock_symbols import NIFTY_50_STOCKS
+from data_fetchers.stock_data_handler.stock_data_handler import INDICATOR_COLUMNS, StockDataHandler
+from logic.cache.market_data_cache import market_data_cache
+from logic.cache.shared_snapshots import get_shared_snapshots, snapshot_name
+from logic.cache.tiered_cache import cache_key, get_tiered_cache
+from logic.scheduler.prefetch_scheduler import prefetch_scheduler
+from loadtest.provider_standin import add_arguments, standin_from_arguments
+from services.alpha_vantage_fetcher import alpha_vantage_fetcher
+from services.http_client.http_client import TokenBucketRateLimiter
+from services.provider_router.provider_router import provider_router
+from utils.event_loop import run_coroutine
+from logging_config import logger
+
+
+def _session(ticker, interval, indicators, cadence, stop, results):
+    """One dashboard session: refresh every ``cadence`` seconds until ``stop`` is set."""
+    while not stop.is_set():
+        handler = StockDataHandler(ticker, interval, indicators)
+        start = time.perf_counter()
+        try:
+            data = run_coroutine(handler.prepare_chart_data())
+            outcome = "ok" if data is not None and not data.empty else "no_data"
+        except Exception as e:
+            logger.error("Load test refresh failed for %s: %s", ticker, e)
+            outcome = "error"
+        results.append((time.perf_counter() - start, outcome, handler.data_source))
+        # Auto-refresh restarts its timer once the page has rendered
+        stop.wait(cadence)
+
+
+def run_load_test(standin, sessions: int = 10, duration: float = 60.0, tickers=None, interval: str = "5min",
+                  refresh=(5.0, 15.0), indicators=None, alpha_vantage_rate: float = None, seed: int = 0):
+    """
+    Run ``sessions`` simulated sessions for ``duration`` seconds against a started stand-in.
+
+    Session ``i`` watches ``tickers[i % len(tickers)]`` and refreshes at its own cadence,
+    drawn uniformly from ``refresh``. The tickers' cached data is dropped first, so the run
+    starts cold. Returns a report dict.
+    """
+    tickers = list(tickers or NIFTY_50_STOCKS.values())
+    indicators = list(INDICATOR_COLUMNS) if indicators is None else indicators
+    rng = random.Random(seed)
+    cache = get_tiered_cache()
+    for ticker in tickers:
+        market_data_cache.invalidate(ticker, interval)
+        cache.delete(cache_key("alpha_vantage", ticker, interval))
+        cache.delete(cache_key("yahoo_finance", ticker, interval))
+        for kind in ("bars", "indicators"):
+            get_shared_snapshots().delete(snapshot_name(kind, ticker, interval))
+    standin.reset_calls()
+
+    patches = [
+        mock.patch.object(alpha_vantage_fetcher.AlphaVantageFetcher, "BASE_URL", f"{standin.url}/query"),
+        mock.patch.dict(provider_router.providers, {"yahoo_finance": standin.yahoo_provider}),
+    ]
+    if alpha_vantage_rate is not None:
+        patches.append(mock.patch.object(alpha_vantage_fetcher, "alpha_vantage_rate_limiter",
+                                         TokenBucketRateLimiter(alpha_vantage_rate)))
+
+    results = []  # (seconds, outcome, data source); list.append is atomic
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=_session, name=f"load-session-{i}", daemon=True,
+                         args=(tickers[i % len(tickers)], interval, indicators, rng.uniform(*refresh), stop, results))
+        for i in range(sessions)
+    ]
+    for patch in patches:
+        patch.start()
+    try:
+        started_at = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        stop.wait(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started_at
+    finally:
+        prefetch_scheduler.stop()
+        for patch in reversed(patches):
+            patch.stop()
+
+    latencies = np.array([seconds for seconds, _, _ in results]) * 1000
+    calls = standin.calls
+    return {
+        "sessions": sessions,
+        "tickers": min(sessions, len(tickers)),
+        "seconds": round(elapsed, 1),
+        "refreshes": len(results),
+        "outcomes": dict(Counter(outcome for _, outcome, _ in results)),
+        "served_by": dict(Counter(source or "none" for _, _, source in results)),
+        "latency_ms": {
+            name: round(float(np.percentile(latencies, q)), 2) if len(latencies) else None
+            for name, q in (("p50", 50), ("p90", 90), ("p99", 99), ("max", 100))
+        },
+        "upstream_calls": calls,
+        "upstream_calls_per_minute": {
+            provider: round(sum(outcomes.values()) * 60 / elapsed, 2) for provider, outcomes in calls.items()
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds")
+    parser.add_argument("--tickers", type=int, default=None, help="number of NIFTY 50 tickers to spread sessions over")
+    parser.add_argument("--interval", default="5min", choices=["1min", "5min", "15min", "30min", "60min"])
+    parser.add_argument("--refresh", type=float, nargs=2, default=[5.0, 15.0], metavar=("MIN", "MAX"),
+                        help="range of per-session auto-refresh cadences, in seconds")
+    parser.add_argument("--alpha-vantage-rate", type=float, default=None,
+                        help="Alpha Vantage requests per minute for the client-side rate limiter")
+    parser.add_argument("--json", default=None, help="also write the report to this file")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    tickers = list(NIFTY_50_STOCKS.values())[:args.tickers]
+    with standin_from_arguments(args) as standin:
+        report = run_load_test(standin, args.sessions, args.duration, tickers, args.interval, tuple(args.refresh),
+                               alpha_vantage_rate=args.alpha_vantage_rate)
+
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,20 @@
 import os
+import time
+import queue
+import atexit
+import threading
 import logging.config
+import logging.handlers
+
+# "development" logs everything; "production" raises the levels and rate-limits each call site
+LOG_PROFILE = os.getenv("LOG_PROFILE", "development")
+# INFO/DEBUG records per call site per minute in production; warnings and errors are never limited
+LOG_RATE_LIMIT_PER_MINUTE = float(os.getenv("LOG_RATE_LIMIT_PER_MINUTE", "30"))
+# Directory for the rotating log files
+LOG_DIR = os.getenv("LOG_DIR", "logs")
 
 # Ensure the logs directory exists
-os.makedirs('logs', exist_ok=True)
+os.makedirs(LOG_DIR, exist_ok=True)
 
 # Define logging configuration with separate handlers and loggers
 LOGGING_CONFIG = {
@@ -26,7 +38,7 @@ LOGGING_CONFIG = {
         'general_file': {
             'class': 'logging.handlers.RotatingFileHandler',
             'formatter': 'standard',
-            'filename': 'logs/general.log',
+            'filename': os.path.join(LOG_DIR, 'general.log'),
             'maxBytes': 5 * 1024 * 1024,  # 5 MB per file
             'backupCount': 5,
             'level': 'DEBUG',
@@ -36,7 +48,7 @@ LOGGING_CONFIG = {
         'alpha_vantage_file': {
             'class': 'logging.handlers.RotatingFileHandler',
             'formatter': 'standard',
-            'filename': 'logs/alpha_vantage.log',
+            'filename': os.path.join(LOG_DIR, 'alpha_vantage.log'),
             'maxBytes': 5 * 1024 * 1024,
             'backupCount': 5,
             'level': 'INFO',
@@ -46,7 +58,7 @@ LOGGING_CONFIG = {
         'yahoo_finance_file': {
             'class': 'logging.handlers.RotatingFileHandler',
             'formatter': 'standard',
-            'filename': 'logs/yahoo_finance.log',
+            'filename': os.path.join(LOG_DIR, 'yahoo_finance.log'),
             'maxBytes': 5 * 1024 * 1024,
             'backupCount': 5,
             'level': 'INFO',
@@ -76,8 +88,97 @@ LOGGING_CONFIG = {
     }
 }
 
+if LOG_PROFILE == "production":
+    LOGGING_CONFIG['handlers']['console']['level'] = 'WARNING'
+    LOGGING_CONFIG['handlers']['general_file']['level'] = 'INFO'
+    LOGGING_CONFIG['root']['level'] = 'INFO'
+
+
+class CallSiteRateLimitFilter(logging.Filter):
+    """
+    Let through at most ``per_minute`` records below WARNING from each call site.
+
+    Each ``logger.info(...)`` line has its own token bucket, so a message repeated on every
+    rerun cannot crowd out the rest. The next record let through from a limited call site
+    reports how many were dropped.
+    """
+
+    def __init__(self, per_minute: float):
+        super().__init__()
+        self.rate_per_second = per_minute / 60.0
+        self.capacity = max(1.0, per_minute)
+        self._buckets = {}  # (pathname, lineno) -> [tokens, updated_at, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.capacity, now, 0]
+            bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate_per_second)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return False
+            bucket[0] -= 1
+            suppressed, bucket[2] = bucket[2], 0
+        if suppressed:
+            record.msg = f"{record.msg!s} (suppressed {suppressed} similar messages)"
+        return True
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue records as they are, so formatting happens on the listener thread.
+
+    The stock QueueHandler formats every record before queueing it so it can cross process
+    boundaries; ours stays in-process. Log arguments are therefore formatted later and must
+    not be mutated after the call.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+_listeners = []
+
+
+def _queue_handlers(logger_names):
+    """
+    Move the configured handlers of each logger behind a queue.
+
+    Callers only put the record on a queue; a listener thread per logger formats it and
+    writes to the console and the rotating files.
+    """
+    for name in logger_names:
+        target = logging.getLogger(name)
+        handlers = list(target.handlers)
+        for handler in handlers:
+            target.removeHandler(handler)
+        records = queue.SimpleQueue()
+        queue_handler = DeferredQueueHandler(records)
+        if LOG_PROFILE == "production":
+            queue_handler.addFilter(CallSiteRateLimitFilter(LOG_RATE_LIMIT_PER_MINUTE))
+        target.addHandler(queue_handler)
+        listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+        listener.start()
+        _listeners.append(listener)
+
+
+def stop_logging():
+    """Flush queued records and stop the listener threads."""
+    while _listeners:
+        _listeners.pop().stop()
+
+
 # Apply the logging configuration
 logging.config.dictConfig(LOGGING_CONFIG)
+_queue_handlers(['', 'alpha_vantage', 'yahoo_finance'])
+atexit.register(stop_logging)
 
 # Create loggers
 alpha_logger = logging.getLogger('alpha_vantage')
@@ -0,0 +1,79 @@
+import threading
+import pandas as pd
+
+from logging_config import logger
+
+
+class IncrementalBarStore:
+    """
+    Remembers the latest OHLCV bars per (source, symbol, interval).
+
+    Fetchers ask for the last stored timestamp, request only bars from that point on
+    and merge the delta back in. The first delta bar replaces everything stored at or
+    after its timestamp, so the still-forming last bar is overwritten rather than
+    duplicated. Frames are replaced, never mutated, so callers may hold on to them.
+    """
+
+    def __init__(self):
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def get(self, source: str, symbol: str, interval: str):
+        """Return the stored bars for the key, or None."""
+        with self._lock:
+            return self._frames.get((source, symbol, interval))
+
+    def last_timestamp(self, source: str, symbol: str, interval: str):
+        """Return the timestamp of the last stored bar, or None if nothing is stored."""
+        frame = self.get(source, symbol, interval)
+        if frame is None or frame.empty or not isinstance(frame.index, pd.DatetimeIndex):
+            return None
+        return frame.index[-1]
+
+    def merge(self, source: str, symbol: str, interval: str, new_bars: pd.DataFrame, latest_session_only=False,
+              max_bars: int = None):
+        """
+        Merge newly fetched bars into the stored frame and return the result.
+
+        With ``latest_session_only`` the result keeps only bars from the calendar day of
+        the newest bar, matching the ``period="1d"`` window of a full fetch. With
+        ``max_bars`` it keeps only the newest ``max_bars`` bars.
+        """
+        key = (source, symbol, interval)
+        with self._lock:
+            existing = self._frames.get(key)
+            if new_bars is None or new_bars.empty:
+                return existing if existing is not None else new_bars
+
+            if existing is None or existing.empty or not _is_comparable(existing, new_bars):
+                merged = new_bars.sort_index()
+            else:
+                first_new = new_bars.index.min()
+                merged = pd.concat([existing[existing.index < first_new], new_bars.sort_index()])
+                merged = merged[~merged.index.duplicated(keep="last")]
+
+            if latest_session_only and isinstance(merged.index, pd.DatetimeIndex):
+                merged = merged[merged.index.normalize() == merged.index[-1].normalize()]
+            if max_bars is not None:
+                merged = merged.iloc[-max_bars:]
+
+            self._frames[key] = merged
+            logger.debug("Merged %d new bars for %s (%s, %s); %d bars stored.",
+                         len(new_bars), symbol, interval, source, len(merged))
+            return merged
+
+    def reset(self, source: str, symbol: str, interval: str):
+        """Forget the stored bars so the next fetch is a full one."""
+        with self._lock:
+            self._frames.pop((source, symbol, interval), None)
+
+
+def _is_comparable(existing: pd.DataFrame, new_bars: pd.DataFrame):
+    """Both frames must have datetime indexes in the same timezone to be merged."""
+    return (isinstance(existing.index, pd.DatetimeIndex)
+            and isinstance(new_bars.index, pd.DatetimeIndex)
+            and str(existing.index.tz) == str(new_bars.index.tz))
+
+
+# Single instance shared by every fetcher in this process.
+bar_store = IncrementalBarStore()
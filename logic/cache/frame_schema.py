@@ -0,0 +1,54 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close"]
+OHLCV_COLUMNS = PRICE_COLUMNS + ["Volume"]
+
+# float32 is used for prices when it moves none of them by more than half a paisa/cent;
+# from 131,072 up its spacing can be too coarse for that, and float64 is kept instead.
+PRICE_TOLERANCE = 0.005
+
+
+def compact_ohlcv(df: pd.DataFrame, price_tolerance: float = PRICE_TOLERANCE):
+    """
+    Convert a provider frame to the canonical intraday layout, once at ingest.
+
+    Only Open, High, Low, Close and Volume are kept (Dividends, Stock Splits and the like
+    are dropped); prices become float32 when that stays within ``price_tolerance`` and
+    volume becomes int64. The index is a sorted, de-duplicated DatetimeIndex named "Date",
+    which pandas stores as one int64 epoch array (plus the timezone, if any). ``attrs``
+    are kept. Frames without all price columns are returned unchanged.
+    """
+    if df is None or not all(column in df for column in PRICE_COLUMNS):
+        return df
+
+    index = df.index if isinstance(df.index, pd.DatetimeIndex) else pd.to_datetime(df.index)
+    prices = df[PRICE_COLUMNS].to_numpy(dtype="float64")
+    narrowed = prices.astype("float32")
+    finite = np.isfinite(prices)
+    fits = np.array_equal(np.isfinite(narrowed), finite) and (
+        not finite.any() or np.abs(narrowed[finite] - prices[finite]).max() <= price_tolerance)
+    price_dtype = "float32" if fits else "float64"
+
+    compact = pd.DataFrame(prices.astype(price_dtype, copy=False), columns=PRICE_COLUMNS,
+                           index=index.rename("Date"))
+    volume = df["Volume"] if "Volume" in df else pd.Series(0, index=df.index)
+    compact["Volume"] = pd.to_numeric(volume, errors="coerce").fillna(0).round().to_numpy(dtype="int64")
+
+    if not compact.index.is_monotonic_increasing:
+        compact = compact.sort_index(kind="stable")
+    if compact.index.has_duplicates:
+        compact = compact[~compact.index.duplicated(keep="last")]
+    compact.attrs = dict(df.attrs)
+    return compact
+
+
+def frame_nbytes(value):
+    """Approximate memory held by a cached value: exact for frames, shallow for anything else."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    return sys.getsizeof(value)
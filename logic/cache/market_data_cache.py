@@ -0,0 +1,139 @@
+import time
+import asyncio
+import threading
+from concurrent.futures import Future
+
+from logic.cache.shared_snapshots import get_shared_snapshots, snapshot_name
+from logic.cache.tiered_cache import bar_close_expiry
+from utils.metrics import metrics
+from logging_config import logger
+
+
+class MarketDataCache:
+    """
+    Process-wide cache for market data shared by every Streamlit session.
+
+    Entries are keyed by (ticker, interval) and live for ``ttl_seconds``. Concurrent
+    requests for the same key join the single in-flight fetch instead of each
+    calling the upstream provider. Sessions run on their own threads and event
+    loops, so the bookkeeping is guarded by a threading lock and followers wait on
+    a ``concurrent.futures.Future`` that can be awaited from any loop.
+
+    With ``share_across_processes``, a miss on a key fetched with ``share=True`` first
+    looks for a snapshot another Streamlit process on this host has published (see
+    ``SharedSnapshotStore``) and only fetches upstream if there is none; fetched frames are
+    published in turn. Snapshots live no longer than ``ttl_seconds``, like local entries.
+    """
+
+    def __init__(self, ttl_seconds: float = 10.0, share_across_processes: bool = False):
+        self.ttl_seconds = ttl_seconds
+        self.share_across_processes = share_across_processes
+        self._entries = {}  # key -> (expires_at, value)
+        self._in_flight = {}  # key -> concurrent.futures.Future
+        self._lock = threading.Lock()
+
+    def get(self, ticker: str, interval: str):
+        """Return the cached value for (ticker, interval), or None if missing or expired."""
+        key = (ticker, interval)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, ticker: str, interval: str, value, ttl_seconds: float = None):
+        """Store a value for (ticker, interval)."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._entries[(ticker, interval)] = (time.monotonic() + ttl, value)
+
+    def invalidate(self, ticker: str, interval: str, shared: bool = True):
+        """Drop the cached value for (ticker, interval), and its shared snapshot unless ``shared`` is False."""
+        with self._lock:
+            self._entries.pop((ticker, interval), None)
+        if shared and self.share_across_processes:
+            get_shared_snapshots().delete(snapshot_name("bars", ticker, interval))
+
+    def clear(self):
+        """Drop every cached value."""
+        with self._lock:
+            self._entries.clear()
+
+    async def get_or_fetch(self, ticker: str, interval: str, fetch_coro_factory, share: bool = False):
+        """
+        Return the cached value for (ticker, interval), fetching it at most once.
+
+        ``fetch_coro_factory`` is a zero-argument callable returning a coroutine. Only
+        the first caller for a key runs it; everyone else awaits the same result.
+        Empty results (None or an empty DataFrame) are handed to the waiters but are
+        not cached, so the next refresh tries upstream again. ``share`` marks values that
+        are a (symbol, interval) bar series, which may be shared with other processes.
+        """
+        share = share and self.share_across_processes
+        key = (ticker, interval)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                logger.debug("Market data cache hit for %s (%s).", ticker, interval)
+                metrics.increment("cache_requests", cache="market_data", result="hit")
+                return entry[1]
+
+            in_flight = self._in_flight.get(key)
+            is_leader = in_flight is None
+            if is_leader:
+                in_flight = Future()
+                self._in_flight[key] = in_flight
+
+        if not is_leader:
+            logger.debug("Joining in-flight fetch for %s (%s).", ticker, interval)
+            metrics.increment("cache_requests", cache="market_data", result="joined")
+            return await asyncio.wrap_future(in_flight)
+
+        logger.debug("Market data cache miss for %s (%s); fetching upstream.", ticker, interval)
+        metrics.increment("cache_requests", cache="market_data", result="miss")
+        try:
+            value = self._read_shared(ticker, interval) if share else None
+            if value is None:
+                value = await fetch_coro_factory()
+                if share and not _is_empty(value):
+                    await asyncio.to_thread(self._publish_shared, ticker, interval, value)
+        except BaseException as e:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            in_flight.set_exception(e)
+            raise
+
+        with self._lock:
+            if not _is_empty(value):
+                self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._in_flight.pop(key, None)
+        in_flight.set_result(value)
+        return value
+
+    @staticmethod
+    def _read_shared(ticker, interval):
+        value = get_shared_snapshots().read(snapshot_name("bars", ticker, interval))
+        metrics.increment("cache_requests", cache="shared_snapshot", result="miss" if value is None else "hit")
+        return value
+
+    def _publish_shared(self, ticker, interval, value):
+        # Never outlive a local entry, so the forming bar keeps updating on every refresh
+        ttl = min(self.ttl_seconds, bar_close_expiry(interval, symbol=ticker))
+        try:
+            get_shared_snapshots().publish(snapshot_name("bars", ticker, interval), value,
+                                           expires_at=time.time() + ttl)
+        except (OSError, ValueError, TypeError) as e:
+            # Sharing is an optimization; this process keeps serving its own copy
+            logger.warning("Could not publish shared snapshot for %s (%s): %s", ticker, interval, e)
+
+
+def _is_empty(value):
+    return value is None or getattr(value, "empty", False)
+
+
+# Single instance shared by all sessions of this Streamlit process.
+market_data_cache = MarketDataCache(share_across_processes=True)
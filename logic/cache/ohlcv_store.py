@@ -0,0 +1,238 @@
+import os
+import sqlite3
+import asyncio
+import datetime
+import threading
+import pandas as pd
+
+from logging_config import logger
+
+# Yahoo history column -> store column
+COLUMN_MAP = {
+    "Open": "open",
+    "High": "high",
+    "Low": "low",
+    "Close": "close",
+    "Volume": "volume",
+    "Dividends": "dividends",
+    "Stock Splits": "stock_splits",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    symbol TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    open REAL, high REAL, low REAL, close REAL, volume REAL, dividends REAL, stock_splits REAL,
+    PRIMARY KEY (symbol, interval, ts)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS bars_by_date ON bars (symbol, interval, date);
+CREATE TABLE IF NOT EXISTS coverage (
+    symbol TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    symbol TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    tz TEXT,
+    PRIMARY KEY (symbol, interval)
+);
+"""
+
+
+class OHLCVStore:
+    """
+    Local SQLite store of OHLCV bars keyed by symbol, interval and date.
+
+    Besides the bars it records which [start, end) date ranges have already been fetched,
+    so a range query can be answered from disk and only the missing gaps go upstream.
+    Ranges reaching today are never marked as fetched, because today's bar is still
+    changing.
+
+    Yahoo's prices are adjusted for splits and dividends as of the day they are fetched.
+    When newly fetched bars carry a dividend or split dated after stored bars, those stored
+    bars are out of date, so the symbol's stored history is dropped and the requested
+    range fetched again as a whole.
+    """
+
+    def __init__(self, path: str = "./cache/ohlcv_store.sqlite3"):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+        logger.info("Opened OHLCV store at %s", path)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def _coverage(self, symbol, interval):
+        rows = self._connection.execute(
+            "SELECT start_date, end_date FROM coverage WHERE symbol = ? AND interval = ? ORDER BY start_date",
+            (symbol, interval),
+        ).fetchall()
+        return [tuple(row) for row in rows]
+
+    def missing_ranges(self, symbol: str, interval: str, start: str, end: str):
+        """Return the [start, end) date ranges inside [start, end) that were never fetched."""
+        with self._lock:
+            covered = self._coverage(symbol, interval)
+        gaps = []
+        cursor = start
+        for covered_start, covered_end in covered:
+            if covered_end <= cursor:
+                continue
+            if covered_start >= end:
+                break
+            if covered_start > cursor:
+                gaps.append((cursor, covered_start))
+            cursor = max(cursor, covered_end)
+            if cursor >= end:
+                break
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def write(self, symbol: str, interval: str, data: pd.DataFrame, start: str, end: str):
+        """Upsert fetched bars and mark [start, end) as fetched (up to, but excluding, today)."""
+        rows = []
+        tz = None
+        if not data.empty:
+            index = data.index
+            tz = str(index.tz) if index.tz is not None else None
+            timestamps = index.tz_convert("UTC") if index.tz is not None else index
+            dates = index.strftime("%Y-%m-%d")
+            columns = [data[column].to_numpy(dtype="float64") if column in data else [None] * len(data)
+                       for column in COLUMN_MAP]
+            rows = [
+                (symbol, interval, int(ts), date, *(None if pd.isna(value) else float(value) for value in values))
+                for ts, date, *values in zip(timestamps.asi8, dates, *columns)
+            ]
+
+        covered_end = min(end, datetime.date.today().isoformat())
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            if tz is not None:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO symbols VALUES (?, ?, ?)", (symbol, interval, tz)
+                )
+            if start < covered_end:
+                self._add_coverage(symbol, interval, start, covered_end)
+        logger.debug("Stored %d bars for %s (%s) between %s and %s", len(rows), symbol, interval, start, end)
+
+    def invalidate(self, symbol: str, interval: str):
+        """Forget every stored bar and fetched range of (symbol, interval)."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM bars WHERE symbol = ? AND interval = ?", (symbol, interval))
+            self._connection.execute("DELETE FROM coverage WHERE symbol = ? AND interval = ?", (symbol, interval))
+        logger.info("Dropped the stored history of %s (%s).", symbol, interval)
+
+    def _predates_action(self, symbol, interval, action_date):
+        """Whether stored bars are older than a dividend or split on ``action_date`` they have not seen."""
+        with self._lock:
+            older = self._connection.execute(
+                "SELECT 1 FROM bars WHERE symbol = ? AND interval = ? AND date < ? LIMIT 1",
+                (symbol, interval, action_date),
+            ).fetchone()
+            seen = self._connection.execute(
+                "SELECT 1 FROM bars WHERE symbol = ? AND interval = ? AND date = ? "
+                "AND (dividends != 0 OR stock_splits != 0) LIMIT 1",
+                (symbol, interval, action_date),
+            ).fetchone()
+        return older is not None and seen is None
+
+    def _add_coverage(self, symbol, interval, start, end):
+        """Merge [start, end) into the symbol's fetched ranges (caller holds the lock)."""
+        merged = []
+        for covered_start, covered_end in sorted(self._coverage(symbol, interval) + [(start, end)]):
+            if merged and covered_start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], covered_end))
+            else:
+                merged.append((covered_start, covered_end))
+        self._connection.execute("DELETE FROM coverage WHERE symbol = ? AND interval = ?", (symbol, interval))
+        self._connection.executemany(
+            "INSERT INTO coverage VALUES (?, ?, ?, ?)",
+            [(symbol, interval, covered_start, covered_end) for covered_start, covered_end in merged],
+        )
+
+    def read(self, symbol: str, interval: str, start: str, end: str):
+        """Return the stored bars whose local date falls in [start, end)."""
+        with self._lock:
+            frame = pd.read_sql_query(
+                "SELECT ts, open, high, low, close, volume, dividends, stock_splits FROM bars "
+                "WHERE symbol = ? AND interval = ? AND date >= ? AND date < ? ORDER BY ts",
+                self._connection, params=(symbol, interval, start, end),
+            )
+            tz_row = self._connection.execute(
+                "SELECT tz FROM symbols WHERE symbol = ? AND interval = ?", (symbol, interval)
+            ).fetchone()
+
+        index = pd.to_datetime(frame.pop("ts"), unit="ns", utc=True)
+        index = index.dt.tz_convert(tz_row[0]) if tz_row and tz_row[0] else index.dt.tz_localize(None)
+        frame.index = pd.DatetimeIndex(index, name="Date")
+        frame.columns = list(COLUMN_MAP)
+        if frame["Volume"].notna().all():
+            frame["Volume"] = frame["Volume"].astype("int64")
+        return frame
+
+    async def get_range(self, symbol: str, interval: str, start: str, end: str, fetch):
+        """
+        Return bars for [start, end), fetching only the gaps that were never stored.
+
+        ``fetch(gap_start, gap_end)`` is a coroutine returning a DataFrame, or None if the
+        request failed. Gaps that come back empty (weekends, holidays) are marked as fetched;
+        failed ones are not. Frames without a DatetimeIndex cannot be stored and are
+        returned as-is.
+        """
+        gaps = self.missing_ranges(symbol, interval, start, end)
+        if gaps:
+            logger.info("Fetching %d missing range(s) for %s (%s): %s", len(gaps), symbol, interval, gaps)
+            results = await asyncio.gather(*(fetch(gap_start, gap_end) for gap_start, gap_end in gaps))
+            action = max((_latest_corporate_action(data) or "" for data in results), default="")
+            if action and await asyncio.to_thread(self._predates_action, symbol, interval, action):
+                logger.info("%s had a dividend or split on %s; refetching %s to %s with current adjustments.",
+                            symbol, action, start, end)
+                await asyncio.to_thread(self.invalidate, symbol, interval)
+                gaps = [(start, end)]
+                results = [await fetch(start, end)]
+            for (gap_start, gap_end), data in zip(gaps, results):
+                if data is None:
+                    continue
+                if not data.empty and not isinstance(data.index, pd.DatetimeIndex):
+                    logger.warning("Fetched data for %s has no datetime index; not storing it.", symbol)
+                    return pd.concat([frame for frame in results if frame is not None])
+                await asyncio.to_thread(self.write, symbol, interval, data, gap_start, gap_end)
+        else:
+            logger.info("Serving %s (%s) %s to %s from the local store.", symbol, interval, start, end)
+        return await asyncio.to_thread(self.read, symbol, interval, start, end)
+
+
+def _latest_corporate_action(data):
+    """Local date ("YYYY-MM-DD") of the last dividend or split in ``data``, or None."""
+    if data is None or data.empty or not isinstance(data.index, pd.DatetimeIndex):
+        return None
+    actions = pd.Series(False, index=data.index)
+    for column in ("Dividends", "Stock Splits"):
+        if column in data:
+            actions |= data[column].fillna(0).ne(0)
+    return data.index[actions.to_numpy()].max().strftime("%Y-%m-%d") if actions.any() else None
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_ohlcv_store():
+    """Return the process-wide store, opening it on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = OHLCVStore()
+        return _store
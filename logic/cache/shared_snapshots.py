@@ -0,0 +1,148 @@
+import os
+import re
+import json
+import hashlib
+import time
+import tempfile
+import threading
+
+import pandas as pd
+import pyarrow as pa
+
+from utils.metrics import metrics
+from logging_config import logger
+
+# Longest snapshot name used as-is; longer ones are shortened with a digest
+MAX_NAME_LENGTH = 120
+
+
+def snapshot_name(kind: str, symbol: str, interval: str):
+    """File-safe name for one kind of snapshot ("bars", "indicators") of a symbol at an interval."""
+    name = re.sub(r"[^A-Za-z0-9._-]", "_", f"{kind}__{symbol}__{interval}")
+    if len(name) > MAX_NAME_LENGTH:
+        digest = hashlib.blake2b(f"{kind}__{symbol}__{interval}".encode(), digest_size=16).hexdigest()
+        name = f"{name[:MAX_NAME_LENGTH - len(digest) - 2]}__{digest}"
+    return name
+
+
+class SharedSnapshotStore:
+    """
+    Market data frames shared by every Streamlit process on the host through Arrow IPC files.
+
+    ``publish`` writes a frame to ``<directory>/<name>.arrow`` through a temporary file and
+    ``os.replace``, so readers see either the old or the new version, never a partial one.
+    ``read`` memory-maps the file read-only and wraps its buffers in a DataFrame without
+    copying or unpickling: all processes share the same page-cache pages. The frame for a
+    file version is mapped once per process and returned to every later reader until the
+    file is replaced; readers still holding an older frame keep its mapping alive.
+
+    Frames come back read-only, with their index, column dtypes and ``attrs``. An
+    ``expires_at`` (wall-clock) deadline can be set per snapshot; expired ones read as None.
+    """
+
+    def __init__(self, directory: str = "./cache/snapshots"):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._mapped = {}  # name -> ((inode, mtime_ns, size), expires_at, frame)
+        self._lock = threading.Lock()
+
+    def path(self, name: str):
+        return os.path.join(self.directory, f"{name}.arrow")
+
+    def publish(self, name: str, frame: pd.DataFrame, expires_at: float = None):
+        """Atomically replace the snapshot ``name`` with ``frame``."""
+        table = pa.Table.from_pandas(frame, preserve_index=True)
+        index_column = table.schema.pandas_metadata["index_columns"][0]
+        # Our own metadata replaces pandas', so reading never goes through pandas' reconstruction
+        table = table.replace_schema_metadata({
+            "index_column": index_column,
+            "index_name": json.dumps(frame.index.name),
+            "attrs": json.dumps(frame.attrs, default=str),
+            "expires_at": json.dumps(expires_at),
+        })
+
+        fd, temporary = tempfile.mkstemp(dir=self.directory, prefix=f".{name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                with pa.ipc.new_file(f, table.schema) as writer:
+                    writer.write_table(table, max_chunksize=max(len(table), 1))
+            os.replace(temporary, self.path(name))
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        metrics.increment("shared_snapshot_publishes")
+        logger.debug("Published shared snapshot %s (%d rows).", name, len(frame))
+
+    def read(self, name: str):
+        """Return the current snapshot ``name`` as a read-only DataFrame, or None if missing or expired."""
+        try:
+            stat = os.stat(self.path(name))
+        except OSError:
+            return None
+        version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            mapped = self._mapped.get(name)
+        if mapped is None or mapped[0] != version:
+            try:
+                mapped = (version, *self._map(self.path(name)))
+            except FileNotFoundError:
+                return None
+            except (OSError, pa.ArrowInvalid, KeyError, ValueError) as e:
+                logger.warning("Ignoring unreadable shared snapshot %s: %s", name, e)
+                return None
+            with self._lock:
+                self._mapped[name] = mapped
+            metrics.increment("shared_snapshot_maps")
+
+        _, expires_at, frame = mapped
+        if expires_at is not None and expires_at <= time.time():
+            return None
+        return frame
+
+    @staticmethod
+    def _map(path):
+        table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+        metadata = {key.decode(): value.decode() for key, value in table.schema.metadata.items()}
+        # split_blocks keeps one block per column, so every column stays a view of the mapping
+        frame = table.to_pandas(split_blocks=True, ignore_metadata=True)
+        frame.index = pd.Index(frame.pop(metadata["index_column"])).rename(json.loads(metadata["index_name"]))
+        frame.attrs = json.loads(metadata["attrs"])
+        return json.loads(metadata["expires_at"]), frame
+
+    def delete(self, name: str):
+        with self._lock:
+            self._mapped.pop(name, None)
+        try:
+            os.remove(self.path(name))
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith(".arrow"):
+                self.delete(file_name[:-len(".arrow")])
+
+    def stats(self):
+        with self._lock:
+            mapped = len(self._mapped)
+        snapshots = [f for f in os.listdir(self.directory) if f.endswith(".arrow")]
+        return {
+            "snapshots": len(snapshots),
+            "snapshot_bytes": sum(os.path.getsize(os.path.join(self.directory, f)) for f in snapshots),
+            "mapped": mapped,
+        }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_shared_snapshots():
+    """Return the process-wide snapshot store, creating its directory on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SharedSnapshotStore()
+        return _store
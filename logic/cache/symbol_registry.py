@@ -0,0 +1,130 @@
+import os
+import time
+import bisect
+import difflib
+import sqlite3
+import threading
+
+from constants.nifty_50_stock_symbols import NIFTY_50_STOCKS
+from logging_config import logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS symbols (
+    symbol TEXT PRIMARY KEY,
+    valid INTEGER NOT NULL,
+    name TEXT,
+    checked_at REAL NOT NULL
+);
+"""
+
+
+class SymbolRegistry:
+    """
+    Local registry of symbol validation results, persisted in SQLite.
+
+    Every row is loaded into memory when the registry opens, so ``lookup`` is a dictionary
+    read. Valid symbols are trusted for ``valid_ttl`` seconds and invalid ones for
+    ``invalid_ttl`` seconds; after that they are validated upstream again. Known valid
+    symbols (the NIFTY 50 constants plus everything validated so far) also feed a
+    prefix/fuzzy index used to suggest tickers for the sidebar's manual input.
+    """
+
+    def __init__(self, path: str = "./cache/symbol_registry.sqlite3", valid_ttl: float = 7 * 86400,
+                 invalid_ttl: float = 86400, seed: dict = None):
+        self.path = path
+        self.valid_ttl = valid_ttl
+        self.invalid_ttl = invalid_ttl
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+
+        self._seed = {symbol: name for name, symbol in (NIFTY_50_STOCKS if seed is None else seed).items()}
+        self._entries = {
+            symbol: (bool(valid), name, checked_at)
+            for symbol, valid, name, checked_at in self._connection.execute("SELECT * FROM symbols")
+        }
+        self._rebuild_index()
+        logger.info("Opened symbol registry at %s with %d entries", path, len(self._entries))
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def lookup(self, symbol: str):
+        """Return True/False for a known symbol, or None if it was never checked or has expired."""
+        if symbol in self._seed:
+            return True
+        entry = self._entries.get(symbol)
+        if entry is None:
+            return None
+        valid, _, checked_at = entry
+        if time.time() - checked_at > (self.valid_ttl if valid else self.invalid_ttl):
+            return None
+        return valid
+
+    def record(self, symbol: str, valid: bool, name: str = None):
+        """Store a validation result and make valid symbols searchable."""
+        checked_at = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO symbols VALUES (?, ?, ?, ?)", (symbol, int(valid), name, checked_at)
+            )
+            self._entries[symbol] = (valid, name, checked_at)
+            self._rebuild_index()
+        logger.debug("Recorded symbol %s as %s", symbol, "valid" if valid else "invalid")
+
+    def _rebuild_index(self):
+        """Sort the searchable symbols and names for bisect prefix lookups."""
+        names = dict(self._seed)
+        names.update({symbol: name for symbol, (valid, name, _) in self._entries.items() if valid})
+        self._names = names
+        self._symbols_sorted = sorted(names)
+        self._names_sorted = sorted((name.lower(), symbol) for symbol, name in names.items() if name)
+
+    def search(self, query: str, limit: int = 5):
+        """
+        Return up to ``limit`` (symbol, name) suggestions for ``query``.
+
+        Symbol prefixes rank first, then company-name prefixes, then close fuzzy matches.
+        """
+        query = query.strip()
+        if not query:
+            return []
+        symbols_sorted, names_sorted, names = self._symbols_sorted, self._names_sorted, self._names
+        matches = []
+
+        upper = query.upper()
+        start = bisect.bisect_left(symbols_sorted, upper)
+        for symbol in symbols_sorted[start:]:
+            if not symbol.startswith(upper) or len(matches) >= limit:
+                break
+            matches.append(symbol)
+
+        lower = query.lower()
+        start = bisect.bisect_left(names_sorted, (lower, ""))
+        for name, symbol in names_sorted[start:]:
+            if not name.startswith(lower) or len(matches) >= limit:
+                break
+            if symbol not in matches:
+                matches.append(symbol)
+
+        if len(matches) < limit:
+            for symbol in difflib.get_close_matches(upper, symbols_sorted, n=limit, cutoff=0.6):
+                if symbol not in matches:
+                    matches.append(symbol)
+        return [(symbol, names.get(symbol)) for symbol in matches[:limit]]
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_symbol_registry():
+    """Return the process-wide registry, opening it on first use."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = SymbolRegistry()
+        return _registry
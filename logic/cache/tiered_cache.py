@@ -0,0 +1,182 @@
+import time
+import threading
+from collections import OrderedDict
+
+from diskcache import Cache
+
+from logic.cache.frame_schema import frame_nbytes
+from utils.metrics import metrics
+from logging_config import logger
+
+# Dashboard interval -> bar length in seconds
+INTERVAL_SECONDS = {
+    "1min": 60,
+    "5min": 5 * 60,
+    "15min": 15 * 60,
+    "30min": 30 * 60,
+    "60min": 60 * 60,
+}
+
+# Regular session open in UTC, as seconds after midnight; exchanges start their intraday
+# bars there. UTC offsets change by whole hours with daylight saving, which leaves the
+# alignment of bars of up to an hour unchanged.
+SESSION_OPENS_UTC = {
+    "NSE": 3 * 3600 + 45 * 60,  # 09:15 IST
+    "US": 13 * 3600 + 30 * 60,  # 09:30 New York (EDT)
+}
+
+
+def cache_key(source: str, symbol: str, interval: str, kind: str = "intraday"):
+    """Cache key for one provider's data of a symbol at an interval."""
+    return f"{source}:{symbol}:{interval}:{kind}"
+
+
+def session_open_utc(symbol: str = None):
+    """
+    UTC session open (seconds after midnight) of the exchange ``symbol`` trades on.
+
+    NSE and BSE symbols (".NS", ".BO", "^NSE...", "^BSESN") open at 09:15 IST; symbols
+    without an exchange suffix are taken as US listings. Anything else, or no symbol,
+    gives 0, i.e. bars aligned to the epoch.
+    """
+    if not symbol:
+        return 0
+    symbol = symbol.upper()
+    if symbol.endswith((".NS", ".BO")) or symbol.startswith("^NSE") or symbol == "^BSESN":
+        return SESSION_OPENS_UTC["NSE"]
+    if "." not in symbol:
+        return SESSION_OPENS_UTC["US"]
+    return 0
+
+
+def bar_close_expiry(interval: str, now: float = None, min_seconds: float = 1.0, symbol: str = None):
+    """
+    Seconds until the bar of ``symbol`` currently forming at ``interval`` closes.
+
+    Bars start at the session open of the symbol's exchange (``session_open_utc``) and
+    follow each other every interval, e.g. 09:15, 10:15, ... IST for NSE at 60min, so a
+    cached frame expires exactly when a new bar can appear. Unknown intervals fall back to
+    five-minute bars.
+    """
+    length = INTERVAL_SECONDS.get(interval, 5 * 60)
+    now = time.time() if now is None else now
+    return max(min_seconds, length - (now - session_open_utc(symbol)) % length)
+
+
+class TieredCache:
+    """
+    In-memory LRU in front of a size-bounded diskcache.
+
+    The most recently used entries are served from memory without touching SQLite, up to
+    ``memory_items`` entries or ``memory_bytes`` of data, whichever is reached first (each
+    entry is measured once, when it enters memory). Everything is also written to the disk
+    tier, which survives restarts and evicts by ``eviction_policy`` once it grows past
+    ``size_limit`` bytes. Expiry is absolute wall-clock time, so an entry promoted from disk
+    keeps its original deadline.
+    """
+
+    def __init__(self, directory: str = "./cache/market_data", memory_items: int = 256,
+                 size_limit: int = 256 * 1024 * 1024, eviction_policy: str = "least-recently-used",
+                 memory_bytes: int = 128 * 1024 * 1024):
+        self.memory_items = memory_items
+        self.memory_bytes = memory_bytes
+        self._memory = OrderedDict()  # key -> (expires_at, value, nbytes)
+        self._memory_used = 0
+        self._lock = threading.Lock()
+        self._memory_hits = 0
+        self._memory_misses = 0
+        self.disk = Cache(directory, size_limit=size_limit, eviction_policy=eviction_policy)
+        self.disk.stats(enable=True)
+        logger.info("Opened tiered cache at %s (%d memory items or %d MB in memory, %d MB on disk, %s eviction)",
+                    directory, memory_items, memory_bytes // (1024 * 1024), size_limit // (1024 * 1024),
+                    eviction_policy)
+
+    def _remember(self, key, expires_at, value):
+        """Insert into the memory tier, evicting the least recently used entries (caller holds the lock)."""
+        self._forget(key)
+        nbytes = frame_nbytes(value)
+        self._memory[key] = (expires_at, value, nbytes)
+        self._memory_used += nbytes
+        while self._memory and (len(self._memory) > self.memory_items or self._memory_used > self.memory_bytes):
+            self._memory_used -= self._memory.popitem(last=False)[1][2]
+
+    def _forget(self, key):
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_used -= entry[2]
+
+    def get(self, key, default=None):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] > now:
+                self._memory.move_to_end(key)
+                self._memory_hits += 1
+                metrics.increment("cache_requests", cache="tiered", result="memory_hit")
+                return entry[1]
+            self._forget(key)
+            self._memory_misses += 1
+
+        value, expires_at = self.disk.get(key, default=None, expire_time=True)
+        if value is None:
+            metrics.increment("cache_requests", cache="tiered", result="miss")
+            return default
+        metrics.increment("cache_requests", cache="tiered", result="disk_hit")
+        with self._lock:
+            self._remember(key, expires_at if expires_at is not None else float("inf"), value)
+        return value
+
+    def set(self, key, value, expire: float = None):
+        """Store ``value`` in both tiers for ``expire`` seconds (forever when None)."""
+        expires_at = time.time() + expire if expire is not None else float("inf")
+        with self._lock:
+            self._remember(key, expires_at, value)
+        self.disk.set(key, value, expire=expire)
+
+    def delete(self, key):
+        with self._lock:
+            self._forget(key)
+        self.disk.delete(key)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_used = 0
+        self.disk.clear()
+
+    def entry_sizes(self):
+        """Bytes held in memory per key, most recently used last."""
+        with self._lock:
+            return {key: entry[2] for key, entry in self._memory.items()}
+
+    def stats(self):
+        """Hit/miss counters per tier plus current sizes."""
+        disk_hits, disk_misses = self.disk.stats()
+        with self._lock:
+            return {
+                "memory_hits": self._memory_hits,
+                "memory_misses": self._memory_misses,
+                "memory_items": len(self._memory),
+                "memory_bytes": self._memory_used,
+                "memory_bytes_limit": self.memory_bytes,
+                "disk_hits": disk_hits,
+                "disk_misses": disk_misses,
+                "disk_bytes": self.disk.volume(),
+                "disk_size_limit": self.disk.size_limit,
+            }
+
+    def close(self):
+        self.disk.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_tiered_cache():
+    """Return the process-wide cache, opening it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TieredCache()
+        return _cache
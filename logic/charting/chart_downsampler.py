@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+
+from logging_config import logger
+
+# Roughly one candle per two to three pixels of a full-width chart
+DEFAULT_MAX_BUCKETS = 600
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close"]
+
+
+class ChartDownsampler:
+    """
+    Reduce a price frame to a fixed number of buckets for plotting, and keep it up to date
+    incrementally.
+
+    Bars are grouped into buckets of ``bucket_size`` consecutive bars, where ``bucket_size``
+    is the smallest power of two that keeps the series within ``max_buckets``. Each bucket
+    becomes one candle (first open, highest high, lowest low, last close) and each line
+    column keeps its minimum and maximum point, so spikes survive the reduction.
+
+    Bucket boundaries only depend on a bar's position, so when new bars are appended only
+    the last, still-open bucket and the new ones are recomputed. A different first bar, a
+    shorter frame or a change of bucket size triggers a full rebuild.
+    """
+
+    def __init__(self, max_buckets: int = DEFAULT_MAX_BUCKETS):
+        self.max_buckets = max_buckets
+        self.reset()
+
+    def reset(self):
+        self._first_timestamp = None
+        self._last_timestamp = None
+        self._length = 0
+        self._bucket_size = None
+        self._line_columns = ()
+        self._candles = None  # DataFrame, one row per bucket
+        self._lines = {}  # column -> (timestamps, values), min and max point per bucket
+
+    def bucket_size(self, length: int):
+        size = 1
+        while -(-length // size) > self.max_buckets:
+            size *= 2
+        return size
+
+    def _can_extend(self, df, bucket_size, line_columns):
+        return (
+            self._candles is not None
+            and bucket_size == self._bucket_size
+            and tuple(line_columns) == self._line_columns
+            and len(df) >= self._length
+            and df.index[0] == self._first_timestamp
+            and df.index[self._length - 1] == self._last_timestamp
+        )
+
+    def update(self, df: pd.DataFrame, line_columns=()):
+        """
+        Return ``(candles, lines)`` for ``df``: a bucketed OHLC frame and, per line column,
+        a ``(timestamps, values)`` pair of arrays.
+        """
+        line_columns = [column for column in line_columns if column in df]
+        if df.empty:
+            self.reset()
+            return df[PRICE_COLUMNS], {column: (df.index, df[column].to_numpy()) for column in line_columns}
+
+        bucket_size = self.bucket_size(len(df))
+        if self._can_extend(df, bucket_size, line_columns):
+            # The last stored bar may have been forming, so its bucket is recomputed too
+            first_bucket = (self._length - 1) // bucket_size
+        else:
+            logger.debug("Rebuilding chart buckets for %d bars (bucket size %d).", len(df), bucket_size)
+            first_bucket = 0
+
+        candles = _bucket_candles(df, bucket_size, first_bucket)
+        lines = {column: _bucket_min_max(df.index, df[column].to_numpy(dtype="float64"), bucket_size, first_bucket)
+                 for column in line_columns}
+        if first_bucket:
+            points_per_bucket = 1 if bucket_size == 1 else 2
+            candles = pd.concat([self._candles.iloc[:first_bucket], candles])
+            lines = {
+                column: tuple(np.concatenate([kept[:points_per_bucket * first_bucket], new])
+                              for kept, new in zip(self._lines[column], lines[column]))
+                for column in line_columns
+            }
+
+        self._first_timestamp = df.index[0]
+        self._last_timestamp = df.index[-1]
+        self._length = len(df)
+        self._bucket_size = bucket_size
+        self._line_columns = tuple(line_columns)
+        self._candles = candles
+        self._lines = lines
+        return candles, lines
+
+
+def _bucket_candles(df, bucket_size, first_bucket):
+    """OHLC candles for every bucket from ``first_bucket`` on."""
+    offset = first_bucket * bucket_size
+    if bucket_size == 1:
+        return df[PRICE_COLUMNS].iloc[offset:]
+    starts = np.arange(0, len(df) - offset, bucket_size)
+    ends = np.minimum(starts + bucket_size, len(df) - offset) - 1
+    high = df["High"].to_numpy(dtype="float64")[offset:]
+    low = df["Low"].to_numpy(dtype="float64")[offset:]
+    return pd.DataFrame({
+        "Open": df["Open"].to_numpy(dtype="float64")[offset:][starts],
+        "High": np.fmax.reduceat(high, starts),
+        "Low": np.fmin.reduceat(low, starts),
+        "Close": df["Close"].to_numpy(dtype="float64")[offset:][ends],
+    }, index=df.index[offset:][starts])
+
+
+def _bucket_min_max(index, values, bucket_size, first_bucket):
+    """The minimum and maximum point of every bucket from ``first_bucket`` on, in time order."""
+    offset = first_bucket * bucket_size
+    values = values[offset:]
+    index = index[offset:]
+    if bucket_size == 1:
+        return np.asarray(index), values
+
+    buckets = -(-len(values) // bucket_size)
+    padded = np.full(buckets * bucket_size, np.nan)
+    padded[:len(values)] = values
+    padded = padded.reshape(buckets, bucket_size)
+    missing = np.isnan(padded)
+    lows = np.where(missing, np.inf, padded).argmin(axis=1)
+    highs = np.where(missing, -np.inf, padded).argmax(axis=1)
+
+    base = np.arange(buckets) * bucket_size
+    positions = np.sort(np.stack([lows, highs], axis=1), axis=1) + base[:, None]
+    positions = np.minimum(positions, len(values) - 1).ravel()
+    points = values[positions]
+    points[np.repeat(missing.all(axis=1), 2)] = np.nan  # Warm-up buckets stay gaps
+    return np.asarray(index[positions]), points
@@ -0,0 +1,113 @@
+import asyncio
+import multiprocessing
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from logic.download_data.download_data import HistoricalDataDownloader
+from logic.download_data.export_writers import EXPORT_FORMATS, export_bytes
+from logging_config import logger
+
+
+def _build_export_file(symbol, start_date, end_date, include_ml_predictions, export_format, columns, historical_data):
+    """Compute indicators for one symbol and return the exported file bytes (runs in a worker)."""
+    downloader = HistoricalDataDownloader(symbol, start_date, end_date, include_ml_predictions=include_ml_predictions)
+    data_with_indicators = downloader.calculate_indicators(historical_data)
+    return export_bytes(data_with_indicators, export_format, columns)
+
+
+class BulkHistoricalExporter:
+    """
+    Export historical data with indicators for many symbols into a single ZIP archive.
+
+    Up to ``max_concurrency`` Yahoo downloads run at once. Indicator computation and file
+    writing happen in a pool of ``max_workers`` worker processes (or threads with
+    ``use_processes=False``). Each file is added to the archive as soon as it is ready, so
+    the ZIP is built incrementally in a spooled temporary file.
+    """
+
+    def __init__(self, symbols, start_date: str, end_date: str, max_concurrency: int = 5, max_workers: int = 4,
+                 use_processes: bool = True, include_ml_predictions: bool = False, export_format: str = "excel",
+                 columns=None):
+        self.symbols = list(dict.fromkeys(symbols))  # Drop duplicates, keep order
+        self.start_date = start_date
+        self.end_date = end_date
+        self.max_concurrency = max_concurrency
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        self.include_ml_predictions = include_ml_predictions
+        self.export_format = export_format
+        self.columns = columns  # None exports every column
+        self.failed_symbols = []
+        logger.info("Initialized BulkHistoricalExporter for %d symbols from %s to %s",
+                    len(self.symbols), start_date, end_date)
+
+    def _create_pool(self):
+        if self.use_processes:
+            # Spawned workers avoid forking the threads of a running Streamlit server
+            return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return ThreadPoolExecutor(max_workers=self.max_workers)
+
+    async def _export_symbol(self, symbol, semaphore, pool):
+        """Fetch one symbol under the concurrency limit, then build its file in the pool."""
+        try:
+            async with semaphore:
+                downloader = HistoricalDataDownloader(symbol, self.start_date, self.end_date)
+                historical_data = await downloader.fetch_yahoo_finance_data()
+            if historical_data is None or historical_data.empty:
+                return symbol, None
+
+            loop = asyncio.get_running_loop()
+            file_bytes = await loop.run_in_executor(
+                pool, _build_export_file, symbol, self.start_date, self.end_date,
+                self.include_ml_predictions, self.export_format, self.columns, historical_data
+            )
+            return symbol, file_bytes
+        except Exception as e:
+            logger.error("Bulk export failed for %s: %s", symbol, e, exc_info=True)
+            return symbol, None
+
+    async def generate_zip(self, progress_callback=None):
+        """
+        Build the archive and return its bytes, or None if no symbol could be exported.
+
+        ``progress_callback(completed, total, symbol)`` is called after each symbol finishes.
+        """
+        start_time = time.time()
+        extension = EXPORT_FORMATS[self.export_format][0]
+        self.failed_symbols = []
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        total = len(self.symbols)
+
+        # Spawning and joining the workers, compressing and reading back the archive all
+        # block; they run in threads so the shared event loop keeps serving other sessions.
+        pool = await asyncio.to_thread(self._create_pool)
+        try:
+            with tempfile.SpooledTemporaryFile(max_size=32 * 1024 * 1024) as archive:
+                with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zipf:
+                    tasks = [self._export_symbol(symbol, semaphore, pool) for symbol in self.symbols]
+                    for completed, task in enumerate(asyncio.as_completed(tasks), start=1):
+                        symbol, file_bytes = await task
+                        if file_bytes is None:
+                            logger.warning("No historical data exported for %s.", symbol)
+                            self.failed_symbols.append(symbol)
+                        else:
+                            await asyncio.to_thread(zipf.writestr, f"{symbol}_historical_data.{extension}", file_bytes)
+                        if progress_callback is not None:
+                            progress_callback(completed, total, symbol)
+
+                    if len(self.failed_symbols) == total:
+                        logger.error("Bulk export produced no files.")
+                        return None
+                    if self.failed_symbols:
+                        zipf.writestr("failed_symbols.txt", "\n".join(self.failed_symbols))
+
+                archive.seek(0)
+                zip_data = await asyncio.to_thread(archive.read)
+        finally:
+            await asyncio.to_thread(pool.shutdown)
+
+        logger.info("Bulk export of %d symbols complete in %.2f seconds (%d failed).",
+                    total, time.time() - start_time, len(self.failed_symbols))
+        return zip_data
@@ -1,37 +1,50 @@
 import asyncio
 import pandas as pd
-import yfinance as yf
-from io import BytesIO
-import traceback
 
+from logic.cache.ohlcv_store import get_ohlcv_store
+from logic.download_data.export_writers import export_bytes
 from logic.indicators.indicators import IndicatorCalculator
+from utils.metrics import metrics
 from logging_config import logger
 
 
 class HistoricalDataDownloader:
-    def __init__(self, symbol: str, start_date: str, end_date: str):
+    def __init__(self, symbol: str, start_date: str, end_date: str, include_ml_predictions: bool = False,
+                 ml_lookback: int = 500):
         self.symbol = symbol
         self.start_date = start_date
         self.end_date = end_date
-        logger.info(f"Initialized HistoricalDataDownloader for {self.symbol} from {self.start_date} to {self.end_date}")
+        self.include_ml_predictions = include_ml_predictions  # Add walk-forward LC_Prediction column
+        self.ml_lookback = ml_lookback
+        logger.info("Initialized HistoricalDataDownloader for %s from %s to %s", self.symbol, self.start_date, self.end_date)
 
     async def fetch_yahoo_finance_data(self):
-        """Fetch historical stock data from Yahoo Finance asynchronously."""
-        logger.info(f"Fetching data for {self.symbol} from Yahoo Finance...")
+        """Fetch historical stock data, going to Yahoo Finance only for ranges not stored locally."""
+        logger.info("Fetching data for %s from Yahoo Finance...", self.symbol)
         try:
-            ticker = yf.Ticker(self.symbol)
-            historical_data = await asyncio.to_thread(
-                ticker.history, start=self.start_date, end=self.end_date
+            historical_data = await get_ohlcv_store().get_range(
+                self.symbol, "1d", self.start_date, self.end_date, self._fetch_yahoo_range
             )
             if historical_data.empty:
-                logger.warning(f"No data available for {self.symbol} from Yahoo Finance.")
+                logger.warning("No data available for %s from Yahoo Finance.", self.symbol)
                 return None
             logger.info("Yahoo Finance data fetched successfully.")
             return historical_data
         except Exception as e:
-            logger.error(f"Error fetching from Yahoo Finance: {e}\n{traceback.format_exc()}")
+            logger.error("Error fetching from Yahoo Finance: %s", e, exc_info=True)
             return None
 
+    async def _fetch_yahoo_range(self, start_date: str, end_date: str):
+        """Fetch one [start_date, end_date) range of daily bars from Yahoo Finance."""
+        def history():
+            # Slow to import; only loaded once a range is missing locally, and never on the event loop
+            import yfinance as yf
+
+            # Raise on failures instead of returning an empty frame, which the store would record as "no bars"
+            return yf.Ticker(self.symbol).history(start=start_date, end=end_date, raise_errors=True)
+
+        return await asyncio.to_thread(history)
+
     async def fetch_historical_data(self):
         """Fetch and validate historical data."""
         historical_data = await self.fetch_yahoo_finance_data()
@@ -46,31 +59,38 @@ class HistoricalDataDownloader:
             return historical_data
         logger.info("Calculating technical indicators...")
         indicator_calculator = IndicatorCalculator(historical_data)
-        return indicator_calculator.compute_all_indicators()
+        data_with_indicators = indicator_calculator.compute_all_indicators()
+        if self.include_ml_predictions:
+            data_with_indicators = self.calculate_ml_predictions(data_with_indicators)
+        return data_with_indicators
 
-    async def generate_excel_file(self):
-        """Fetches historical data, computes indicators, and writes to an Excel file."""
-        logger.info("Generating Excel file with historical data and indicators...")
+    def calculate_ml_predictions(self, data_with_indicators: pd.DataFrame):
+        """Add walk-forward Lorentzian predictions for every bar of the history."""
+        from ml_models.lorentzian_classifier.lorentzian_classifier import IndicatorCalculator as MLIndicatorCalculator
+
+        logger.info("Computing walk-forward Lorentzian predictions with lookback %d...", self.ml_lookback)
+        ml_calculator = MLIndicatorCalculator(data_with_indicators, lookback=self.ml_lookback)
+        with metrics.span("ml_predictions"):
+            return ml_calculator.compute_ml_predictions(walk_forward=True)
+
+    async def generate_file(self, export_format: str = "excel", columns=None):
+        """Fetches historical data, computes indicators, and writes it in the requested format."""
+        logger.info("Generating %s file with historical data and indicators...", export_format)
         try:
             historical_data = await self.fetch_historical_data()
-            data_with_indicators = self.calculate_indicators(historical_data)
+            # TA-Lib and the optional ML pass take seconds on long ranges; keep them off the shared loop
+            data_with_indicators = await asyncio.to_thread(self.calculate_indicators, historical_data)
             if data_with_indicators is None:
                 logger.error("Failed to compute indicators.")
                 return None
 
-            # Remove timezone information from the index, if present
-            if hasattr(data_with_indicators.index, 'tz') and data_with_indicators.index.tz is not None:
-                data_with_indicators.index = data_with_indicators.index.tz_localize(None)
-            # Remove timezone from any datetime columns
-            for col in data_with_indicators.select_dtypes(include=["datetime64[ns, UTC]"]).columns:
-                data_with_indicators[col] = data_with_indicators[col].dt.tz_localize(None)
-
-            output = BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                data_with_indicators.to_excel(writer, sheet_name='Historical Data', index=True)
-            output.seek(0)
-            logger.info("Excel file generation complete.")
-            return output.getvalue()
+            file_data = await asyncio.to_thread(export_bytes, data_with_indicators, export_format, columns)
+            logger.info("%s file generation complete.", export_format)
+            return file_data
         except Exception as e:
-            logger.error(f"An error occurred during Excel generation: {e}\n{traceback.format_exc()}")
+            logger.error("An error occurred during %s generation: %s", export_format, e, exc_info=True)
             return None
+
+    async def generate_excel_file(self):
+        """Fetches historical data, computes indicators, and writes to an Excel file."""
+        return await self.generate_file("excel")
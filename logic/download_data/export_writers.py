@@ -0,0 +1,118 @@
+import math
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+from logging_config import logger
+
+# Export format -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    "excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": ("csv", "text/csv"),
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+    "feather": ("feather", "application/vnd.apache.arrow.file"),
+}
+
+DEFAULT_CHUNK_ROWS = 50_000
+
+
+def select_columns(df: pd.DataFrame, columns=None):
+    """Keep only the requested columns that exist in ``df`` (all of them when ``columns`` is None)."""
+    if columns is None:
+        return df
+    missing = [column for column in columns if column not in df.columns]
+    if missing:
+        logger.warning("Skipping columns not present in the export: %s", missing)
+    return df[[column for column in columns if column in df.columns]]
+
+
+def write_export(df: pd.DataFrame, export_format: str, target, columns=None, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+    """
+    Write ``df`` (index included) to the binary file-like ``target`` in ``chunk_rows`` slices.
+
+    CSV, Parquet (one row group per chunk) and Feather/Arrow IPC (one record batch per chunk)
+    are written incrementally. Excel uses openpyxl's write-only workbook, which streams rows
+    instead of keeping every cell in memory.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+    df = select_columns(df, columns)
+    writer = {
+        "excel": _write_excel,
+        "csv": _write_csv,
+        "parquet": _write_parquet,
+        "feather": _write_feather,
+    }[export_format]
+    writer(df, target, max(1, chunk_rows))
+    logger.debug("Wrote %d rows as %s.", len(df), export_format)
+
+
+def export_bytes(df: pd.DataFrame, export_format: str, columns=None, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+    """Write the export into memory and return its bytes."""
+    output = BytesIO()
+    write_export(df, export_format, output, columns=columns, chunk_rows=chunk_rows)
+    return output.getvalue()
+
+
+def _chunks(df, chunk_rows):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def _write_csv(df, target, chunk_rows):
+    header = True
+    for chunk in _chunks(df, chunk_rows):
+        target.write(chunk.to_csv(header=header).encode("utf-8"))
+        header = False
+    if header:  # No rows: still write the header line
+        target.write(df.to_csv().encode("utf-8"))
+
+
+def _arrow_schema(df):
+    import pyarrow as pa  # Writer libraries are imported by the formats that need them
+
+    return pa.Schema.from_pandas(df.iloc[:0], preserve_index=True)
+
+
+def _write_parquet(df, target, chunk_rows):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(df)
+    with pq.ParquetWriter(target, schema) as writer:
+        for chunk in _chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=True))
+
+
+def _write_feather(df, target, chunk_rows):
+    import pyarrow as pa
+
+    schema = _arrow_schema(df)
+    with pa.ipc.new_file(target, schema) as writer:
+        for chunk in _chunks(df, chunk_rows):
+            writer.write_batch(pa.RecordBatch.from_pandas(chunk, schema=schema, preserve_index=True))
+
+
+def _excel_value(value):
+    """Convert numpy/pandas scalars into values openpyxl can write."""
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.tz_localize(None).to_pydatetime() if value.tzinfo is not None else value.to_pydatetime()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _write_excel(df, target, chunk_rows):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet("Historical Data")
+    worksheet.append([df.index.name or "Date"] + [str(column) for column in df.columns])
+    for chunk in _chunks(df, chunk_rows):
+        for row in chunk.itertuples(index=True, name=None):
+            worksheet.append([_excel_value(value) for value in row])
+    workbook.save(target)
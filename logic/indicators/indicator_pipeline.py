@@ -0,0 +1,117 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import talib
+
+from utils.metrics import metrics
+from logging_config import logger
+
+DEFAULT_PARAMETERS = {
+    "rsi_periods": (14, 9),
+    "cci_period": 20,
+    "adx_period": 20,
+    "adx_smoothing": 2,
+    "wavetrend_n1": 10,
+    "wavetrend_n2": 11,
+}
+
+
+def indicator_columns(rsi_periods=(14, 9), cci_period=20, adx_period=20, **_):
+    """Output column names for a parameter set, in pipeline order."""
+    return [f"RSI_{p}" for p in rsi_periods] + [f"CCI_{cci_period}", f"ADX_{adx_period}", "WT1", "WT2"]
+
+
+def data_fingerprint(*arrays):
+    """Digest of the raw bytes of ``arrays``; equal data gives equal fingerprints."""
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        digest.update(np.int64(len(array)).tobytes())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+class IndicatorCache:
+    """
+    Memoizes a set of indicators per input frame.
+
+    High, low and close are converted to contiguous float64 arrays once and each indicator
+    is a separate TA-Lib call on them. Results are kept in an LRU of ``max_entries`` keyed
+    by a fingerprint of the input arrays, the parameters and the requested columns, so
+    reruns and sessions asking for the same frame reuse them instead of recomputing.
+    Memoized arrays are read-only.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._results = OrderedDict()  # key -> {column: np.ndarray}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def compute(self, df: pd.DataFrame, columns=None, **parameters):
+        """
+        Return a DataFrame (aligned to ``df``) with the requested indicator ``columns``;
+        all of them when ``columns`` is None.
+        """
+        parameters = {**DEFAULT_PARAMETERS, **parameters}
+        parameters["rsi_periods"] = tuple(parameters["rsi_periods"])
+        available = indicator_columns(**parameters)
+        requested = tuple(available if columns is None else [column for column in available if column in columns])
+
+        high = np.ascontiguousarray(df["High"], dtype="float64")
+        low = np.ascontiguousarray(df["Low"], dtype="float64")
+        close = np.ascontiguousarray(df["Close"], dtype="float64")
+        key = (data_fingerprint(high, low, close), tuple(sorted(parameters.items())), requested)
+
+        with self._lock:
+            results = self._results.get(key)
+            if results is not None:
+                self._results.move_to_end(key)
+                self.hits += 1
+        metrics.increment("cache_requests", cache="indicator_pipeline", result="miss" if results is None else "hit")
+        if results is None:
+            with metrics.span("indicators", engine="pipeline"):
+                results = self._compute(high, low, close, requested, parameters)
+            with self._lock:
+                self.misses += 1
+                self._results[key] = results
+                while len(self._results) > self.max_entries:
+                    self._results.popitem(last=False)
+        return pd.DataFrame(results, index=df.index, columns=list(requested))
+
+    @staticmethod
+    def _compute(high, low, close, requested, parameters):
+        logger.debug("Computing %s over %d bars.", list(requested), len(close))
+        results = {}
+        for period in parameters["rsi_periods"]:
+            if f"RSI_{period}" in requested:
+                results[f"RSI_{period}"] = talib.RSI(close, timeperiod=period)
+        if f"CCI_{parameters['cci_period']}" in requested:
+            results[f"CCI_{parameters['cci_period']}"] = talib.CCI(high, low, close, timeperiod=parameters["cci_period"])
+        if f"ADX_{parameters['adx_period']}" in requested:
+            adx = talib.ADX(high, low, close, timeperiod=parameters["adx_period"])
+            results[f"ADX_{parameters['adx_period']}"] = talib.EMA(adx, timeperiod=parameters["adx_smoothing"])
+        if "WT1" in requested or "WT2" in requested:
+            hlc3 = (high + low + close) / 3
+            esa = talib.EMA(hlc3, timeperiod=parameters["wavetrend_n1"])
+            d = talib.EMA(np.abs(hlc3 - esa), timeperiod=parameters["wavetrend_n1"])
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ci = (hlc3 - esa) / (0.015 * d)
+            wt1 = talib.EMA(ci, timeperiod=parameters["wavetrend_n2"])
+            results["WT1"] = wt1
+            results["WT2"] = talib.SMA(wt1, timeperiod=4)
+
+        for column in requested:
+            results[column].flags.writeable = False
+        return {column: results[column] for column in requested}
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+
+# Single pipeline shared by all sessions of this Streamlit process.
+indicator_pipeline = IndicatorCache()
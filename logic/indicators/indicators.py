@@ -1,16 +1,17 @@
 import talib
 import pandas as pd
+from logic.indicators.indicator_pipeline import indicator_pipeline
 from logging_config import logger
 
 
 class IndicatorCalculator:
     def __init__(self, df: pd.DataFrame):
         self.df = df
-        logger.info("IndicatorCalculator initialized with DataFrame shape: %s", self.df.shape)
+        logger.debug("IndicatorCalculator initialized with DataFrame shape: %s", self.df.shape)
 
     def calculate_rsi(self, period: int = 14):
         """Calculate RSI for the given period."""
-        logger.info("Calculating RSI with period %d", period)
+        logger.debug("Calculating RSI with period %d", period)
         try:
             result = talib.RSI(self.df['Close'], timeperiod=period)
             logger.debug("RSI calculated successfully.")
@@ -21,7 +22,7 @@ class IndicatorCalculator:
 
     def calculate_wavetrend(self, n1=10, n2=11):
         """Calculate WaveTrend (WT) indicator."""
-        logger.info("Calculating WaveTrend with parameters n1=%d, n2=%d", n1, n2)
+        logger.debug("Calculating WaveTrend with parameters n1=%d, n2=%d", n1, n2)
         try:
             hlc3 = (self.df['High'] + self.df['Low'] + self.df['Close']) / 3
             esa = talib.EMA(hlc3, timeperiod=n1)
@@ -37,7 +38,7 @@ class IndicatorCalculator:
 
     def calculate_cci(self, period: int = 20):
         """Calculate CCI for the given period."""
-        logger.info("Calculating CCI with period %d", period)
+        logger.debug("Calculating CCI with period %d", period)
         try:
             result = talib.CCI(self.df['High'], self.df['Low'], self.df['Close'], timeperiod=period)
             logger.debug("CCI calculated successfully.")
@@ -48,7 +49,7 @@ class IndicatorCalculator:
 
     def calculate_adx(self, period: int = 20, adx_smoothing: int = 2):
         """Calculate ADX for the given period."""
-        logger.info("Calculating ADX with period %d", period)
+        logger.debug("Calculating ADX with period %d", period)
         try:
             adx = talib.ADX(self.df['High'], self.df['Low'], self.df['Close'], timeperiod=period)
             smoothed_adx = talib.EMA(adx, timeperiod=adx_smoothing)
@@ -60,16 +61,23 @@ class IndicatorCalculator:
 
     def compute_all_indicators(self):
         """Compute all required indicators and return updated DataFrame."""
-        logger.info("Computing all indicators.")
+        logger.debug("Computing all indicators.")
         try:
-            self.df['RSI_14'] = self.calculate_rsi(14)
-            self.df['RSI_9'] = self.calculate_rsi(9)
-            self.df['CCI_20'] = self.calculate_cci(20)
-            self.df['ADX_20'] = self.calculate_adx(20)
-            wt1, wt2 = self.calculate_wavetrend()
-            self.df['WT1'] = wt1
-            self.df['WT2'] = wt2
-            logger.info("All indicators computed successfully.")
+            try:
+                # Memoized per frame, so reruns and sessions showing the same bars compute once
+                indicators = indicator_pipeline.compute(self.df)
+                for column in indicators.columns:
+                    self.df[column] = indicators[column]
+            except Exception as e:
+                logger.warning("Memoized indicator pass failed (%s); computing indicators one by one.", e)
+                self.df['RSI_14'] = self.calculate_rsi(14)
+                self.df['RSI_9'] = self.calculate_rsi(9)
+                self.df['CCI_20'] = self.calculate_cci(20)
+                self.df['ADX_20'] = self.calculate_adx(20)
+                wt1, wt2 = self.calculate_wavetrend()
+                self.df['WT1'] = wt1
+                self.df['WT2'] = wt2
+            logger.debug("All indicators computed successfully.")
             return self.df
         except Exception as e:
             logger.error("Error computing all indicators: %s", e, exc_info=True)
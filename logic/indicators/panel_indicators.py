@@ -0,0 +1,232 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from utils.metrics import metrics
+from logging_config import logger
+
+# Agreement with the per-symbol TA-Lib results. The recurrences are the same as TA-Lib's,
+# but sums are vectorized and may be added in a different order (mostly CCI's window
+# mean), so values can differ in the last few bits; this bound covers that.
+PANEL_TOLERANCE = {"rtol": 1e-9, "atol": 1e-7}
+
+TA_EPSILON = 0.00000001  # TA-Lib's TA_IS_ZERO tolerance
+
+
+def _is_zero(values):
+    return (values > -TA_EPSILON) & (values < TA_EPSILON)
+
+
+def _first_valid(values):
+    """Index of the first non-NaN column in every row (the row length if there is none)."""
+    valid = ~np.isnan(values)
+    return np.where(valid.any(axis=1), valid.argmax(axis=1), values.shape[1])
+
+
+def _shift_rows(values, shifts):
+    """Move row ``i`` left by ``shifts[i]`` columns (right for negative shifts), padding with NaN."""
+    rows, columns = values.shape
+    source = np.arange(columns)[None, :] + shifts[:, None]
+    inside = (source >= 0) & (source < columns)
+    shifted = np.full_like(values, np.nan)
+    shifted[inside] = values[np.nonzero(inside)[0], source[inside]]
+    return shifted
+
+
+def panel_ema(values, period):
+    """TA-Lib EMA per row: seeded with the SMA of a row's first ``period`` values, leading NaNs skipped."""
+    rows, columns = values.shape
+    k = 2.0 / (period + 1)
+    start = _first_valid(values)
+    seed_at = start + period - 1
+    out = np.full((columns, rows), np.nan)
+    seeded = seed_at < columns
+    if not seeded.any():
+        return out.T
+
+    # Seed with the SMA, summed in the same order as TA-Lib
+    window = np.take_along_axis(values, np.minimum(start[:, None] + np.arange(period), columns - 1), axis=1)
+    total = np.zeros(rows)
+    for i in range(period):
+        total += window[:, i]
+    seed = total / period
+
+    # Time-major so every step reads one contiguous row; rows stay NaN until their seed bar
+    series = np.ascontiguousarray(values.T)
+    value = np.full(rows, np.nan)
+    for t in range(seed_at[seeded].min(), columns):
+        value = np.where(seed_at == t, seed, ((series[t] - value) * k) + value)
+        out[t] = value
+    return out.T
+
+
+def panel_sma(values, period):
+    """TA-Lib SMA per row; leading NaNs are skipped because any window touching them is NaN."""
+    out = np.full_like(values, np.nan)
+    if values.shape[1] < period:
+        return out
+    windows = sliding_window_view(values, period, axis=1)
+    total = windows[:, :, 0].copy()
+    for i in range(1, period):
+        total += windows[:, :, i]
+    out[:, period - 1:] = total / period
+    return out
+
+
+def panel_rsi(close, period):
+    """TA-Lib RSI for rows starting at column 0."""
+    rows, columns = close.shape
+    out = np.full_like(close, np.nan)
+    if columns <= period:
+        return out
+    change = np.diff(close, axis=1).T  # (time, symbols)
+    # TA-Lib adds a change to the gains unless it is negative, so NaN changes poison the gains
+    gains = np.ascontiguousarray(np.where(change < 0, 0.0, change))
+    losses = np.ascontiguousarray(np.where(change < 0, -change, 0.0))
+
+    # Simple average over the first ``period`` changes, accumulated one at a time like TA-Lib
+    gain = np.zeros(rows)
+    loss = np.zeros(rows)
+    for i in range(period):
+        gain += gains[i]
+        loss += losses[i]
+    gain /= period
+    loss /= period
+
+    average_gain = np.empty((columns - period, rows))
+    average_loss = np.empty((columns - period, rows))
+    average_gain[0], average_loss[0] = gain, loss
+    for row, i in enumerate(range(period, columns - 1), start=1):
+        gain = ((gain * (period - 1)) + gains[i]) / period
+        loss = ((loss * (period - 1)) + losses[i]) / period
+        average_gain[row], average_loss[row] = gain, loss
+
+    total = average_gain + average_loss
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(_is_zero(total), 0.0, 100.0 * (average_gain / total))
+    rsi[np.isnan(total)] = np.nan
+    out[:, period:] = rsi.T
+    return out
+
+
+def panel_cci(high, low, close, period):
+    """TA-Lib CCI for rows starting at column 0."""
+    out = np.full_like(close, np.nan)
+    if close.shape[1] < period:
+        return out
+    typical = (high + low + close) / 3
+    windows = sliding_window_view(typical, period, axis=1)
+    average = windows.mean(axis=2)
+    deviation = np.abs(windows - average[:, :, None]).sum(axis=2)
+    distance = typical[:, period - 1:] - average
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cci = distance / (0.015 * (deviation / period))
+    cci = np.where(_is_zero(distance) | _is_zero(deviation), 0.0, cci)
+    cci[np.isnan(distance) | np.isnan(deviation)] = np.nan
+    out[:, period - 1:] = cci
+    return out
+
+
+def panel_adx(high, low, close, period):
+    """TA-Lib ADX for rows starting at column 0."""
+    rows, columns = close.shape
+    out = np.full_like(close, np.nan)
+    if columns < 2 * period:
+        return out
+
+    # Per-bar directional movement and true range, for bars 1..columns-1, time-major
+    diff_plus = np.diff(high, axis=1).T
+    diff_minus = -np.diff(low, axis=1).T
+    prev_close = close[:, :-1].T
+    true_range = np.ascontiguousarray(np.maximum.reduce([
+        (high - low)[:, 1:].T, np.abs(high[:, 1:].T - prev_close), np.abs(low[:, 1:].T - prev_close),
+    ]))
+    take_minus = (diff_minus > 0) & (diff_plus < diff_minus)
+    take_plus = ~take_minus & (diff_plus > 0) & (diff_plus > diff_minus)
+    minus_moves = np.ascontiguousarray(np.where(take_minus, diff_minus, 0.0))
+    plus_moves = np.ascontiguousarray(np.where(take_plus, diff_plus, 0.0))
+
+    # Wilder sums; row ``bar - period`` holds the sums after ``bar``
+    plus_dm = np.zeros(rows)
+    minus_dm = np.zeros(rows)
+    tr = np.zeros(rows)
+    for bar in range(1, period):
+        minus_dm += minus_moves[bar - 1]
+        plus_dm += plus_moves[bar - 1]
+        tr += true_range[bar - 1]
+    sums = np.empty((3, columns - period, rows))
+    for row, bar in enumerate(range(period, columns)):
+        minus_dm = minus_dm - (minus_dm / period) + minus_moves[bar - 1]
+        plus_dm = plus_dm - (plus_dm / period) + plus_moves[bar - 1]
+        tr = tr - (tr / period) + true_range[bar - 1]
+        sums[0, row], sums[1, row], sums[2, row] = minus_dm, plus_dm, tr
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        minus_di = 100.0 * (sums[0] / sums[2])
+        plus_di = 100.0 * (sums[1] / sums[2])
+        di_total = minus_di + plus_di
+        dx = 100.0 * (np.abs(minus_di - plus_di) / di_total)
+    defined = ~_is_zero(sums[2]) & ~_is_zero(di_total)
+
+    # The first ADX averages the DX of bars period..2*period-1, then Wilder smoothing
+    adx = np.zeros(rows)
+    for row in range(period):
+        adx += np.where(defined[row], dx[row], 0.0)
+    adx /= period
+    out[:, 2 * period - 1] = adx
+    for row, bar in enumerate(range(2 * period, columns), start=period):
+        adx = np.where(defined[row], ((adx * (period - 1)) + dx[row]) / period, adx)
+        out[:, bar] = adx
+    return out
+
+
+class PanelIndicatorEngine:
+    """
+    RSI, CCI, ADX and WaveTrend for many symbols at once.
+
+    Inputs are aligned 2-D arrays of shape (symbols, time). Every recurrence steps through
+    time once with numpy operations across all symbols, instead of one TA-Lib call chain
+    per symbol. A row may start later than the others (leading NaNs); after its first bar
+    it must have no gaps. Results match ``IndicatorCalculator.compute_all_indicators``
+    run per symbol within ``PANEL_TOLERANCE``.
+    """
+
+    def __init__(self, rsi_periods=(14, 9), cci_period=20, adx_period=20, adx_smoothing=2,
+                 wavetrend_n1=10, wavetrend_n2=11):
+        self.rsi_periods = tuple(rsi_periods)
+        self.cci_period = cci_period
+        self.adx_period = adx_period
+        self.adx_smoothing = adx_smoothing
+        self.wavetrend_n1 = wavetrend_n1
+        self.wavetrend_n2 = wavetrend_n2
+        self.columns = [f"RSI_{p}" for p in self.rsi_periods] + [f"CCI_{cci_period}", f"ADX_{adx_period}", "WT1", "WT2"]
+
+    def compute(self, high, low, close):
+        """Return ``{column: array of shape (symbols, time)}`` for every indicator column."""
+        with metrics.span("indicators", engine="panel"):
+            return self._compute(high, low, close)
+
+    def _compute(self, high, low, close):
+        high, low, close = (np.array(values, dtype="float64", ndmin=2) for values in (high, low, close))
+        # Left-align the rows so every symbol starts at column 0, then shift the results back
+        start = _first_valid(np.where(np.isnan(high) | np.isnan(low), np.nan, close))
+        high, low, close = (_shift_rows(values, start) for values in (high, low, close))
+        logger.debug("Computing panel indicators for %d symbols x %d bars.", *close.shape)
+
+        results = {f"RSI_{p}": panel_rsi(close, p) for p in self.rsi_periods}
+        results[f"CCI_{self.cci_period}"] = panel_cci(high, low, close, self.cci_period)
+        results[f"ADX_{self.adx_period}"] = panel_ema(panel_adx(high, low, close, self.adx_period),
+                                                      self.adx_smoothing)
+
+        hlc3 = (high + low + close) / 3
+        esa = panel_ema(hlc3, self.wavetrend_n1)
+        d = panel_ema(np.abs(hlc3 - esa), self.wavetrend_n1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ci = (hlc3 - esa) / (0.015 * d)
+        results["WT1"] = panel_ema(ci, self.wavetrend_n2)
+        results["WT2"] = panel_sma(results["WT1"], 4)
+
+        return {column: _shift_rows(results[column], -start) for column in self.columns}
+
+
+# Default dashboard parameters, shared by the scanner.
+panel_indicator_engine = PanelIndicatorEngine()
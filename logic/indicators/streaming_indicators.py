@@ -0,0 +1,371 @@
+import copy
+import math
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from logging_config import logger
+
+NAN = float("nan")
+
+
+def _is_zero(value):
+    """Mirror TA-Lib's TA_IS_ZERO tolerance."""
+    return -0.00000001 < value < 0.00000001
+
+
+def _divide(numerator, denominator):
+    """Float division with numpy semantics for a zero denominator."""
+    if denominator == 0.0:
+        if numerator == 0.0 or math.isnan(numerator):
+            return NAN
+        return math.copysign(math.inf, numerator)
+    return numerator / denominator
+
+
+class _EMAState:
+    """TA-Lib EMA: seeded with the SMA of the first ``period`` values, leading NaNs skipped."""
+
+    def __init__(self, period):
+        self.period = period
+        self.k = 2.0 / (period + 1)
+        self.started = False
+        self.count = 0
+        self.total = 0.0
+        self.value = NAN
+
+    def update(self, x):
+        if not self.started:
+            if math.isnan(x):
+                return NAN
+            self.started = True
+        if self.count < self.period:
+            self.total += x
+            self.count += 1
+            if self.count < self.period:
+                return NAN
+            self.value = self.total / self.period
+            return self.value
+        self.value = ((x - self.value) * self.k) + self.value
+        return self.value
+
+
+class _SMAState:
+    """TA-Lib SMA with the same running-total update order, leading NaNs skipped."""
+
+    def __init__(self, period):
+        self.period = period
+        self.started = False
+        self.window = deque()
+        self.total = 0.0
+
+    def update(self, x):
+        if not self.started:
+            if math.isnan(x):
+                return NAN
+            self.started = True
+        self.window.append(x)
+        self.total += x
+        if len(self.window) < self.period:
+            return NAN
+        value = self.total / self.period
+        self.total -= self.window.popleft()
+        return value
+
+
+class _RSIState:
+    """TA-Lib RSI: simple average over the first ``period`` changes, Wilder smoothing afterwards."""
+
+    def __init__(self, period):
+        self.period = period
+        self.prev_value = None
+        self.count = 0
+        self.gain = 0.0
+        self.loss = 0.0
+
+    def update(self, x):
+        if self.prev_value is None:
+            if math.isnan(x):
+                return NAN
+            self.prev_value = x
+            return NAN
+        change = x - self.prev_value
+        self.prev_value = x
+        if self.count < self.period:
+            if change < 0:
+                self.loss -= change
+            else:
+                self.gain += change
+            self.count += 1
+            if self.count < self.period:
+                return NAN
+            self.loss /= self.period
+            self.gain /= self.period
+        else:
+            self.loss *= (self.period - 1)
+            self.gain *= (self.period - 1)
+            if change < 0:
+                self.loss -= change
+            else:
+                self.gain += change
+            self.loss /= self.period
+            self.gain /= self.period
+        total = self.gain + self.loss
+        return 100.0 * (self.gain / total) if not _is_zero(total) else 0.0
+
+
+class _CCIState:
+    """TA-Lib CCI over a circular buffer of typical prices.
+
+    The mean deviation has no running form, so each update costs O(period), which is
+    constant with respect to the length of the history.
+    """
+
+    def __init__(self, period):
+        self.period = period
+        self.buffer = [0.0] * period
+        self.index = 0
+        self.count = 0
+
+    def update(self, high, low, close):
+        if self.count == 0 and (math.isnan(high) or math.isnan(low) or math.isnan(close)):
+            return NAN
+        last_value = (high + low + close) / 3
+        self.buffer[self.index] = last_value
+        self.index = (self.index + 1) % self.period
+        self.count += 1
+        if self.count < self.period:
+            return NAN
+        average = 0.0
+        for value in self.buffer:
+            average += value
+        average /= self.period
+        deviation = 0.0
+        for value in self.buffer:
+            deviation += abs(value - average)
+        distance = last_value - average
+        if not _is_zero(distance) and not _is_zero(deviation):
+            return distance / (0.015 * (deviation / self.period))
+        return 0.0
+
+
+class _ADXState:
+    """TA-Lib ADX: Wilder-smoothed directional movement and true range, then Wilder-smoothed DX."""
+
+    def __init__(self, period):
+        self.period = period
+        self.count = 0
+        self.prev_high = self.prev_low = self.prev_close = NAN
+        self.plus_dm = self.minus_dm = self.tr = 0.0
+        self.sum_dx = 0.0
+        self.adx = NAN
+
+    def _directional_index(self):
+        """Return DX for the current smoothed sums, or None when it is undefined."""
+        if _is_zero(self.tr):
+            return None
+        minus_di = 100.0 * (self.minus_dm / self.tr)
+        plus_di = 100.0 * (self.plus_dm / self.tr)
+        total = minus_di + plus_di
+        if _is_zero(total):
+            return None
+        return 100.0 * (abs(minus_di - plus_di) / total)
+
+    def update(self, high, low, close):
+        if self.count == 0:
+            if math.isnan(high) or math.isnan(low) or math.isnan(close):
+                return NAN
+            self.prev_high, self.prev_low, self.prev_close = high, low, close
+            self.count = 1
+            return NAN
+
+        bar = self.count
+        self.count += 1
+        diff_plus = high - self.prev_high
+        diff_minus = self.prev_low - low
+        self.prev_high, self.prev_low = high, low
+        true_range = high - low
+        gap = abs(high - self.prev_close)
+        if gap > true_range:
+            true_range = gap
+        gap = abs(low - self.prev_close)
+        if gap > true_range:
+            true_range = gap
+        self.prev_close = close
+
+        if bar >= self.period:
+            self.minus_dm -= self.minus_dm / self.period
+            self.plus_dm -= self.plus_dm / self.period
+        if diff_minus > 0 and diff_plus < diff_minus:
+            self.minus_dm += diff_minus
+        elif diff_plus > 0 and diff_plus > diff_minus:
+            self.plus_dm += diff_plus
+        if bar < self.period:
+            self.tr += true_range
+            return NAN
+        self.tr = self.tr - (self.tr / self.period) + true_range
+
+        dx = self._directional_index()
+        if bar < 2 * self.period - 1:
+            if dx is not None:
+                self.sum_dx += dx
+            return NAN
+        if bar == 2 * self.period - 1:
+            if dx is not None:
+                self.sum_dx += dx
+            self.adx = self.sum_dx / self.period
+        elif dx is not None:
+            self.adx = ((self.adx * (self.period - 1)) + dx) / self.period
+        return self.adx
+
+
+class _WaveTrendState:
+    """WaveTrend as computed by IndicatorCalculator.calculate_wavetrend."""
+
+    def __init__(self, n1, n2):
+        self.esa = _EMAState(n1)
+        self.d = _EMAState(n1)
+        self.wt1 = _EMAState(n2)
+        self.wt2 = _SMAState(4)
+
+    def update(self, high, low, close):
+        hlc3 = (high + low + close) / 3
+        esa = self.esa.update(hlc3)
+        d = self.d.update(abs(hlc3 - esa))
+        ci = _divide(hlc3 - esa, 0.015 * d)
+        wt1 = self.wt1.update(ci)
+        return wt1, self.wt2.update(wt1)
+
+
+class StreamingIndicatorEngine:
+    """
+    Incremental RSI, CCI, ADX and WaveTrend matching IndicatorCalculator's batch output.
+
+    ``seed`` replays a frame once; afterwards each new bar is folded in in constant time.
+    The state before the newest bar is kept, so a still-forming bar can be replaced when
+    its final values arrive.
+    """
+
+    def __init__(self, rsi_periods=(14, 9), cci_period=20, adx_period=20, adx_smoothing=2,
+                 wavetrend_n1=10, wavetrend_n2=11):
+        self.rsi_periods = tuple(rsi_periods)
+        self.cci_period = cci_period
+        self.adx_period = adx_period
+        self.adx_smoothing = adx_smoothing
+        self.wavetrend_n1 = wavetrend_n1
+        self.wavetrend_n2 = wavetrend_n2
+        self.columns = [f"RSI_{p}" for p in self.rsi_periods] + [f"CCI_{cci_period}", f"ADX_{adx_period}", "WT1", "WT2"]
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Drop all state and history."""
+        self._states = self._new_states()
+        self._previous_states = None
+        self._timestamps = []
+        self._values = {column: [] for column in self.columns}
+
+    def _new_states(self):
+        return {
+            "rsi": [_RSIState(p) for p in self.rsi_periods],
+            "cci": _CCIState(self.cci_period),
+            "adx": _ADXState(self.adx_period),
+            "adx_ema": _EMAState(self.adx_smoothing),
+            "wavetrend": _WaveTrendState(self.wavetrend_n1, self.wavetrend_n2),
+        }
+
+    def _step(self, high, low, close):
+        states = self._states
+        values = [state.update(close) for state in states["rsi"]]
+        values.append(states["cci"].update(high, low, close))
+        values.append(states["adx_ema"].update(states["adx"].update(high, low, close)))
+        values.extend(states["wavetrend"].update(high, low, close))
+        return values
+
+    def _append(self, timestamp, high, low, close, snapshot=True):
+        if snapshot:
+            self._previous_states = copy.deepcopy(self._states)
+        values = self._step(float(high), float(low), float(close))
+        self._timestamps.append(timestamp)
+        for column, value in zip(self.columns, values):
+            self._values[column].append(value)
+        return dict(zip(self.columns, values))
+
+    def update(self, timestamp, high, low, close, replace_last=False):
+        """Fold in one bar and return the latest indicator values.
+
+        With ``replace_last`` the bar replaces the newest one instead of being appended.
+        """
+        with self._lock:
+            if replace_last:
+                self._drop_last()
+            return self._append(timestamp, high, low, close)
+
+    def _drop_last(self):
+        if self._previous_states is None:
+            raise ValueError("No bar to replace")
+        self._states = self._previous_states
+        self._previous_states = None
+        self._timestamps.pop()
+        for column in self.columns:
+            self._values[column].pop()
+
+    def seed(self, df: pd.DataFrame):
+        """Replay every bar of ``df`` and return the indicator columns for it."""
+        with self._lock:
+            self.reset()
+            self._advance(df, 0)
+            logger.debug("Streaming indicators seeded with %d bars.", len(df))
+            return self._to_frame()
+
+    def update_frame(self, df: pd.DataFrame):
+        """Bring the engine up to date with ``df`` and return indicator columns aligned to it.
+
+        When ``df`` extends the bars seen so far, only its last known bar (which may have
+        been forming) and the bars after it are processed; otherwise the engine is reseeded.
+        """
+        with self._lock:
+            known = len(self._timestamps)
+            if (known == 0 or self._previous_states is None or len(df) < known
+                    or df.index[0] != self._timestamps[0] or df.index[known - 1] != self._timestamps[-1]):
+                self.reset()
+                self._advance(df, 0)
+                logger.debug("Streaming indicators reseeded with %d bars.", len(df))
+            else:
+                self._drop_last()
+                self._advance(df, known - 1)
+                logger.debug("Streaming indicators updated with %d bars.", len(df) - known + 1)
+            return self._to_frame()
+
+    def _advance(self, df, start):
+        highs, lows, closes = (df[column].to_numpy(dtype="float64") for column in ("High", "Low", "Close"))
+        last = len(df) - 1
+        for i in range(start, len(df)):
+            self._append(df.index[i], highs[i], lows[i], closes[i], snapshot=(i == last))
+
+    def _to_frame(self):
+        return pd.DataFrame(
+            {column: np.asarray(values, dtype="float64") for column, values in self._values.items()},
+            index=pd.Index(self._timestamps),
+        )
+
+
+class StreamingIndicatorRegistry:
+    """Process-wide streaming engines keyed by (ticker, interval)."""
+
+    def __init__(self):
+        self._engines = {}
+        self._lock = threading.Lock()
+
+    def get_engine(self, ticker: str, interval: str):
+        with self._lock:
+            engine = self._engines.get((ticker, interval))
+            if engine is None:
+                engine = StreamingIndicatorEngine()
+                self._engines[(ticker, interval)] = engine
+            return engine
+
+
+streaming_engines = StreamingIndicatorRegistry()
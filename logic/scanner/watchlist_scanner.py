@@ -0,0 +1,142 @@
+import asyncio
+import time
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from logic.cache.market_data_cache import market_data_cache
+from logic.indicators.panel_indicators import panel_indicator_engine
+from logging_config import logger
+
+
+class WatchlistScanner:
+    """
+    Latest indicator readings for a whole watchlist, fetched in batched Yahoo downloads.
+
+    Symbols are split into batches of ``batch_size`` and each batch is a single
+    ``yf.download`` call; at most ``max_concurrency`` batches are in flight at once.
+    """
+
+    # Enough history for ADX 20 (40 bars of warm-up) at every dashboard interval
+    PERIOD_MAP = {
+        "1m": "1d",
+        "5m": "5d",
+        "15m": "5d",
+        "30m": "1mo",
+        "60m": "1mo",
+    }
+    INTERVAL_MAP = {
+        "1min": "1m",
+        "5min": "5m",
+        "15min": "15m",
+        "30min": "30m",
+        "60min": "60m",
+    }
+    COLUMNS = ["Stock", "Symbol", "Close", "Change %", "RSI_14", "RSI_9", "CCI_20", "ADX_20", "WT1", "WT2"]
+
+    def __init__(self, stocks: dict, interval: str, batch_size: int = 10, max_concurrency: int = 5):
+        self.stocks = stocks  # Display name -> ticker symbol
+        self.interval = interval
+        self.yahoo_interval = self.INTERVAL_MAP.get(interval, "5m")
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        logger.info("Initialized WatchlistScanner for %d symbols with interval %s", len(stocks), interval)
+
+    async def scan(self):
+        """Return the latest readings for every symbol, shared across sessions via the market data cache."""
+        scan_key = "scan:" + ",".join(sorted(self.stocks.values()))
+        return await market_data_cache.get_or_fetch(scan_key, self.interval, self._scan)
+
+    async def _scan(self):
+        start_time = time.time()
+        symbols = list(self.stocks.values())
+        batches = [symbols[i:i + self.batch_size] for i in range(0, len(symbols), self.batch_size)]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(batch):
+            async with semaphore:
+                return await asyncio.to_thread(self._download_batch, batch)
+
+        frames = {}
+        for batch_frames in await asyncio.gather(*(fetch(batch) for batch in batches)):
+            frames.update(batch_frames)
+
+        rows = await asyncio.to_thread(self._summarize, frames)
+        logger.info("Scanned %d symbols in %.2f seconds.", len(symbols), time.time() - start_time)
+        return rows
+
+    def _download_batch(self, symbols):
+        """Download one batch of symbols with a single Yahoo request."""
+        try:
+            data = yf.download(
+                symbols,
+                period=self.PERIOD_MAP[self.yahoo_interval],
+                interval=self.yahoo_interval,
+                group_by="ticker",
+                auto_adjust=False,
+                threads=False,
+                progress=False,
+            )
+        except Exception as e:
+            logger.error("Batch download failed for %s: %s", symbols, e)
+            return {}
+
+        frames = {}
+        for symbol in symbols:
+            if isinstance(data.columns, pd.MultiIndex):
+                if symbol not in data.columns.get_level_values(0):
+                    logger.warning("No scanner data returned for %s.", symbol)
+                    continue
+                frame = data[symbol]
+            else:
+                frame = data
+            frames[symbol] = frame.dropna(how="all")
+        return frames
+
+    def _summarize(self, frames):
+        """Compute the dashboard indicators for every symbol in one panel pass and keep the latest values."""
+        symbols = [symbol for symbol in dict.fromkeys(self.stocks.values())
+                   if frames.get(symbol) is not None and not frames[symbol].empty]
+        latest = {}
+        if symbols:
+            # Each symbol's bars are packed from column 0, so gaps in one symbol's
+            # history do not leave holes in its row
+            lengths = np.array([len(frames[symbol]) for symbol in symbols])
+            panel = {column: np.full((len(symbols), lengths.max()), np.nan) for column in ("High", "Low", "Close")}
+            for row, symbol in enumerate(symbols):
+                for column, values in panel.items():
+                    values[row, :lengths[row]] = frames[symbol][column].to_numpy(dtype="float64")
+            indicators = panel_indicator_engine.compute(panel["High"], panel["Low"], panel["Close"])
+
+            rows = np.arange(len(symbols))
+            last = lengths - 1
+            closes = panel["Close"][rows, last]
+            # Change over the fetched window (PERIOD_MAP), not since the previous close
+            changes = (closes / panel["Close"][:, 0] - 1) * 100
+            for row, symbol in enumerate(symbols):
+                latest[symbol] = {"Close": closes[row], "Change %": changes[row]}
+                for column in self.COLUMNS[4:]:
+                    latest[symbol][column] = indicators[column][row, last[row]] if column in indicators else np.nan
+
+        rows = [{"Stock": name, "Symbol": symbol, **latest.get(symbol, {})} for name, symbol in self.stocks.items()]
+        return pd.DataFrame(rows, columns=self.COLUMNS)
+
+
+def _heat_color(value, low, high):
+    """Green below ``low``, red above ``high``, nothing in between."""
+    if pd.isna(value):
+        return ""
+    if value <= low:
+        return "background-color: rgba(0, 160, 0, 0.45)"
+    if value >= high:
+        return "background-color: rgba(200, 0, 0, 0.45)"
+    return ""
+
+
+def style_scan_results(results: pd.DataFrame):
+    """Heatmap styling for the scanner table: oversold in green, overbought in red."""
+    return (results.style
+            .format(precision=2)
+            .map(lambda v: _heat_color(v, 30, 70), subset=["RSI_14", "RSI_9"])
+            .map(lambda v: _heat_color(v, -100, 100), subset=["CCI_20"])
+            .map(lambda v: _heat_color(v, -60, 60), subset=["WT1", "WT2"]))
@@ -0,0 +1,105 @@
+import time
+import asyncio
+import threading
+
+from logic.cache.market_data_cache import market_data_cache
+from logic.cache.tiered_cache import INTERVAL_SECONDS, bar_close_expiry
+from utils.event_loop import submit
+from logging_config import logger
+
+
+async def fetch_latest_bars(symbol: str, interval: str):
+    """Fetch the latest bars exactly as a page refresh does, so on-demand reads join the same fetch."""
+    # The handler module imports this one for the scheduler singleton
+    from data_fetchers.stock_data_handler.stock_data_handler import fetch_market_data
+
+    return await fetch_market_data(symbol, interval)
+
+
+class PrefetchScheduler:
+    """
+    Keeps watched (symbol, interval) pairs fresh from a background thread.
+
+    Each watched pair is fetched once when it is first watched and then ``grace_seconds``
+    after every bar close for its interval; the result is published as the pair's latest
+    snapshot. Page reruns call ``watch`` and read ``latest`` instead of waiting on the
+    provider right after a bar close. A snapshot is served for no longer than an entry of
+    the market data cache, so later reruns refetch the forming bar through the cache. A
+    pair nobody has watched for ``idle_seconds`` is dropped.
+
+    Refresh loops run as tasks on the application event loop, never in a script run.
+    """
+
+    def __init__(self, fetch=fetch_latest_bars, grace_seconds: float = 2.0, idle_seconds: float = 300.0):
+        self._fetch = fetch
+        self.grace_seconds = grace_seconds
+        self.idle_seconds = idle_seconds
+        self._snapshots = {}  # (symbol, interval) -> (published_at, data)
+        self._last_watched = {}  # (symbol, interval) -> monotonic time of the last watch() call
+        self._tasks = {}  # (symbol, interval) -> concurrent.futures.Future of its refresh loop
+        self._lock = threading.Lock()
+
+    def watch(self, symbol: str, interval: str):
+        """Keep (symbol, interval) fresh until it has not been watched for ``idle_seconds``."""
+        key = (symbol, interval)
+        with self._lock:
+            self._last_watched[key] = time.monotonic()
+            if key in self._tasks:
+                return
+            self._tasks[key] = submit(self._refresh(key))
+        logger.info("Prefetching %s (%s) at every bar close.", symbol, interval)
+
+    def latest(self, symbol: str, interval: str):
+        """Return the snapshot published since the current bar opened, or None if there is none or it is stale."""
+        with self._lock:
+            snapshot = self._snapshots.get((symbol, interval))
+        if snapshot is None:
+            return None
+        published_at, data = snapshot
+        now = time.time()
+        # The forming bar keeps changing; past the cache's TTL it is refetched like any rerun's data
+        if now - published_at > market_data_cache.ttl_seconds:
+            return None
+        bar_opened_at = now - (INTERVAL_SECONDS.get(interval, 5 * 60) - bar_close_expiry(interval, now, 0.0, symbol))
+        return data if published_at >= bar_opened_at else None
+
+    async def _refresh(self, key):
+        symbol, interval = key
+        first = True
+        try:
+            while True:
+                with self._lock:
+                    if time.monotonic() - self._last_watched.get(key, 0.0) > self.idle_seconds:
+                        logger.info("No session is watching %s (%s); stopping its prefetch.", symbol, interval)
+                        return
+                if not first:
+                    # A cache entry fetched just before the bar closed would otherwise be
+                    # published as the new bar's snapshot. Shared snapshots never outlive a bar.
+                    market_data_cache.invalidate(symbol, interval, shared=False)
+                first = False
+                try:
+                    data = await self._fetch(symbol, interval)
+                except Exception as e:
+                    logger.error("Prefetch failed for %s (%s): %s", symbol, interval, e)
+                else:
+                    if data is not None and not data.empty:
+                        with self._lock:
+                            self._snapshots[key] = (time.time(), data)
+                        logger.debug("Published snapshot of %d bars for %s (%s).", len(data), symbol, interval)
+                await asyncio.sleep(bar_close_expiry(interval, symbol=symbol) + self.grace_seconds)
+        finally:
+            with self._lock:
+                self._tasks.pop(key, None)
+                self._last_watched.pop(key, None)
+                self._snapshots.pop(key, None)
+
+    def stop(self):
+        """Cancel every refresh loop."""
+        with self._lock:
+            tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+
+
+# Single scheduler shared by all sessions of this Streamlit process.
+prefetch_scheduler = PrefetchScheduler()
@@ -1,16 +1,19 @@
 import numpy as np
 import pandas as pd
-from scipy.spatial.distance import cdist
+from numpy.lib.stride_tricks import sliding_window_view
 from sklearn.base import BaseEstimator, ClassifierMixin
 
+from logging_config import logger
+
 
 class LorentzianClassifier(BaseEstimator, ClassifierMixin):
     """
     Basic Lorentzian Classification implementation for price pattern recognition
     """
-    def __init__(self, n_neighbors=5, lookback=14):
+    def __init__(self, n_neighbors=5, lookback=14, max_chunk_bytes=64 * 1024 * 1024):
         self.n_neighbors = n_neighbors
         self.lookback = lookback
+        self.max_chunk_bytes = max_chunk_bytes  # Memory budget for one block of pairwise scores
         self.X_train = None
         self.y_train = None
 
@@ -18,26 +21,105 @@ class LorentzianClassifier(BaseEstimator, ClassifierMixin):
         """Calculate Lorentzian distance between two vectors"""
         return np.sum(np.log(1 + np.abs(a - b)))
 
+    def _lorentzian_scores(self, X):
+        """Yield (start, scores) blocks ranking the training rows by Lorentzian distance to X
+
+        The score is exp(distance), the product of (1 + |a - b|) over features. It orders
+        neighbours exactly like the distance without taking a log of every element.
+        """
+        n_train, n_features = self.X_train.shape
+        rows_per_chunk = max(1, self.max_chunk_bytes // (16 * max(1, n_train)))
+        for start in range(0, len(X), rows_per_chunk):
+            block = X[start:start + rows_per_chunk]
+            scores = np.ones((len(block), n_train))
+            term = np.empty_like(scores)
+            for feature in range(n_features):
+                np.subtract.outer(block[:, feature], self.X_train[:, feature], out=term)
+                np.abs(term, out=term)
+                term += 1
+                scores *= term
+            yield start, scores
+
+    @staticmethod
+    def _nearest_mask(distances, k):
+        """Mark the k smallest distances per row, breaking ties by training order like a stable argsort"""
+        if k >= distances.shape[1]:
+            return np.ones(distances.shape, dtype=bool)
+        kth = np.partition(distances, k - 1, axis=1)[:, k - 1:k]
+        closer = distances < kth
+        tied = distances == kth
+        remaining = k - closer.sum(axis=1, keepdims=True)
+        if np.all(tied.sum(axis=1, keepdims=True) == remaining):
+            return closer | tied  # No ties straddle the k-th neighbour
+        return closer | (tied & (np.cumsum(tied, axis=1) <= remaining))
+
     def fit(self, X, y):
         """Store training data"""
-        self.X_train = X[-self.lookback:]  # Use most recent patterns
-        self.y_train = y[-self.lookback:]
+        self.X_train = np.asarray(X, dtype=np.float64)[-self.lookback:]  # Use most recent patterns
+        self.y_train = np.asarray(y, dtype=np.float64)[-self.lookback:]
         return self
 
     def predict(self, X):
         """Predict using Lorentzian distance"""
         if self.X_train is None:
             raise ValueError("Classifier not fitted yet")
-        distances = cdist(X, self.X_train, metric=self._lorentzian_distance)
-        nearest_indices = np.argsort(distances, axis=1)[:, :self.n_neighbors]
-        neighbor_classes = self.y_train[nearest_indices]
-        return np.sign(np.mean(neighbor_classes, axis=1))
+        X = np.asarray(X, dtype=np.float64)
+        k = min(self.n_neighbors, len(self.y_train))
+        predictions = np.empty(len(X))
+        for start, scores in self._lorentzian_scores(X):
+            neighbors = self._nearest_mask(scores, k)
+            predictions[start:start + len(scores)] = neighbors @ self.y_train / k
+        return np.sign(predictions)
+
+    def walk_forward_predict(self, X, y):
+        """Predict every row from the ``lookback`` rows before it, as if refitted at each bar
+
+        Equivalent to calling fit(X[:i], y[:i]) and predict(X[i:i + 1]) for every i, but the
+        rolling windows are strided views and rows are scored in chunks bounded by
+        max_chunk_bytes. The first row has no history and is NaN.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        n_rows, n_features = X.shape
+        predictions = np.full(n_rows, np.nan)
+
+        # Rows with fewer than k predecessors use all of them, like a refit would.
+        for i in range(1, min(self.n_neighbors, n_rows)):
+            predictions[i] = np.sign(np.mean(y[max(0, i - self.lookback):i]))
+        first = min(self.n_neighbors, n_rows)
+        if first >= n_rows:
+            return predictions
+
+        # Pad the history so row i's window X[i - lookback:i] is window i of the padded series;
+        # padding rows score +inf and are never chosen once at least k real rows exist.
+        lookback = self.lookback
+        padded_X = np.vstack([np.full((lookback, n_features), np.nan), X])
+        padded_y = np.concatenate([np.zeros(lookback), y])
+        label_windows = sliding_window_view(padded_y, lookback)
+        feature_windows = [sliding_window_view(padded_X[:, f], lookback) for f in range(n_features)]
+
+        rows_per_chunk = max(1, self.max_chunk_bytes // (16 * lookback))
+        for start in range(first, n_rows, rows_per_chunk):
+            stop = min(start + rows_per_chunk, n_rows)
+            scores = np.ones((stop - start, lookback))
+            term = np.empty_like(scores)
+            for feature in range(n_features):
+                np.subtract(X[start:stop, feature, None], feature_windows[feature][start:stop], out=term)
+                np.abs(term, out=term)
+                term += 1
+                scores *= term
+            if start < lookback:
+                scores[np.isnan(scores)] = np.inf
+            neighbors = self._nearest_mask(scores, self.n_neighbors)
+            votes = np.einsum("ij,ij->i", neighbors, label_windows[start:stop])
+            predictions[start:stop] = np.sign(votes / self.n_neighbors)
+        return predictions
 
 
 class IndicatorCalculator:
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, n_neighbors=5, lookback=14):
         self.df = df
-        self.lc_model = LorentzianClassifier(n_neighbors=5, lookback=14)
+        self.lc_model = LorentzianClassifier(n_neighbors=n_neighbors, lookback=lookback)
 
     def calculate_rsi(self, period=14):
         """Relative Strength Index (RSI) calculation"""
@@ -78,31 +160,45 @@ class IndicatorCalculator:
         return wt1, wt2
 
     def add_ml_features(self):
-        """Create features for ML model (do not drop rows here)"""
-        self.df['Returns'] = self.df['Close'].pct_change()
-        self.df['Label'] = np.where(self.df['Returns'].shift(-1) > 0, 1, -1)
-        return self.df
-
-    def compute_ml_predictions(self):
-        """Compute Lorentzian Classification predictions"""
+        """Create features for ML model (do not drop rows here)
+
+        Returns a separate frame: ``Label`` looks one bar ahead and must not end up in
+        ``self.df``, which callers chart and export.
+        """
+        features = self.df[['RSI_14', 'CCI_20', 'ADX_20', 'WT1']].copy()
+        features['Returns'] = self.df['Close'].pct_change()
+        features['Label'] = np.where(features['Returns'].shift(-1) > 0, 1, -1)
+        return features
+
+    def compute_ml_predictions(self, walk_forward=False):
+        """Compute Lorentzian Classification predictions
+
+        By default the model is fitted on the first 80% of rows and predicts the rest. With
+        ``walk_forward`` every row is predicted from the rolling window of rows before it.
+        """
         # Add the features (but do not drop rows yet)
         df_temp = self.add_ml_features()
         # Now drop NaNs only for the columns needed for ML
         df_clean = df_temp.dropna(subset=['Returns', 'Label', 'RSI_14', 'CCI_20', 'ADX_20', 'WT1'])
-        print("Total feature rows:", len(df_clean))
+        logger.debug("Total feature rows: %d", len(df_clean))
         if df_clean.empty:
-            print("⚠️ No valid data left after cleaning NaNs!")
+            logger.warning("No valid data left for ML predictions after cleaning NaNs.")
             return self.df
 
         features = df_clean[['RSI_14', 'CCI_20', 'ADX_20', 'WT1']]
         labels = df_clean['Label']
 
+        if walk_forward:
+            predictions = self.lc_model.walk_forward_predict(features.values, labels.values)
+            self.df.loc[df_clean.index, 'LC_Prediction'] = predictions
+            return self.df
+
         split_idx = int(len(features) * 0.8)
         X_train, X_test = features[:split_idx], features[split_idx:]
         y_train, y_test = labels[:split_idx], labels[split_idx:]
 
         if X_test.empty:
-            print("⚠️ Warning: X_test is empty! No predictions will be made.")
+            logger.warning("No rows left to predict after the training split; no predictions made.")
             return self.df
 
         self.lc_model.fit(X_train.values, y_train.values)
@@ -122,19 +218,20 @@ class IndicatorCalculator:
 
 # === Testing & Execution ===
 
-np.random.seed(42)
-# Generate synthetic stock data (200 rows for a better training sample)
-dates = pd.date_range(start="2024-01-01", periods=200, freq="D")
-close_prices = np.cumsum(np.random.randn(200) * 2 + 100)
-df = pd.DataFrame({
-    'Date': dates,
-    'Close': close_prices,
-    'High': close_prices + np.random.rand(200) * 2,
-    'Low': close_prices - np.random.rand(200) * 2
-})
-df.set_index('Date', inplace=True)
-
-# Run IndicatorCalculator
-indicator_calculator = IndicatorCalculator(df)
-df_with_indicators = indicator_calculator.compute_all_indicators()
-print(df_with_indicators.tail(10))
+if __name__ == "__main__":
+    np.random.seed(42)
+    # Generate synthetic stock data (200 rows for a better training sample)
+    dates = pd.date_range(start="2024-01-01", periods=200, freq="D")
+    close_prices = np.cumsum(np.random.randn(200) * 2 + 100)
+    df = pd.DataFrame({
+        'Date': dates,
+        'Close': close_prices,
+        'High': close_prices + np.random.rand(200) * 2,
+        'Low': close_prices - np.random.rand(200) * 2
+    })
+    df.set_index('Date', inplace=True)
+
+    # Run IndicatorCalculator
+    indicator_calculator = IndicatorCalculator(df)
+    df_with_indicators = indicator_calculator.compute_all_indicators()
+    print(df_with_indicators.tail(10))
@@ -2,92 +2,129 @@ import aiohttp
 import asyncio
 import pandas as pd
 import os
-import yfinance as yf
-from diskcache import Cache
+from config import get_secret
+from logic.cache.bar_store import bar_store
+from logic.cache.frame_schema import compact_ohlcv
+from logic.cache.tiered_cache import bar_close_expiry, cache_key, get_tiered_cache
+from services.http_client.http_client import TokenBucketRateLimiter, get_http_session
+from services.yahoo_finance_fetcher.yahoo_finance_fetcher import YahooFinanceFetcher
+from utils.metrics import metrics
 from logging_config import alpha_logger
 
 
+# Free keys allow 5 requests per minute; premium keys can raise this through the environment
+REQUESTS_PER_MINUTE = float(os.getenv("ALPHA_VANTAGE_REQUESTS_PER_MINUTE", "5"))
+alpha_vantage_rate_limiter = TokenBucketRateLimiter(REQUESTS_PER_MINUTE, name="alpha_vantage")
+
+
 class AlphaVantageFetcher:
-    BASE_URL = "https://www.alphavantage.co/query"
-    API_KEY = os.getenv("ALPHA_VANTAGE_API_KEY")
+    BASE_URL = os.getenv("ALPHA_VANTAGE_BASE_URL", "https://www.alphavantage.co/query")  # e.g. a local stand-in
+    API_KEY = None  # When unset, ALPHA_VANTAGE_API_KEY from the environment or secrets.json is read on first fetch
 
     def __init__(self, ticker: str, interval: str = "5min"):
         self.ticker = ticker
         self.interval = interval
-        self.cache = Cache("./cache")
-        self.semaphore = asyncio.Semaphore(3)
-        alpha_logger.info("Initialized AlphaVantageFetcher for %s with interval %s", self.ticker, self.interval)
+        self.cache = get_tiered_cache()
+        alpha_logger.debug("Initialized AlphaVantageFetcher for %s with interval %s", self.ticker, self.interval)
 
     async def _fetch(self, session: aiohttp.ClientSession, url: str):
-        async with self.semaphore:
-            retries = 3
-            delay = 5
-
-            for attempt in range(retries):
-                try:
-                    async with session.get(url) as response:
-                        response.raise_for_status()
-                        data = await response.json()
-
-                        if "Note" in data:  # API rate limit hit
-                            alpha_logger.warning("Rate limit hit, retrying in %s seconds...", delay)
-                            await asyncio.sleep(delay)
-                            delay *= 2
-                            continue
-
-                        return data  # Successful response
-
-                except aiohttp.ClientError as e:
-                    alpha_logger.error("Network error: %s", e)
-                    return None  # Network error, return None immediately
+        retries = 3
+
+        for attempt in range(retries):
+            # Pace requests across the whole process so the quota is never exceeded
+            await alpha_vantage_rate_limiter.acquire()
+            try:
+                async with session.get(url) as response:
+                    response.raise_for_status()
+                    data = await response.json()
+
+                    if "Note" in data:  # API rate limit hit (the key's quota is used elsewhere too)
+                        metrics.increment("upstream_requests", provider="alpha_vantage", result="rate_limited")
+                        metrics.increment("rate_limit_events", limiter="alpha_vantage", kind="note")
+                        alpha_logger.warning("Rate limit hit, waiting for the rate limiter to refill...")
+                        alpha_vantage_rate_limiter.drain()
+                        continue
+
+                    metrics.increment("upstream_requests", provider="alpha_vantage", result="ok")
+                    return data  # Successful response
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                metrics.increment("upstream_requests", provider="alpha_vantage", result="error")
+                alpha_logger.error("Network error: %s", e)
+                return None  # Network error, return None immediately
 
         return None  # After all retries fail
 
-    async def fetch_intraday_data(self):
-        """Fetch stock data with caching. Falls back to Yahoo Finance if AlphaVantage fails."""
-        cache_key = f"{self.ticker}_intraday"
-        cached_data = self.cache.get(cache_key)
+    async def fetch_intraday_data(self, fallback_to_yahoo: bool = True):
+        """Fetch stock data with caching. Falls back to Yahoo Finance if AlphaVantage fails.
 
-        if cached_data is not None:
-            alpha_logger.info("Using cached data for %s", self.ticker)
-            return cached_data
+        Without the fallback, None means AlphaVantage did not answer (network error or rate
+        limit) and an empty DataFrame means it answered without data for the symbol.
+        """
+        alpha_key = cache_key("alpha_vantage", self.ticker, self.interval)
+        yahoo_key = cache_key("yahoo_finance", self.ticker, self.interval)
+        for key in ([alpha_key, yahoo_key] if fallback_to_yahoo else [alpha_key]):
+            cached_data = self.cache.get(key)
+            if cached_data is not None:
+                alpha_logger.info("Using cached data for %s", self.ticker)
+                return cached_data
 
         # Fetch from AlphaVantage
+        api_key = self.API_KEY or get_secret("ALPHA_VANTAGE_API_KEY")
         url = (f"{self.BASE_URL}?function=TIME_SERIES_INTRADAY&symbol={self.ticker}&"
-               f"interval={self.interval}&apikey={self.API_KEY}&outputsize=compact")
-
-        async with aiohttp.ClientSession() as session:
-            data = await self._fetch(session, url)
-
-            if data and f"Time Series ({self.interval})" in data:
-                df = pd.DataFrame.from_dict(data[f"Time Series ({self.interval})"], orient='index', dtype=float)
-                df = df.rename(columns={
-                    "1. open": "Open",
-                    "2. high": "High",
-                    "3. low": "Low",
-                    "4. close": "Close",
-                    "5. volume": "Volume"
-                })
-                df.index = pd.to_datetime(df.index)
-                df.sort_index(inplace=True)
-                self.cache.set(cache_key, df, expire=600)
-                alpha_logger.info("AlphaVantage data fetched and cached for %s", self.ticker)
-                return df
-
-        # If AlphaVantage fails, fall back to Yahoo Finance
-        alpha_logger.warning("AlphaVantage data not available for %s, switching to Yahoo Finance...", self.ticker)
-        try:
-            stock = yf.Ticker(self.ticker)
-            df = stock.history(period="1d", interval=self.interval)
+               f"interval={self.interval}&apikey={api_key}&outputsize=compact")
 
-            if df.empty:
-                alpha_logger.error("Yahoo Finance data also unavailable for %s", self.ticker)
-                return pd.DataFrame()
+        data = await self._fetch(get_http_session(), url)
 
-            self.cache.set(cache_key, df, expire=600)
-            alpha_logger.info("Yahoo Finance data fetched and cached for %s", self.ticker)
+        if data and f"Time Series ({self.interval})" in data:
+            time_series = data[f"Time Series ({self.interval})"]
+            df = self._parse_time_series(time_series)
+            # A compact payload is the latest 100 bars, across sessions; keep that window
+            df = bar_store.merge("alpha_vantage", self.ticker, self.interval, df, max_bars=len(time_series))
+            self.cache.set(alpha_key, df, expire=bar_close_expiry(self.interval, symbol=self.ticker))
+            alpha_logger.info("AlphaVantage data fetched and cached for %s", self.ticker)
             return df
 
-        except Exception as e:
-            alpha_logger.error("Failed to fetch data from Yahoo Finance: %s", str(e))
+        if not fallback_to_yahoo:
+            if data is None:
+                return None
+            alpha_logger.warning("AlphaVantage has no data for %s: %s", self.ticker,
+                                 data.get("Error Message") or data.get("Information") or "empty response")
+            return pd.DataFrame() if "Error Message" in data else None
+
+        # If AlphaVantage fails, fall back to Yahoo Finance
+        alpha_logger.warning("AlphaVantage data not available for %s, switching to Yahoo Finance...", self.ticker)
+        with metrics.span("fallback", provider="yahoo_finance"):
+            df = await YahooFinanceFetcher(self.ticker, self.interval).fetch_stock_data()
+
+        if df is None or df.empty:
+            alpha_logger.error("Yahoo Finance data also unavailable for %s", self.ticker)
             return pd.DataFrame()
+
+        self.cache.set(yahoo_key, df, expire=bar_close_expiry(self.interval, symbol=self.ticker))
+        alpha_logger.info("Yahoo Finance data fetched and cached for %s", self.ticker)
+        return df
+
+    def _parse_time_series(self, time_series: dict):
+        """Build an OHLCV frame from the raw time series, parsing only bars we do not have yet.
+
+        Alpha Vantage has no "since" parameter, so the compact payload is still downloaded.
+        Rows older than the last stored bar are skipped before parsing; the last stored
+        bar itself is re-parsed because it may still have been forming.
+        """
+        last_timestamp = bar_store.last_timestamp("alpha_vantage", self.ticker, self.interval)
+        if last_timestamp is not None:
+            since = last_timestamp.strftime("%Y-%m-%d %H:%M:%S")
+            time_series = {ts: bar for ts, bar in time_series.items() if ts >= since}
+            alpha_logger.debug("Parsing %d new AlphaVantage bars for %s", len(time_series), self.ticker)
+
+        df = pd.DataFrame.from_dict(time_series, orient='index', dtype=float)
+        df = df.rename(columns={
+            "1. open": "Open",
+            "2. high": "High",
+            "3. low": "Low",
+            "4. close": "Close",
+            "5. volume": "Volume"
+        })
+        df.index = pd.to_datetime(df.index)
+        return compact_ohlcv(df)
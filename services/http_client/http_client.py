@@ -0,0 +1,102 @@
+import time
+import asyncio
+import threading
+import weakref
+import aiohttp
+
+from utils.metrics import metrics
+from logging_config import logger
+
+# Explicit timeouts so a stalled upstream cannot hold a refresh indefinitely
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5, sock_read=10)
+# Connections per host stay open between requests, which also caps concurrency per provider
+CONNECTIONS_PER_HOST = 3
+KEEPALIVE_SECONDS = 60
+
+_sessions = weakref.WeakKeyDictionary()  # event loop -> aiohttp.ClientSession
+_sessions_lock = threading.Lock()
+
+
+def get_http_session():
+    """
+    Return the pooled, keep-alive ClientSession for the running event loop.
+
+    aiohttp sessions are bound to the loop that created them, so one session is kept
+    per loop and reused by every fetcher running on it.
+    """
+    loop = asyncio.get_running_loop()
+    with _sessions_lock:
+        session = _sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=CONNECTIONS_PER_HOST,
+                keepalive_timeout=KEEPALIVE_SECONDS,
+                ttl_dns_cache=300,
+            )
+            session = aiohttp.ClientSession(connector=connector, timeout=DEFAULT_TIMEOUT)
+            _sessions[loop] = session
+            logger.debug("Created pooled HTTP session for event loop %s", id(loop))
+        return session
+
+
+async def close_http_session():
+    """Close the pooled session of the running event loop, if any."""
+    with _sessions_lock:
+        session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+class TokenBucketRateLimiter:
+    """
+    Process-wide token bucket that paces requests before they reach the provider.
+
+    Tokens refill at ``rate_per_minute`` up to ``capacity``. Callers reserve a token
+    under a threading lock (sessions run on different threads and loops), then sleep
+    on their own loop until the reserved token is due, so waiters are served in order.
+    A waiter cancelled before its token is due gives the token back.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float = None, name: str = "default"):
+        self.name = name  # Label for the rate limit metrics
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """Take a token, possibly borrowed from the future, and return how long to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_second)
+            self._updated_at = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate_per_second
+
+    def _refund(self):
+        """Return a reserved token that was never used."""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    async def acquire(self):
+        """Wait until a request may be sent."""
+        wait = self._reserve()
+        if wait > 0:
+            logger.info("Rate limiter pacing request for %.2f seconds", wait)
+            metrics.increment("rate_limit_events", limiter=self.name, kind="paced")
+            metrics.observe("rate_limit_wait", wait, limiter=self.name)
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                # e.g. the router cancelling a hedged attempt; otherwise the debt only grows
+                self._refund()
+                raise
+
+    def drain(self):
+        """Empty the bucket, e.g. after the provider reports the quota is exhausted."""
+        with self._lock:
+            self._tokens = min(self._tokens, 0.0)
+            self._updated_at = time.monotonic()
@@ -0,0 +1,88 @@
+import time
+import threading
+
+from logging_config import logger
+
+
+def symbol_suffix(symbol: str):
+    """Exchange suffix of a ticker (".NS" for "TCS.NS"), or None for plain tickers."""
+    _, dot, suffix = symbol.rpartition(".")
+    return f".{suffix.upper()}" if dot and suffix else None
+
+
+class ProviderCircuitBreaker:
+    """
+    Remembers which providers actually serve which symbols.
+
+    Two kinds of failure are tracked per (provider, symbol):
+
+    * A capability miss (the provider answered but has no data for the symbol) opens the
+      breaker for that symbol for ``capability_ttl`` seconds right away. Once
+      ``suffix_threshold`` distinct symbols sharing an exchange suffix have missed, and the
+      provider has not served any symbol with that suffix, the whole suffix is skipped too.
+    * A transient error (exception, timeout, no answer) opens the breaker after
+      ``failure_threshold`` consecutive errors for ``cooldown`` seconds. After that one trial
+      request is let through (half-open); a success closes it again.
+    """
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 60.0, capability_ttl: float = 6 * 3600,
+                 suffix_threshold: int = 2):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.capability_ttl = capability_ttl
+        self.suffix_threshold = suffix_threshold
+        self._open_until = {}  # (provider, scope) -> monotonic time the breaker closes again
+        self._errors = {}  # (provider, symbol) -> consecutive transient errors
+        self._suffix_misses = {}  # (provider, suffix) -> symbols the provider had no data for
+        self._lock = threading.Lock()
+
+    def allows(self, provider: str, symbol: str):
+        """Return whether ``provider`` should be asked for ``symbol`` now."""
+        now = time.monotonic()
+        with self._lock:
+            for scope in (symbol, symbol_suffix(symbol)):
+                if scope is not None and self._open_until.get((provider, scope), 0.0) > now:
+                    return False
+        return True
+
+    def record_success(self, provider: str, symbol: str):
+        suffix = symbol_suffix(symbol)
+        with self._lock:
+            self._errors.pop((provider, symbol), None)
+            self._open_until.pop((provider, symbol), None)
+            if suffix is not None:
+                self._suffix_misses.pop((provider, suffix), None)
+                self._open_until.pop((provider, suffix), None)
+
+    def record_miss(self, provider: str, symbol: str):
+        """The provider answered without data for ``symbol``."""
+        suffix = symbol_suffix(symbol)
+        now = time.monotonic()
+        until = now + self.capability_ttl
+        with self._lock:
+            self._errors.pop((provider, symbol), None)
+            self._open_until[(provider, symbol)] = until
+            if suffix is None:
+                return
+            misses = self._suffix_misses.setdefault((provider, suffix), set())
+            misses.add(symbol)
+            if len(misses) >= self.suffix_threshold and self._open_until.get((provider, suffix), 0.0) <= now:
+                self._open_until[(provider, suffix)] = until
+                logger.info("Skipping %s for %s symbols: no data for %s.", provider, suffix, sorted(misses))
+
+    def record_error(self, provider: str, symbol: str):
+        """The provider failed transiently for ``symbol``."""
+        with self._lock:
+            errors = self._errors.get((provider, symbol), 0) + 1
+            self._errors[(provider, symbol)] = errors
+            if errors >= self.failure_threshold:
+                self._open_until[(provider, symbol)] = time.monotonic() + self.cooldown
+                # Half-open after the cooldown: the next error re-opens it immediately
+                self._errors[(provider, symbol)] = self.failure_threshold - 1
+                logger.warning("Circuit opened for %s on %s after %d consecutive errors.", provider, symbol, errors)
+
+    def reset(self):
+        with self._lock:
+            self._open_until.clear()
+            self._errors.clear()
+            self._suffix_misses.clear()
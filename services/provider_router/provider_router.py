@@ -0,0 +1,120 @@
+import asyncio
+import time
+
+from services.alpha_vantage_fetcher.alpha_vantage_fetcher import AlphaVantageFetcher
+from services.provider_router.circuit_breaker import ProviderCircuitBreaker
+from services.yahoo_finance_fetcher.yahoo_finance_fetcher import YahooFinanceFetcher
+from utils.metrics import metrics
+from logging_config import logger
+
+
+async def fetch_alpha_vantage(symbol, interval):
+    return await AlphaVantageFetcher(symbol, interval).fetch_intraday_data(fallback_to_yahoo=False)
+
+
+async def fetch_yahoo_finance(symbol, interval):
+    return await YahooFinanceFetcher(symbol, interval).fetch_stock_data()
+
+
+# Provider name -> coroutine function (symbol, interval) -> DataFrame, in order of preference
+DEFAULT_PROVIDERS = {
+    "alpha_vantage": fetch_alpha_vantage,
+    "yahoo_finance": fetch_yahoo_finance,
+}
+
+
+class ProviderRouter:
+    """
+    Race market data providers for a symbol and return the first usable answer.
+
+    Providers are started in order of preference, skipping those the circuit breaker has
+    learned do not serve the symbol. The next provider is started as soon as the previous
+    one fails, or after ``hedge_delay`` seconds without an answer. The first non-empty
+    frame wins and the remaining attempts are cancelled; after ``deadline`` seconds the
+    race is abandoned. A provider returning None counts as a transient error, an empty
+    frame as "no data for this symbol".
+    """
+
+    def __init__(self, providers: dict = None, hedge_delay: float = 2.0, deadline: float = 20.0,
+                 breaker: ProviderCircuitBreaker = None):
+        self.providers = dict(DEFAULT_PROVIDERS if providers is None else providers)
+        self.hedge_delay = hedge_delay
+        self.deadline = deadline
+        self.breaker = breaker or ProviderCircuitBreaker()
+
+    def candidates(self, symbol: str):
+        """Providers worth asking for ``symbol``; all of them if every breaker is open."""
+        allowed = [name for name in self.providers if self.breaker.allows(name, symbol)]
+        return allowed or list(self.providers)
+
+    async def _attempt(self, name, symbol, interval):
+        start_time = time.time()
+        try:
+            with metrics.span("provider_fetch", provider=name):
+                data = await self.providers[name](symbol, interval)
+        except asyncio.CancelledError:
+            metrics.increment("provider_results", provider=name, result="cancelled")
+            raise
+        except Exception as e:
+            logger.warning("Provider %s failed for %s: %s", name, symbol, e)
+            metrics.increment("provider_results", provider=name, result="error")
+            self.breaker.record_error(name, symbol)
+            return None
+
+        if data is None:
+            metrics.increment("provider_results", provider=name, result="error")
+            self.breaker.record_error(name, symbol)
+        elif data.empty:
+            metrics.increment("provider_results", provider=name, result="no_data")
+            self.breaker.record_miss(name, symbol)
+        else:
+            metrics.increment("provider_results", provider=name, result="ok")
+            self.breaker.record_success(name, symbol)
+            logger.debug("Provider %s answered for %s in %.2f seconds.", name, symbol, time.time() - start_time)
+        return data
+
+    async def fetch(self, symbol: str, interval: str):
+        """Return ``(data, provider_name)``, or ``(None, None)`` if no provider had data in time."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline
+        queue = self.candidates(symbol)
+        preferred = queue[0]
+        running = {}  # task -> provider name
+
+        try:
+            while queue or running:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                if queue:
+                    name = queue.pop(0)
+                    running[asyncio.create_task(self._attempt(name, symbol, interval))] = name
+
+                done, _ = await asyncio.wait(
+                    running, timeout=min(self.hedge_delay, remaining) if queue else remaining,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    name = running.pop(task)
+                    data = task.result()
+                    if data is not None and not data.empty:
+                        logger.info("Serving %s (%s) from %s.", symbol, interval, name)
+                        if name != preferred:
+                            metrics.increment("provider_fallbacks", provider=name)
+                        return data, name
+
+            if running or queue:
+                for name in running.values():
+                    logger.warning("Provider %s missed the %.1f second deadline for %s.", name, self.deadline, symbol)
+                    self.breaker.record_error(name, symbol)
+                metrics.increment("provider_deadline_misses")
+            else:
+                logger.info("No provider had data for %s (%s).", symbol, interval)
+            return None, None
+        finally:
+            for task in running:
+                task.cancel()
+
+
+# Single router shared by all sessions, so what it learns about providers applies process-wide.
+provider_router = ProviderRouter()
@@ -1,14 +1,24 @@
 import asyncio
-import yfinance as yf
-import streamlit as st
 
+from logic.cache.bar_store import bar_store
+from logic.cache.frame_schema import compact_ohlcv
+from logic.cache.symbol_registry import get_symbol_registry
+from utils.metrics import metrics
 from logging_config import yahoo_logger
 
 
+def _yahoo_ticker(symbol):
+    """Return a yfinance Ticker; call it in a worker thread, since the first call imports yfinance."""
+    import yfinance as yf  # Slow to import; only loaded once Yahoo is actually needed
+
+    return yf.Ticker(symbol)
+
+
 class YahooFinanceFetcher:
-    def __init__(self, ticker_symbol, interval):
+    def __init__(self, ticker_symbol, interval, incremental=True):
         self.ticker_symbol = ticker_symbol
         self.interval = interval
+        self.incremental = incremental  # Fetch only bars after the last stored one
         self.interval_map = {
             "1min": "1m",
             "5min": "5m",
@@ -16,15 +26,31 @@ class YahooFinanceFetcher:
             "30min": "30m",
             "60min": "60m",
         }
-        yahoo_logger.info("Initialized YahooFinanceFetcher for ticker %s with interval %s", self.ticker_symbol,
+        yahoo_logger.debug("Initialized YahooFinanceFetcher for ticker %s with interval %s", self.ticker_symbol,
                           self.interval)
 
     async def fetch_stock_data(self):
         try:
             yahoo_logger.info("Fetching Yahoo Finance data for ticker %s", self.ticker_symbol)
-            ticker = yf.Ticker(self.ticker_symbol)
+            ticker = await asyncio.to_thread(_yahoo_ticker, self.ticker_symbol)
             yahoo_interval = self.interval_map.get(self.interval, "5m")  # Default to 5m if interval is invalid
-            stock_data = await asyncio.to_thread(ticker.history, period="1d", interval=yahoo_interval)
+            last_timestamp = None
+            if self.incremental:
+                last_timestamp = bar_store.last_timestamp("yahoo_finance", self.ticker_symbol, yahoo_interval)
+
+            if last_timestamp is None:
+                stock_data = await asyncio.to_thread(ticker.history, period="1d", interval=yahoo_interval)
+            else:
+                # Re-request the last stored bar too: it may still have been forming.
+                yahoo_logger.debug("Fetching %s bars since %s", self.ticker_symbol, last_timestamp)
+                stock_data = await asyncio.to_thread(ticker.history, start=last_timestamp, interval=yahoo_interval)
+
+            metrics.increment("upstream_requests", provider="yahoo_finance", result="ok")
+            # Drop Dividends/Stock Splits and narrow the dtypes before anything caches the frame
+            stock_data = compact_ohlcv(stock_data)
+            if self.incremental:
+                stock_data = bar_store.merge("yahoo_finance", self.ticker_symbol, yahoo_interval, stock_data,
+                                             latest_session_only=True)
 
             if stock_data.empty:
                 yahoo_logger.warning("Fetched data is empty for ticker %s", self.ticker_symbol)
@@ -33,22 +59,30 @@ class YahooFinanceFetcher:
 
             return stock_data
         except Exception as e:
+            metrics.increment("upstream_requests", provider="yahoo_finance", result="error")
             yahoo_logger.error("Failed to fetch data from Yahoo Finance for ticker %s: %s", self.ticker_symbol, str(e))
-            st.error(f"❌ Failed to fetch data from Yahoo Finance: {str(e)}")
             return None
 
     async def validate_symbol(self):
+        registry = get_symbol_registry()
+        known = registry.lookup(self.ticker_symbol)
+        metrics.increment("cache_requests", cache="symbol_registry", result="miss" if known is None else "hit")
+        if known is not None:
+            yahoo_logger.debug("Symbol %s found in the registry (valid: %s)", self.ticker_symbol, known)
+            return known
+
         try:
             yahoo_logger.info("Validating symbol %s with Yahoo Finance", self.ticker_symbol)
-            ticker = yf.Ticker(self.ticker_symbol)
-            info = await asyncio.to_thread(lambda: ticker.info)
+            ticker = await asyncio.to_thread(_yahoo_ticker, self.ticker_symbol)
+            with metrics.span("symbol_validation"):
+                info = await asyncio.to_thread(lambda: ticker.info)
             if 'symbol' not in info or not info['symbol']:
                 yahoo_logger.error("Validation failed for symbol %s", self.ticker_symbol)
-                st.error(f"❌ Invalid symbol: {self.ticker_symbol}. Please enter a valid symbol.")
+                registry.record(self.ticker_symbol, False)
                 return False
             yahoo_logger.info("Symbol %s validated successfully", self.ticker_symbol)
+            registry.record(self.ticker_symbol, True, info.get("longName") or info.get("shortName"))
             return True
         except Exception as e:
             yahoo_logger.error("Error during symbol validation for %s: %s", self.ticker_symbol, str(e))
-            st.error(f"❌ Invalid symbol: {self.ticker_symbol}. Please enter a valid symbol.")
             return False
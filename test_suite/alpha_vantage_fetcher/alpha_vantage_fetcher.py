@@ -2,9 +2,17 @@ import pytest
 import pandas as pd
 from unittest.mock import AsyncMock, Mock
 
+from logic.cache.bar_store import bar_store
 from services.alpha_vantage_fetcher.alpha_vantage_fetcher import AlphaVantageFetcher
 
 
+def _time_series(start, periods):
+    return {
+        str(timestamp): {"1. open": "10", "2. high": "11", "3. low": "9", "4. close": "10.5", "5. volume": "100"}
+        for timestamp in pd.date_range(start, periods=periods, freq="5min")
+    }
+
+
 # Tests for AlphaVantageFetcher
 @pytest.mark.asyncio
 class TestAlphaVantageFetcher:
@@ -18,7 +26,7 @@ class TestAlphaVantageFetcher:
 
         result = await fetcher.fetch_intraday_data()
         assert not result.empty
-        mock_cache.get.assert_called_once_with("AAPL_intraday")
+        mock_cache.get.assert_called_once_with("alpha_vantage:AAPL:5min:intraday")
 
     async def test_api_failure_fallbacks_to_yahoo(self, mocker):
         """Test fallback to Yahoo Finance when AlphaVantage fails"""
@@ -34,3 +42,21 @@ class TestAlphaVantageFetcher:
 
         assert not result.empty
         assert mock_yf.history.called
+
+    async def test_compact_payload_spanning_two_days_is_kept_whole(self, mocker):
+        """Test that the 100-bar window is not trimmed to the latest calendar day"""
+        mocker.patch.object(AlphaVantageFetcher, "API_KEY", "demo")
+        mocker.patch.object(AlphaVantageFetcher, "_fetch", AsyncMock(side_effect=[
+            {"Time Series (5min)": {**_time_series("2024-01-01 15:00", 6), **_time_series("2024-01-02 09:15", 2)}},
+            {"Time Series (5min)": {**_time_series("2024-01-01 15:05", 5), **_time_series("2024-01-02 09:15", 3)}},
+        ]))
+        bar_store.reset("alpha_vantage", "TWODAY", "5min")
+
+        fetcher = AlphaVantageFetcher("TWODAY", "5min")
+        fetcher.cache = Mock(get=Mock(return_value=None))
+        first = await fetcher.fetch_intraday_data()
+        second = await fetcher.fetch_intraday_data()
+
+        assert len(first) == 8 and first.index[0].day == 1
+        assert len(second) == 8  # The window slides; older stored bars are not kept
+        assert second.index[0] == first.index[1] and second.index[-1] == pd.Timestamp("2024-01-02 09:25")
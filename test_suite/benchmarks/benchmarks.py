@@ -0,0 +1,20 @@
+from benchmarks.run_benchmarks import compare
+from benchmarks.synthetic_data import make_ohlcv
+
+
+class TestBenchmarks:
+    def test_synthetic_bars_are_consistent(self):
+        """Test that synthetic bars have positive prices and a high/low range around the close"""
+        df = make_ohlcv(5000)
+
+        assert len(df) == 5000 and df.index.is_monotonic_increasing
+        assert (df["Low"] > 0).all()
+        assert (df["High"] >= df["Close"]).all() and (df["Low"] <= df["Close"]).all()
+        assert make_ohlcv(100, seed=1).equals(make_ohlcv(100, seed=1))
+
+    def test_compare_flags_only_timings_beyond_the_threshold(self):
+        """Test that regressions are reported against the baseline of the same benchmark and size"""
+        baselines = {"indicators": {"1000": 1.0, "10000": 2.0}}
+        results = {"indicators": {"1000": 1.2, "10000": 2.6, "100000": 50.0}, "excel_export": {"1000": 9.0}}
+
+        assert compare(results, baselines, threshold=0.25) == [("indicators", "10000", 2.6, 2.0)]
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from logic.charting.chart_downsampler import ChartDownsampler
+
+
+def intraday_bars(periods, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(0, 1, periods).cumsum()
+    index = pd.date_range("2024-01-02 09:15", periods=periods, freq="1min", tz="Asia/Kolkata")
+    df = pd.DataFrame({
+        "Open": close + rng.normal(0, 0.2, periods),
+        "High": close + 1.0,
+        "Low": close - 1.0,
+        "Close": close,
+    }, index=index)
+    df["RSI_14"] = rng.uniform(0, 100, periods)
+    df.iloc[:14, df.columns.get_loc("RSI_14")] = np.nan
+    return df
+
+
+class TestChartDownsampler:
+    def test_buckets_stay_within_budget_and_keep_extremes(self):
+        """Test that downsampling bounds the point count but keeps the series' highs, lows and ends"""
+        df = intraday_bars(5000)
+        candles, lines = ChartDownsampler(max_buckets=500).update(df, ["RSI_14"])
+
+        assert len(candles) <= 500
+        assert candles["High"].max() == df["High"].max()
+        assert candles["Low"].min() == df["Low"].min()
+        assert candles["Open"].iloc[0] == df["Open"].iloc[0]
+        assert candles["Close"].iloc[-1] == df["Close"].iloc[-1]
+        x, y = lines["RSI_14"]
+        assert len(y) <= 1000
+        assert np.nanmax(y) == df["RSI_14"].max() and np.nanmin(y) == df["RSI_14"].min()
+
+    def test_incremental_update_matches_full_rebuild(self):
+        """Test that appending bars (and revising the forming one) gives the same result as a rebuild"""
+        full = intraday_bars(3000)
+        earlier = full.iloc[:2900].copy()
+        earlier.iloc[-1, earlier.columns.get_loc("Close")] -= 5  # The forming bar changes afterwards
+
+        downsampler = ChartDownsampler(max_buckets=500)
+        downsampler.update(earlier, ["RSI_14"])
+        candles, lines = downsampler.update(full, ["RSI_14"])
+        expected_candles, expected_lines = ChartDownsampler(max_buckets=500).update(full, ["RSI_14"])
+
+        pd.testing.assert_frame_equal(candles, expected_candles)
+        np.testing.assert_array_equal(lines["RSI_14"][0], expected_lines["RSI_14"][0])
+        np.testing.assert_array_equal(lines["RSI_14"][1], expected_lines["RSI_14"][1])
+
+    def test_short_series_are_not_downsampled(self):
+        """Test that a series within the budget is plotted bar for bar"""
+        df = intraday_bars(200)
+        candles, lines = ChartDownsampler(max_buckets=500).update(df, ["RSI_14"])
+        pd.testing.assert_frame_equal(candles, df[["Open", "High", "Low", "Close"]])
+        assert len(lines["RSI_14"][1]) == 200
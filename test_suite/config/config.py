@@ -0,0 +1,22 @@
+import json
+
+import config
+
+
+class TestConfig:
+    def test_secrets_are_read_on_first_use(self, tmp_path, monkeypatch):
+        """Test that secrets.json is only read when a secret is requested, and the environment wins"""
+        secrets = tmp_path / "secrets.json"
+        secrets.write_text(json.dumps({"ALPHA_VANTAGE_API_KEY": "from-file"}))
+        monkeypatch.setattr(config, "SECRETS_PATH", str(secrets))
+        monkeypatch.delenv("ALPHA_VANTAGE_API_KEY", raising=False)
+        config.load_secrets.cache_clear()
+
+        assert config.ALPHA_VANTAGE_API_KEY == "from-file"
+        monkeypatch.setenv("ALPHA_VANTAGE_API_KEY", "from-env")
+        assert config.get_secret("ALPHA_VANTAGE_API_KEY") == "from-env"
+
+        monkeypatch.setattr(config, "SECRETS_PATH", str(tmp_path / "missing.json"))
+        config.load_secrets.cache_clear()
+        assert config.get_secret("OTHER_KEY", "default") == "default"
+        config.load_secrets.cache_clear()
@@ -0,0 +1,27 @@
+import os
+import tempfile
+
+import pytest
+
+# logging_config creates its log directory on import; keep test runs out of ./logs
+os.environ.setdefault("LOG_DIR", tempfile.mkdtemp(prefix="test-logs-"))
+
+from logic.cache import ohlcv_store, shared_snapshots, symbol_registry, tiered_cache  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def isolated_stores(tmp_path_factory, monkeypatch):
+    """Point the process-wide caches at a fresh temporary directory, so no test reads or writes ./cache"""
+    tmp_path = tmp_path_factory.mktemp("stores")
+    stores = {
+        tiered_cache: ("_cache", tiered_cache.TieredCache(str(tmp_path / "market_data"))),
+        symbol_registry: ("_registry", symbol_registry.SymbolRegistry(str(tmp_path / "symbol_registry.sqlite3"))),
+        ohlcv_store: ("_store", ohlcv_store.OHLCVStore(str(tmp_path / "ohlcv_store.sqlite3"))),
+        shared_snapshots: ("_store", shared_snapshots.SharedSnapshotStore(str(tmp_path / "snapshots"))),
+    }
+    for module, (name, store) in stores.items():
+        monkeypatch.setattr(module, name, store)
+    yield
+    for _, store in stores.values():
+        if hasattr(store, "close"):
+            store.close()
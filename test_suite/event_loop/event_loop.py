@@ -0,0 +1,26 @@
+import asyncio
+import threading
+import pytest
+
+from utils.event_loop import run_coroutine, submit
+
+
+class TestEventLoop:
+    def test_coroutines_share_one_persistent_loop(self):
+        """Test that every call runs on the same long-lived loop thread instead of a new loop"""
+        async def current():
+            return asyncio.get_running_loop(), threading.current_thread().name
+
+        first = run_coroutine(current())
+        second = submit(current()).result()
+        assert first == second
+        assert first[1] == "app-event-loop"
+        assert not first[0].is_closed()
+
+    def test_blocking_call_from_the_loop_thread_is_rejected(self):
+        """Test that run_coroutine refuses to deadlock the loop it would wait on"""
+        async def nested():
+            return run_coroutine(asyncio.sleep(0))
+
+        with pytest.raises(RuntimeError):
+            run_coroutine(nested())
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+from logic.cache.bar_store import bar_store
+from logic.cache.frame_schema import OHLCV_COLUMNS, compact_ohlcv, frame_nbytes
+from services.alpha_vantage_fetcher.alpha_vantage_fetcher import AlphaVantageFetcher
+
+
+def _yahoo_frame(close, periods=4):
+    index = pd.date_range("2024-01-02 09:15", periods=periods, freq="1min", tz="Asia/Kolkata", name="Datetime")
+    close = np.full(periods, close, dtype="float64") + np.arange(periods) * 0.05
+    return pd.DataFrame({
+        "Open": close, "High": close + 0.1, "Low": close - 0.1, "Close": close,
+        "Volume": np.arange(periods) * 100.0, "Dividends": 0.0, "Stock Splits": 0.0,
+    }, index=index)
+
+
+class TestFrameSchema:
+    def test_compacts_provider_frame(self):
+        """Test that extra columns are dropped, prices narrowed and the index kept as a tz-aware DatetimeIndex"""
+        frame = _yahoo_frame(2450.35)
+        frame.attrs["source"] = "yahoo_finance"
+        compact = compact_ohlcv(frame)
+
+        assert list(compact.columns) == OHLCV_COLUMNS
+        assert compact["Close"].dtype == np.float32
+        assert compact["Volume"].dtype == np.int64
+        assert compact.index.name == "Date" and str(compact.index.tz) == "Asia/Kolkata"
+        assert np.abs(compact["Close"].to_numpy(dtype="float64") - frame["Close"].to_numpy()).max() <= 0.005
+        assert compact.attrs == {"source": "yahoo_finance"}
+        assert frame_nbytes(compact) < frame_nbytes(frame) / 1.5
+
+    def test_large_prices_keep_float64(self):
+        """Test that prices float32 cannot hold to the tolerance stay float64"""
+        compact = compact_ohlcv(_yahoo_frame(312345.67))
+        assert compact["Close"].dtype == np.float64
+        assert compact["Close"].iloc[0] == 312345.67
+
+    def test_sorts_and_deduplicates(self):
+        """Test that out-of-order and repeated bars come out sorted, keeping the last copy"""
+        frame = _yahoo_frame(100.0)
+        shuffled = pd.concat([frame.iloc[[2, 0, 1]], frame.iloc[[0]].assign(Close=99.5)])
+        compact = compact_ohlcv(shuffled)
+        assert compact.index.is_monotonic_increasing and not compact.index.has_duplicates
+        assert compact["Close"].iloc[0] == 99.5
+
+    def test_frames_without_prices_are_unchanged(self):
+        """Test that frames missing price columns pass through untouched"""
+        frame = pd.DataFrame({"Close": [1.0]})
+        assert compact_ohlcv(frame) is frame
+        assert compact_ohlcv(None) is None
+
+    def test_alpha_vantage_parser_returns_compact_frame(self):
+        """Test that Alpha Vantage responses are compacted at ingest"""
+        series = {
+            "2024-01-02 09:20:00": {"1. open": "10.5", "2. high": "11", "3. low": "10", "4. close": "10.75",
+                                    "5. volume": "1200"},
+            "2024-01-02 09:15:00": {"1. open": "10", "2. high": "10.6", "3. low": "9.9", "4. close": "10.5",
+                                    "5. volume": "800"},
+        }
+        bar_store.reset("alpha_vantage", "COMPACT", "5min")
+        df = AlphaVantageFetcher("COMPACT", "5min")._parse_time_series(series)
+        assert df.index.is_monotonic_increasing
+        assert df.dtypes.to_dict() == {"Open": np.float32, "High": np.float32, "Low": np.float32,
+                                       "Close": np.float32, "Volume": np.int64}
+        assert list(df["Volume"]) == [800, 1200]
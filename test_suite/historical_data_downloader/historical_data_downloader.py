@@ -1,8 +1,14 @@
+import io
+import zipfile
+import threading
 import pytest
+import numpy as np
 import pandas as pd
 from unittest.mock import Mock
 
+from logic.download_data.bulk_export import BulkHistoricalExporter
 from logic.download_data.download_data import HistoricalDataDownloader
+from logic.download_data.export_writers import export_bytes
 from logic.indicators.indicators import IndicatorCalculator
 
 
@@ -31,3 +37,84 @@ class TestHistoricalDataDownloader:
 
         assert "RSI_14" in result.columns
         assert "WT1" in result.columns
+
+    async def test_walk_forward_ml_predictions(self):
+        """Test that every bar with complete features gets a walk-forward prediction"""
+        rng = np.random.default_rng(11)
+        close = 100 + np.cumsum(rng.normal(0, 1, 200))
+        test_data = pd.DataFrame({
+            "Open": close, "High": close + 1,
+            "Low": close - 1, "Close": close,
+            "Volume": 1000
+        }, index=pd.date_range("2020-01-01", periods=200, freq="D"))
+        downloader = HistoricalDataDownloader("AAPL", "2020-01-01", "2020-07-19",
+                                              include_ml_predictions=True, ml_lookback=50)
+        result = downloader.calculate_indicators(test_data)
+
+        predicted = result["LC_Prediction"].dropna()
+        assert len(predicted) == result[["RSI_14", "CCI_20", "ADX_20", "WT1"]].dropna().shape[0] - 1
+        assert set(predicted.unique()) <= {-1.0, 0.0, 1.0}
+        # The training label looks one bar ahead; neither it nor its returns may be exported
+        exported = pd.read_csv(io.BytesIO(export_bytes(result, "csv")), index_col=0)
+        assert "LC_Prediction" in exported.columns
+        assert "Returns" not in exported.columns and "Label" not in exported.columns
+
+    async def test_indicators_run_off_the_event_loop_thread(self, mocker):
+        """Test that generating a file does not compute indicators on the (shared) event loop thread"""
+        history = pd.DataFrame({"Open": [100.0], "High": [101.0], "Low": [99.0], "Close": [100.5], "Volume": [1000]},
+                               index=pd.date_range("2020-01-01", periods=1, freq="D"))
+        downloader = HistoricalDataDownloader("AAPL", "2020-01-01", "2020-01-02")
+        mocker.patch.object(downloader, "fetch_historical_data", mocker.AsyncMock(return_value=history))
+        threads = []
+        calculate = downloader.calculate_indicators
+        mocker.patch.object(downloader, "calculate_indicators",
+                            side_effect=lambda data: threads.append(threading.current_thread()) or calculate(data))
+
+        assert await downloader.generate_file("csv") is not None
+        assert threads and threads[0] is not threading.current_thread()
+
+    async def test_bulk_export_builds_one_archive(self, mocker):
+        """Test that a bulk export zips one file per symbol and reports progress"""
+        history = pd.DataFrame({
+            "Open": [100.0] * 30, "High": [101.0] * 30,
+            "Low": [99.0] * 30, "Close": [100.5] * 30,
+            "Volume": [1000] * 30
+        }, index=pd.date_range("2020-01-01", periods=30, freq="D"))
+        empty_ticker = Mock()
+        empty_ticker.history.return_value = pd.DataFrame()
+        full_ticker = Mock()
+        full_ticker.history.return_value = history
+        mocker.patch("yfinance.Ticker", side_effect=lambda symbol: empty_ticker if symbol == "EMPTY.NS" else full_ticker)
+        progress = []
+
+        exporter = BulkHistoricalExporter(["AAA.NS", "BBB.NS", "EMPTY.NS"], "2020-01-01", "2020-01-31",
+                                          max_concurrency=2, use_processes=False)
+        zip_data = await exporter.generate_zip(lambda completed, total, symbol: progress.append(completed))
+
+        names = zipfile.ZipFile(io.BytesIO(zip_data)).namelist()
+        assert sorted(names) == ["AAA.NS_historical_data.xlsx", "BBB.NS_historical_data.xlsx", "failed_symbols.txt"]
+        assert exporter.failed_symbols == ["EMPTY.NS"]
+        assert progress == [1, 2, 3]
+
+    @pytest.mark.parametrize("export_format", ["excel", "csv", "parquet", "feather"])
+    async def test_chunked_exports_round_trip(self, export_format):
+        """Test that every export format writes all rows and only the selected columns"""
+        data = pd.DataFrame({
+            "Close": np.arange(25, dtype=float), "Volume": np.arange(25),
+            "RSI_14": np.r_[[np.nan] * 5, np.linspace(20, 80, 20)]
+        }, index=pd.date_range("2020-01-01", periods=25, freq="D", tz="Asia/Kolkata", name="Date"))
+
+        file_data = export_bytes(data, export_format, columns=["Close", "RSI_14"], chunk_rows=7)
+
+        buffer = io.BytesIO(file_data)
+        if export_format == "excel":
+            result = pd.read_excel(buffer, index_col=0)
+        elif export_format == "csv":
+            result = pd.read_csv(buffer, index_col=0)
+        elif export_format == "parquet":
+            result = pd.read_parquet(buffer)
+        else:
+            result = pd.read_feather(buffer)
+        assert list(result.columns) == ["Close", "RSI_14"]
+        assert len(result) == 25
+        np.testing.assert_allclose(result["RSI_14"].to_numpy(dtype=float), data["RSI_14"].to_numpy())
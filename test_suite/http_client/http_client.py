@@ -0,0 +1,41 @@
+import asyncio
+import pytest
+
+from services.http_client.http_client import TokenBucketRateLimiter, get_http_session, close_http_session
+
+
+@pytest.mark.asyncio
+class TestHttpClient:
+    async def test_session_is_reused_on_the_same_loop(self):
+        """Test that fetchers on one event loop share a single pooled session"""
+        first = get_http_session()
+        second = get_http_session()
+        assert first is second
+        await close_http_session()
+        assert first.closed
+
+    async def test_rate_limiter_paces_after_burst(self, mocker):
+        """Test that requests beyond the burst capacity are delayed instead of sent immediately"""
+        sleep = mocker.patch("asyncio.sleep", new=mocker.AsyncMock())
+        limiter = TokenBucketRateLimiter(rate_per_minute=60, capacity=2)
+
+        for _ in range(4):
+            await limiter.acquire()
+
+        waits = [call.args[0] for call in sleep.call_args_list]
+        assert len(waits) == 2
+        assert waits[0] == pytest.approx(1.0, abs=0.05)
+        assert waits[1] == pytest.approx(2.0, abs=0.05)
+
+    async def test_cancelled_waiters_return_their_tokens(self):
+        """Test that waiters cancelled while paced do not push later requests further out"""
+        limiter = TokenBucketRateLimiter(rate_per_minute=5, capacity=1)
+        await limiter.acquire()
+        for _ in range(20):
+            waiter = asyncio.ensure_future(limiter.acquire())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+
+        assert limiter._reserve() <= 60 / 5 + 0.05
@@ -0,0 +1,37 @@
+import logging
+import logging.handlers
+
+import logging_config
+from logging_config import CallSiteRateLimitFilter, DeferredQueueHandler
+
+
+def record_at(lineno, level=logging.INFO, msg="Refreshing %s"):
+    return logging.makeLogRecord({"name": "root", "levelno": level, "levelname": logging.getLevelName(level),
+                                  "pathname": "app.py", "lineno": lineno, "msg": msg, "args": ("TCS.NS",)})
+
+
+class TestLoggingConfig:
+    def test_loggers_only_enqueue_records(self):
+        """Test that the application loggers hand records to a queue instead of writing them"""
+        for name in ("", "alpha_vantage", "yahoo_finance"):
+            handlers = logging.getLogger(name).handlers
+            assert any(isinstance(handler, DeferredQueueHandler) for handler in handlers)
+            assert not any(isinstance(handler, logging.handlers.RotatingFileHandler) for handler in handlers)
+
+        record = record_at(1)
+        assert DeferredQueueHandler(None).prepare(record) is record
+        assert record.msg == "Refreshing %s"  # Formatted later, on the listener thread
+
+    def test_rate_limit_is_per_call_site_and_reports_suppressed_records(self, mocker):
+        """Test that a chatty call site is limited without silencing other sites or warnings"""
+        clock = mocker.patch.object(logging_config.time, "monotonic", return_value=1000.0)
+        rate_limit = CallSiteRateLimitFilter(per_minute=2)
+
+        assert [rate_limit.filter(record_at(10)) for _ in range(4)] == [True, True, False, False]
+        assert rate_limit.filter(record_at(11))
+        assert rate_limit.filter(record_at(10, logging.WARNING))
+
+        clock.return_value = 1030.0  # One token refilled
+        record = record_at(10)
+        assert rate_limit.filter(record)
+        assert record.getMessage() == "Refreshing TCS.NS (suppressed 2 similar messages)"
@@ -0,0 +1,55 @@
+import importlib
+
+import numpy as np
+
+from ml_models.lorentzian_classifier import lorentzian_classifier
+from ml_models.lorentzian_classifier.lorentzian_classifier import LorentzianClassifier
+
+
+def reference_predict(model, X):
+    """Pairwise Lorentzian kNN as originally implemented, with a stable sort for ties"""
+    distances = np.array([[model._lorentzian_distance(a, b) for b in model.X_train] for a in X])
+    nearest = np.argsort(distances, axis=1, kind="stable")[:, :model.n_neighbors]
+    return np.sign(np.mean(model.y_train[nearest], axis=1))
+
+
+# Tests for LorentzianClassifier
+class TestLorentzianClassifier:
+    def test_predictions_match_pairwise_reference(self):
+        """Test that chunked vectorized predictions match the pairwise implementation"""
+        rng = np.random.default_rng(3)
+        X = rng.normal(size=(400, 4))
+        y = np.where(rng.random(400) > 0.5, 1, -1)
+        model = LorentzianClassifier(n_neighbors=5, lookback=300, max_chunk_bytes=64 * 1024)
+        model.fit(X[:300], y[:300])
+        np.testing.assert_array_equal(model.predict(X[300:]), reference_predict(model, X[300:]))
+
+    def test_ties_break_by_training_order(self):
+        """Test that equidistant neighbours are picked in training order"""
+        X_train = np.zeros((6, 2))
+        y_train = np.array([1, 1, -1, -1, -1, -1])
+        model = LorentzianClassifier(n_neighbors=2, lookback=6).fit(X_train, y_train)
+        assert model.predict(np.zeros((1, 2)))[0] == 1
+
+    def test_walk_forward_matches_refitting_each_bar(self):
+        """Test that walk-forward predictions equal refitting on the preceding window at every bar"""
+        rng = np.random.default_rng(5)
+        X = rng.normal(size=(120, 4))
+        y = np.where(rng.random(120) > 0.5, 1, -1)
+        model = LorentzianClassifier(n_neighbors=5, lookback=30, max_chunk_bytes=4 * 1024)
+
+        predictions = model.walk_forward_predict(X, y)
+
+        expected = [np.nan] + [
+            LorentzianClassifier(n_neighbors=5, lookback=30).fit(X[:i], y[:i]).predict(X[i:i + 1])[0]
+            for i in range(1, len(X))
+        ]
+        np.testing.assert_array_equal(predictions, expected)
+
+    def test_import_has_no_side_effects(self, capsys):
+        """Test that importing the module does not run the demo or print anything"""
+        state = np.random.get_state()
+        importlib.reload(lorentzian_classifier)
+
+        assert capsys.readouterr().out == ""
+        assert np.array_equal(np.random.get_state()[1], state[1])  # The demo used to reseed numpy's global RNG
@@ -0,0 +1,74 @@
+import asyncio
+import threading
+import pytest
+import pandas as pd
+
+from logic.cache.market_data_cache import MarketDataCache
+
+
+@pytest.mark.asyncio
+class TestMarketDataCache:
+    async def test_concurrent_requests_share_one_fetch(self):
+        """Test that concurrent callers for the same key join a single upstream fetch"""
+        cache = MarketDataCache(ttl_seconds=60)
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return pd.DataFrame({"Close": [100]})
+
+        results = await asyncio.gather(*[cache.get_or_fetch("AAPL", "5min", fetch) for _ in range(20)])
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+
+    async def test_fetch_is_shared_across_threads(self):
+        """Test that sessions running their own event loops on other threads join the same fetch"""
+        cache = MarketDataCache(ttl_seconds=60)
+        calls = []
+        started = threading.Event()
+
+        async def fetch():
+            calls.append(1)
+            started.set()
+            await asyncio.sleep(0.1)
+            return pd.DataFrame({"Close": [100]})
+
+        def session():
+            started.wait()
+            asyncio.run(cache.get_or_fetch("AAPL", "5min", fetch))
+
+        threads = [threading.Thread(target=session) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        await cache.get_or_fetch("AAPL", "5min", fetch)
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 1
+
+    async def test_expired_entries_are_refetched(self):
+        """Test that entries are refetched once their TTL has passed"""
+        cache = MarketDataCache(ttl_seconds=0)
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            return pd.DataFrame({"Close": [100]})
+
+        await cache.get_or_fetch("AAPL", "5min", fetch)
+        await cache.get_or_fetch("AAPL", "5min", fetch)
+        assert len(calls) == 2
+
+    async def test_empty_results_are_not_cached(self):
+        """Test that empty upstream responses are retried on the next call"""
+        cache = MarketDataCache(ttl_seconds=60)
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            return pd.DataFrame()
+
+        await cache.get_or_fetch("AAPL", "5min", fetch)
+        await cache.get_or_fetch("AAPL", "5min", fetch)
+        assert len(calls) == 2
+        assert cache.get("AAPL", "5min") is None
@@ -0,0 +1,61 @@
+import urllib.request
+
+import pandas as pd
+import pytest
+
+from services.provider_router.provider_router import ProviderRouter
+from utils.metrics import MetricsRegistry, metrics, start_metrics_server
+
+
+class TestMetrics:
+    def test_spans_and_counters_render_as_prometheus_text(self):
+        """Test that spans become cumulative histograms and counters get a _total suffix"""
+        registry = MetricsRegistry(namespace="test")
+        registry.observe("provider_fetch", 0.03, provider="alpha_vantage")
+        registry.observe("provider_fetch", 2.0, provider="alpha_vantage")
+        with pytest.raises(ValueError):
+            with registry.span("chart_render"):
+                raise ValueError("rendering failed")
+        registry.increment("cache_requests", cache="market_data", result="hit")
+        registry.increment("cache_requests", cache="market_data", result="hit")
+
+        text = registry.render_prometheus()
+        assert 'test_span_seconds_bucket{span="provider_fetch",provider="alpha_vantage",le="0.05"} 1' in text
+        assert 'test_span_seconds_bucket{span="provider_fetch",provider="alpha_vantage",le="+Inf"} 2' in text
+        assert 'test_span_seconds_count{span="chart_render"} 1' in text
+        assert 'test_cache_requests_total{cache="market_data",result="hit"} 2' in text
+        assert registry.counter("cache_requests", cache="market_data", result="hit") == 2
+
+        summary = {row["span"]: row for row in registry.span_summary()}
+        assert summary["provider_fetch"]["count"] == 2
+        assert summary["provider_fetch"]["max_ms"] == 2000.0
+
+    def test_endpoint_serves_the_process_registry(self):
+        """Test that the scrape endpoint returns the shared registry's metrics"""
+        metrics.increment("endpoint_test_events")
+        server = start_metrics_server(port=0, host="127.0.0.1")
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+            body = response.read().decode()
+
+        assert response.headers["Content-Type"].startswith("text/plain")
+        assert "dashboard_endpoint_test_events_total 1" in body
+
+
+@pytest.mark.asyncio
+class TestProviderMetrics:
+    async def test_router_records_provider_timings_and_fallbacks(self):
+        """Test that a fallback win is counted and each provider attempt is timed"""
+        async def failing(symbol, interval):
+            return None
+
+        async def answering(symbol, interval):
+            return pd.DataFrame({"Close": [1.0]})
+
+        before = metrics.counter("provider_fallbacks", provider="metrics_backup")
+        data, name = await ProviderRouter({"metrics_primary": failing, "metrics_backup": answering}).fetch("X.NS", "5min")
+
+        assert name == "metrics_backup"
+        assert metrics.counter("provider_fallbacks", provider="metrics_backup") == before + 1
+        assert metrics.counter("provider_results", provider="metrics_primary", result="error") >= 1
+        spans = {(row["span"], row["labels"]) for row in metrics.span_summary()}
+        assert ("provider_fetch", "provider=metrics_backup") in spans
@@ -0,0 +1,98 @@
+import pytest
+import pandas as pd
+
+from logic.cache.ohlcv_store import OHLCVStore
+
+
+def daily_bars(start, end):
+    index = pd.date_range(start, end, freq="B", inclusive="left", tz="Asia/Kolkata", name="Date")
+    return pd.DataFrame({
+        "Open": 100.0, "High": 101.0, "Low": 99.0, "Close": 100.5,
+        "Volume": 1000, "Dividends": 0.0, "Stock Splits": 0.0
+    }, index=index)
+
+
+@pytest.mark.asyncio
+class TestOHLCVStore:
+    async def test_overlapping_ranges_fetch_only_gaps(self, tmp_path):
+        """Test that a second, overlapping request only fetches the uncovered range"""
+        store = OHLCVStore(str(tmp_path / "store.sqlite3"))
+        requests = []
+
+        async def fetch(start, end):
+            requests.append((start, end))
+            return daily_bars(start, end)
+
+        await store.get_range("AAA.NS", "1d", "2024-01-01", "2024-02-01", fetch)
+        result = await store.get_range("AAA.NS", "1d", "2024-01-15", "2024-03-01", fetch)
+
+        assert requests == [("2024-01-01", "2024-02-01"), ("2024-02-01", "2024-03-01")]
+        pd.testing.assert_frame_equal(result, daily_bars("2024-01-15", "2024-03-01"), check_freq=False)
+
+    async def test_covered_range_is_served_from_disk(self, tmp_path):
+        """Test that a fully covered range makes no upstream request, even after reopening the store"""
+        path = str(tmp_path / "store.sqlite3")
+        requests = []
+
+        async def fetch(start, end):
+            requests.append((start, end))
+            return daily_bars(start, end)
+
+        await OHLCVStore(path).get_range("AAA.NS", "1d", "2024-01-01", "2024-03-01", fetch)
+        result = await OHLCVStore(path).get_range("AAA.NS", "1d", "2024-02-01", "2024-02-10", fetch)
+
+        assert len(requests) == 1
+        assert str(result.index.tz) == "Asia/Kolkata"
+        assert len(result) == 7
+
+    async def test_empty_responses_are_covered_and_failures_retried(self, tmp_path):
+        """Test that a gap with no bars (e.g. a weekend) is recorded as fetched, but a failed one is not"""
+        store = OHLCVStore(str(tmp_path / "store.sqlite3"))
+
+        async def no_bars(start, end):
+            return pd.DataFrame()
+
+        async def failed(start, end):
+            return None
+
+        await store.get_range("AAA.NS", "1d", "2024-01-06", "2024-01-08", no_bars)
+        await store.get_range("AAA.NS", "1d", "2024-02-01", "2024-03-01", failed)
+        assert store.missing_ranges("AAA.NS", "1d", "2024-01-06", "2024-01-08") == []
+        assert store.missing_ranges("AAA.NS", "1d", "2024-02-01", "2024-03-01") == [("2024-02-01", "2024-03-01")]
+
+    async def test_new_corporate_action_refetches_stored_history(self, tmp_path):
+        """Test that a dividend after stored bars replaces them with freshly adjusted history"""
+        store = OHLCVStore(str(tmp_path / "store.sqlite3"))
+        requests = []
+
+        async def fetch(start, end):
+            requests.append((start, end))
+            bars = daily_bars(start, end)
+            if end > "2024-02-01":  # Yahoo now knows of the 2024-02-15 dividend and adjusts everything before it
+                bars.loc[bars.index < "2024-02-15", "Close"] = 99.5
+                bars.loc["2024-02-15", "Dividends"] = 1.0
+            return bars
+
+        await store.get_range("AAA.NS", "1d", "2024-01-01", "2024-02-01", fetch)
+        result = await store.get_range("AAA.NS", "1d", "2024-01-01", "2024-03-01", fetch)
+        again = await store.get_range("AAA.NS", "1d", "2024-01-01", "2024-03-01", fetch)
+
+        assert requests == [("2024-01-01", "2024-02-01"), ("2024-02-01", "2024-03-01"), ("2024-01-01", "2024-03-01")]
+        assert (result.loc[:"2024-02-14", "Close"] == 99.5).all()
+        pd.testing.assert_frame_equal(again, result)
+
+    async def test_old_corporate_actions_keep_stored_history(self, tmp_path):
+        """Test that extending the range back past an older dividend does not refetch what is stored"""
+        store = OHLCVStore(str(tmp_path / "store.sqlite3"))
+        requests = []
+
+        async def fetch(start, end):
+            requests.append((start, end))
+            bars = daily_bars(start, end)
+            if start < "2024-01-15" < end:
+                bars.loc["2024-01-15", "Dividends"] = 1.0
+            return bars
+
+        await store.get_range("AAA.NS", "1d", "2024-02-01", "2024-03-01", fetch)
+        await store.get_range("AAA.NS", "1d", "2024-01-01", "2024-03-01", fetch)
+        assert requests == [("2024-02-01", "2024-03-01"), ("2024-01-01", "2024-02-01")]
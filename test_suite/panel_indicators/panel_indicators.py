@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from logic.indicators.indicators import IndicatorCalculator
+from logic.indicators.panel_indicators import PANEL_TOLERANCE, PanelIndicatorEngine
+
+
+def make_panel(symbols, bars, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(0, 1, (symbols, bars)).cumsum(axis=1)
+    high = close + rng.random((symbols, bars))
+    low = close - rng.random((symbols, bars))
+    close[0, 100:130] = close[0, 99]  # A flat stretch exercises the zero-deviation branches
+    high[0, 100:130] = low[0, 100:130] = close[0, 99]
+    for row, start in [(1, 17), (2, 60)]:  # Symbols listed later than the others
+        high[row, :start] = low[row, :start] = close[row, :start] = np.nan
+    return high, low, close
+
+
+class TestPanelIndicatorEngine:
+    def test_panel_matches_per_symbol_talib(self):
+        """Test that the vectorized panel agrees with TA-Lib per symbol within PANEL_TOLERANCE"""
+        high, low, close = make_panel(8, 400)
+        engine = PanelIndicatorEngine()
+        panel = engine.compute(high, low, close)
+
+        for row in range(close.shape[0]):
+            expected = IndicatorCalculator(
+                pd.DataFrame({"High": high[row], "Low": low[row], "Close": close[row]})
+            ).compute_all_indicators()
+            for column in engine.columns:
+                np.testing.assert_allclose(panel[column][row], expected[column], **PANEL_TOLERANCE,
+                                           err_msg=f"{column} differs for row {row}")
+
+    def test_rows_without_enough_data_stay_empty(self):
+        """Test that symbols with too few bars produce NaN instead of failing the whole panel"""
+        high, low, close = make_panel(3, 200)
+        high[1, :195] = low[1, :195] = close[1, :195] = np.nan
+        panel = PanelIndicatorEngine().compute(high, low, close)
+        assert np.isnan(panel["ADX_20"][1]).all()
+        assert np.isfinite(panel["RSI_14"][0, -1])
@@ -0,0 +1,103 @@
+import time
+import asyncio
+import threading
+import pandas as pd
+
+from logic.cache.market_data_cache import market_data_cache
+from logic.scheduler.prefetch_scheduler import PrefetchScheduler, fetch_latest_bars
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+class TestPrefetchScheduler:
+    def test_watched_symbols_are_published_in_the_background(self):
+        """Test that watching a symbol publishes a snapshot without the caller awaiting a fetch"""
+        calls = []
+
+        async def fetch(symbol, interval):
+            calls.append((symbol, interval, threading.current_thread().name))
+            return pd.DataFrame({"Close": [100.0]})
+
+        scheduler = PrefetchScheduler(fetch)
+        try:
+            assert scheduler.latest("AAPL", "60min") is None
+            scheduler.watch("AAPL", "60min")
+            scheduler.watch("AAPL", "60min")
+            assert wait_for(lambda: scheduler.latest("AAPL", "60min") is not None)
+            assert calls == [("AAPL", "60min", "app-event-loop")]
+        finally:
+            scheduler.stop()
+
+    def test_unwatched_symbols_stop_refreshing(self):
+        """Test that a pair nobody watches any more is dropped instead of fetched forever"""
+        async def fetch(symbol, interval):
+            return pd.DataFrame()
+
+        scheduler = PrefetchScheduler(fetch, idle_seconds=-1)
+        try:
+            scheduler.watch("AAPL", "1min")
+            assert wait_for(lambda: not scheduler._tasks)
+            assert scheduler.latest("AAPL", "1min") is None
+        finally:
+            scheduler.stop()
+
+    def test_snapshots_expire_with_the_cache_ttl(self, mocker):
+        """Test that a snapshot is not served past the cache TTL, so the forming bar keeps updating"""
+        async def fetch(symbol, interval):
+            return pd.DataFrame({"Close": [100.0]})
+
+        mocker.patch.object(market_data_cache, "ttl_seconds", 0.2)
+        scheduler = PrefetchScheduler(fetch)
+        try:
+            scheduler.watch("AAPL", "60min")
+            assert wait_for(lambda: scheduler.latest("AAPL", "60min") is not None)
+            assert wait_for(lambda: scheduler.latest("AAPL", "60min") is None)
+        finally:
+            scheduler.stop()
+
+    def test_stopped_pairs_release_their_snapshots(self):
+        """Test that a pair whose refresh loop ends no longer keeps its frame in memory"""
+        async def fetch(symbol, interval):
+            return pd.DataFrame({"Close": [100.0]})
+
+        scheduler = PrefetchScheduler(fetch)
+        scheduler.watch("AAPL", "60min")
+        assert wait_for(lambda: ("AAPL", "60min") in scheduler._snapshots)
+        scheduler.stop()
+        assert wait_for(lambda: not scheduler._tasks and not scheduler._snapshots)
+
+    def test_bar_close_refresh_skips_entries_from_the_previous_bar(self, mocker):
+        """Test that the fetch after a bar close does not reuse a cache entry fetched before it"""
+        mocker.patch("logic.scheduler.prefetch_scheduler.bar_close_expiry", return_value=0.05)
+        served = []
+
+        async def fetch(symbol, interval):
+            async def upstream():
+                return pd.DataFrame({"Close": [100.0 + len(served)]})
+            served.append(await market_data_cache.get_or_fetch(symbol, interval, upstream))
+            return served[-1]
+
+        market_data_cache.invalidate("PREFETCH.NS", "1min")
+        scheduler = PrefetchScheduler(fetch, grace_seconds=0.0)
+        try:
+            scheduler.watch("PREFETCH.NS", "1min")
+            assert wait_for(lambda: len(served) >= 2)
+        finally:
+            scheduler.stop()
+            market_data_cache.invalidate("PREFETCH.NS", "1min")
+        assert served[1]["Close"].iloc[0] != served[0]["Close"].iloc[0]
+
+    def test_invalid_symbols_are_not_published(self, mocker):
+        """Test that the scheduler's fetch treats an invalid symbol like a page refresh does"""
+        mocker.patch("data_fetchers.stock_data_handler.stock_data_handler.provider_router.fetch",
+                     new=mocker.AsyncMock(return_value=(None, None)))
+        mocker.patch("services.yahoo_finance_fetcher.yahoo_finance_fetcher.YahooFinanceFetcher.validate_symbol",
+                     new=mocker.AsyncMock(return_value=False))
+        market_data_cache.invalidate("NOPE.NS", "5min")
+
+        assert asyncio.run(fetch_latest_bars("NOPE.NS", "5min")) is None
@@ -0,0 +1,97 @@
+import asyncio
+import time
+import pytest
+import pandas as pd
+
+from services.http_client.http_client import TokenBucketRateLimiter
+from services.provider_router.provider_router import ProviderRouter
+from utils.metrics import metrics
+
+
+def bars(close):
+    return pd.DataFrame({"Close": [close]}, index=pd.DatetimeIndex(["2024-01-02 09:15"]))
+
+
+@pytest.mark.asyncio
+class TestProviderRouter:
+    async def test_learns_that_a_provider_does_not_serve_a_suffix(self):
+        """Test that after misses on two .NS symbols the provider is skipped for every .NS symbol"""
+        calls = []
+
+        async def alpha_vantage(symbol, interval):
+            calls.append(symbol)
+            return pd.DataFrame()
+
+        async def yahoo_finance(symbol, interval):
+            return bars(100.0)
+
+        router = ProviderRouter({"alpha_vantage": alpha_vantage, "yahoo_finance": yahoo_finance})
+        for symbol in ["TCS.NS", "INFY.NS", "TCS.NS", "HDFCBANK.NS"]:
+            data, source = await router.fetch(symbol, "5min")
+            assert source == "yahoo_finance"
+        assert calls == ["TCS.NS", "INFY.NS"]
+        assert router.candidates("AAPL") == ["alpha_vantage", "yahoo_finance"]
+
+    async def test_slow_provider_is_hedged(self):
+        """Test that a second provider is started after the hedge delay and the first answer wins"""
+        async def slow(symbol, interval):
+            await asyncio.sleep(5)
+            return bars(1.0)
+
+        async def fast(symbol, interval):
+            return bars(2.0)
+
+        router = ProviderRouter({"slow": slow, "fast": fast}, hedge_delay=0.05, deadline=1.0)
+        start_time = time.monotonic()
+        data, source = await router.fetch("AAPL", "5min")
+        assert source == "fast"
+        assert data["Close"].iloc[0] == 2.0
+        assert time.monotonic() - start_time < 1.0
+
+    async def test_hedged_paced_attempts_do_not_starve_the_preferred_provider(self):
+        """Test that Alpha Vantage attempts cancelled while paced do not grow its rate limiter wait"""
+        limiter = TokenBucketRateLimiter(rate_per_minute=600, capacity=1)  # One token every 0.1 seconds
+
+        async def alpha_vantage(symbol, interval):
+            await limiter.acquire()
+            return bars(1.0)
+
+        async def yahoo_finance(symbol, interval):
+            await asyncio.sleep(0.01)
+            return bars(2.0)
+
+        router = ProviderRouter({"alpha_vantage": alpha_vantage, "yahoo_finance": yahoo_finance}, hedge_delay=0.02)
+        sources = [(await router.fetch("AAPL", "5min"))[1] for _ in range(20)]
+        await asyncio.sleep(0.01)  # Let the last cancelled attempt unwind
+
+        # Hedged refreshes go to Yahoo, but Alpha Vantage still wins whenever a token has refilled
+        assert "yahoo_finance" in sources and "alpha_vantage" in sources[5:]
+        assert limiter._reserve() <= 0.1 + 0.02
+
+    async def test_only_timeouts_count_as_deadline_misses(self):
+        """Test that providers answering empty in time are not counted as missing the deadline"""
+        async def empty(symbol, interval):
+            return pd.DataFrame()
+
+        async def hanging(symbol, interval):
+            await asyncio.sleep(5)
+
+        before = metrics.counter("provider_deadline_misses")
+        assert await ProviderRouter({"a": empty, "b": empty}, hedge_delay=0.01).fetch("EMPTY", "5min") == (None, None)
+        assert metrics.counter("provider_deadline_misses") == before
+        assert await ProviderRouter({"hanging": hanging}, deadline=0.01).fetch("SLOW", "5min") == (None, None)
+        assert metrics.counter("provider_deadline_misses") == before + 1
+
+    async def test_deadline_and_repeated_errors_open_the_circuit(self):
+        """Test that a provider missing the deadline repeatedly is skipped until its cooldown ends"""
+        calls = []
+
+        async def hanging(symbol, interval):
+            calls.append(symbol)
+            await asyncio.sleep(5)
+
+        router = ProviderRouter({"hanging": hanging}, deadline=0.01)
+        router.breaker.failure_threshold = 2
+        for _ in range(2):
+            assert await router.fetch("AAPL", "5min") == (None, None)
+        assert not router.breaker.allows("hanging", "AAPL")
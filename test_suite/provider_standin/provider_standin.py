@@ -0,0 +1,70 @@
+import os
+
+import pytest
+from unittest.mock import Mock
+
+from logic.cache.shared_snapshots import snapshot_name
+from loadtest.provider_standin import ProviderStandIn
+from loadtest.run_load_test import run_load_test
+from services.alpha_vantage_fetcher import alpha_vantage_fetcher
+from services.alpha_vantage_fetcher.alpha_vantage_fetcher import AlphaVantageFetcher
+from services.http_client.http_client import TokenBucketRateLimiter, close_http_session
+
+
+@pytest.fixture
+def standin():
+    with ProviderStandIn(latency=0.0, invalid_symbols={"NOPE.NS"}) as server:
+        yield server
+
+
+def uncached_fetcher(symbol, interval, standin, mocker):
+    mocker.patch.object(AlphaVantageFetcher, "BASE_URL", f"{standin.url}/query")
+    mocker.patch.object(alpha_vantage_fetcher, "alpha_vantage_rate_limiter", TokenBucketRateLimiter(6000))
+    fetcher = AlphaVantageFetcher(symbol, interval)
+    fetcher.cache = Mock(get=Mock(return_value=None))
+    return fetcher
+
+
+@pytest.mark.asyncio
+class TestProviderStandIn:
+    async def test_alpha_vantage_responses_parse_like_the_real_api(self, standin, mocker):
+        """Test that the fetcher reads synthetic bars and the invalid-symbol answer from the stand-in"""
+        data = await uncached_fetcher("STANDIN.NS", "5min", standin, mocker).fetch_intraday_data(fallback_to_yahoo=False)
+        missing = await uncached_fetcher("NOPE.NS", "5min", standin, mocker).fetch_intraday_data(fallback_to_yahoo=False)
+        await close_http_session()
+
+        assert 0 < len(data) <= 100 and data.index.is_monotonic_increasing  # Only the latest day is kept
+        assert (data["High"] >= data["Close"]).all() and (data["Low"] <= data["Close"]).all()
+        assert missing.empty
+        assert standin.calls == {"alpha_vantage": {"ok": 1, "invalid": 1}}
+
+    async def test_failures_and_quota_are_reported_to_the_client(self, mocker):
+        """Test that injected errors return None and requests over the quota get rate limit notes"""
+        with ProviderStandIn(latency=0.0, quota_per_minute=1) as server:
+            first = await uncached_fetcher("STANDIN.NS", "1min", server, mocker).fetch_intraday_data(fallback_to_yahoo=False)
+            limited = await uncached_fetcher("STANDIN.NS", "1min", server, mocker).fetch_intraday_data(fallback_to_yahoo=False)
+            yahoo = await server.yahoo_provider("STANDIN.NS", "1min")
+        with ProviderStandIn(latency=0.0, error_rate=1.0) as server:
+            failed = await uncached_fetcher("STANDIN.NS", "1min", server, mocker).fetch_intraday_data(fallback_to_yahoo=False)
+            yahoo_failed = await server.yahoo_provider("STANDIN.NS", "1min")
+        await close_http_session()
+
+        assert not first.empty
+        assert limited is None and failed is None and yahoo_failed is None
+        assert len(yahoo) == 100 and str(yahoo.index.tz) == "UTC"
+
+
+class TestLoadTest:
+    def test_sessions_share_upstream_fetches(self, standin):
+        """Test that many sessions on a few tickers cost about one upstream call per ticker"""
+        tickers = ["LOADA.NS", "LOADB.NS"]
+        report = run_load_test(standin, sessions=6, duration=1.5, tickers=tickers, refresh=(0.2, 0.4),
+                               alpha_vantage_rate=6000)
+
+        # Slow runners get fewer refreshes, never more upstream calls: at most one refetch per ticker at a bar close
+        upstream = sum(report["upstream_calls"]["alpha_vantage"].values())
+        assert report["refreshes"] >= len(tickers)
+        assert report["outcomes"] == {"ok": report["refreshes"]}
+        assert upstream <= 2 * len(tickers)
+        assert not os.path.exists(os.path.join("cache", "snapshots", snapshot_name("bars", tickers[0], "5min")))
+        assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99"]
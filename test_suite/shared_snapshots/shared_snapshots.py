@@ -0,0 +1,128 @@
+import os
+import sys
+import asyncio
+import subprocess
+import numpy as np
+import pytest
+import pandas as pd
+
+from logic.cache.frame_schema import compact_ohlcv
+from logic.cache.market_data_cache import MarketDataCache
+from logic.cache.shared_snapshots import SharedSnapshotStore, snapshot_name
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _bars(close=100.0, periods=5):
+    index = pd.date_range("2024-01-02 09:15", periods=periods, freq="5min", tz="Asia/Kolkata")
+    prices = close + np.arange(periods, dtype="float64")
+    frame = compact_ohlcv(pd.DataFrame({"Open": prices, "High": prices + 1, "Low": prices - 1, "Close": prices,
+                                        "Volume": 1000}, index=index))
+    frame.attrs["data_source"] = "alpha_vantage"
+    return frame
+
+
+class TestSharedSnapshots:
+    def test_round_trip_is_a_read_only_mapping(self, tmp_path):
+        """Test that a published frame reads back unchanged, read-only, and is mapped once per version"""
+        store = SharedSnapshotStore(str(tmp_path))
+        bars = _bars()
+        store.publish("bars__RELIANCE.NS__5min", bars)
+
+        shared = store.read("bars__RELIANCE.NS__5min")
+        pd.testing.assert_frame_equal(shared, bars, check_freq=False)
+        assert shared.attrs == {"data_source": "alpha_vantage"}
+        assert not shared["Close"].to_numpy().flags.writeable
+        assert store.read("bars__RELIANCE.NS__5min") is shared
+        assert store.read("missing") is None
+
+    def test_replace_is_atomic_for_readers(self, tmp_path):
+        """Test that a new version replaces the file while frames of the old version stay usable"""
+        store = SharedSnapshotStore(str(tmp_path))
+        store.publish("bars", _bars(100.0))
+        old = store.read("bars")
+        store.publish("bars", _bars(200.0))
+
+        assert store.read("bars")["Close"].iloc[0] == 200.0
+        assert old["Close"].iloc[0] == 100.0
+        assert sorted(os.listdir(tmp_path)) == ["bars.arrow"]  # No temporary files left behind
+
+    def test_expired_snapshots_are_not_served(self, tmp_path):
+        """Test that a snapshot past its deadline reads as missing"""
+        store = SharedSnapshotStore(str(tmp_path))
+        store.publish("bars", _bars(), expires_at=1.0)
+        assert store.read("bars") is None
+        assert snapshot_name("bars", "^NSEI", "5min") == "bars___NSEI__5min"
+
+    def test_long_names_are_shortened(self, tmp_path):
+        """Test that keys too long for a file name get a digest instead of failing"""
+        store = SharedSnapshotStore(str(tmp_path))
+        symbols = ",".join(f"SYMBOL{i}.NS" for i in range(50))
+        name = snapshot_name("bars", symbols, "5min")
+        assert len(name) <= 120 and name != snapshot_name("bars", symbols + ",EXTRA.NS", "5min")
+        assert store.read(name) is None
+        assert store.read("x" * 300) is None  # An over-long name reads as a miss, not an OSError
+        store.publish(name, _bars())
+        assert store.read(name) is not None
+
+    def test_snapshot_is_shared_with_another_process(self, tmp_path):
+        """Test that a snapshot published by one process is read by another"""
+        store = SharedSnapshotStore(str(tmp_path))
+        store.publish("bars", _bars(123.0))
+        script = ("import sys; from logic.cache.shared_snapshots import SharedSnapshotStore; "
+                  f"print(SharedSnapshotStore({str(tmp_path)!r}).read('bars')['Close'].iloc[0])")
+        env = dict(os.environ, PYTHONPATH=ROOT)
+        output = subprocess.run([sys.executable, "-c", script], cwd=tmp_path, env=env, capture_output=True,
+                                text=True, check=True).stdout
+        assert output.strip().splitlines()[-1] == "123.0"
+
+
+@pytest.mark.asyncio
+class TestMarketDataCacheSharing:
+    async def test_second_process_reuses_published_bars(self, tmp_path, mocker):
+        """Test that a cache miss is served from another process's snapshot instead of upstream"""
+        store = SharedSnapshotStore(str(tmp_path))
+        mocker.patch("logic.cache.market_data_cache.get_shared_snapshots", return_value=store)
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            return _bars()
+
+        # Two caches stand in for two Streamlit processes
+        first = await MarketDataCache(share_across_processes=True).get_or_fetch("TCS.NS", "5min", fetch, share=True)
+        second = await MarketDataCache(share_across_processes=True).get_or_fetch("TCS.NS", "5min", fetch, share=True)
+
+        assert len(calls) == 1
+        pd.testing.assert_frame_equal(second, first, check_freq=False)
+        assert second is store.read(snapshot_name("bars", "TCS.NS", "5min"))
+
+    async def test_snapshots_expire_with_the_cache_ttl_and_on_invalidate(self, tmp_path, mocker):
+        """Test that a shared snapshot never outlives a local entry and is dropped by invalidate"""
+        store = SharedSnapshotStore(str(tmp_path))
+        mocker.patch("logic.cache.market_data_cache.get_shared_snapshots", return_value=store)
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            return _bars(100.0 + len(calls))
+
+        cache = MarketDataCache(ttl_seconds=0.05, share_across_processes=True)
+        await cache.get_or_fetch("INFY.NS", "60min", fetch, share=True)
+        await asyncio.sleep(0.1)
+        refreshed = await cache.get_or_fetch("INFY.NS", "60min", fetch, share=True)
+        assert len(calls) == 2 and refreshed["Close"].iloc[0] == 102.0
+
+        cache.invalidate("INFY.NS", "60min")
+        assert store.read(snapshot_name("bars", "INFY.NS", "60min")) is None
+
+    async def test_unshared_keys_do_not_touch_snapshots(self, tmp_path, mocker):
+        """Test that keys fetched without share=True are never published"""
+        store = SharedSnapshotStore(str(tmp_path))
+        mocker.patch("logic.cache.market_data_cache.get_shared_snapshots", return_value=store)
+
+        async def fetch():
+            return _bars()
+
+        await MarketDataCache(share_across_processes=True).get_or_fetch("scan:A,B", "5min", fetch)
+        assert store.stats()["snapshots"] == 0
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from logic.indicators.indicators import IndicatorCalculator
+from logic.indicators.streaming_indicators import StreamingIndicatorEngine
+
+
+def make_ohlc(rows, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, rows))
+    index = pd.date_range("2024-01-02 09:15", periods=rows, freq="1min")
+    return pd.DataFrame({
+        "High": close + rng.random(rows),
+        "Low": close - rng.random(rows),
+        "Close": close,
+    }, index=index)
+
+
+def batch_indicators(df):
+    return IndicatorCalculator(df.copy()).compute_all_indicators()
+
+
+# Tests for StreamingIndicatorEngine
+class TestStreamingIndicatorEngine:
+    columns = ["RSI_14", "RSI_9", "CCI_20", "ADX_20", "WT1", "WT2"]
+
+    def test_seed_matches_batch(self):
+        """Test that seeding reproduces the TA-Lib batch results"""
+        df = make_ohlc(300)
+        streamed = StreamingIndicatorEngine().seed(df)
+        expected = batch_indicators(df)
+        for column in self.columns:
+            np.testing.assert_allclose(streamed[column], expected[column], rtol=1e-9, atol=1e-9)
+
+    def test_update_frame_processes_new_bars_only(self):
+        """Test that extending the frame bar by bar matches a full recomputation"""
+        df = make_ohlc(200)
+        engine = StreamingIndicatorEngine()
+        engine.update_frame(df.iloc[:150])
+        for end in range(151, 201):
+            streamed = engine.update_frame(df.iloc[:end])
+        expected = batch_indicators(df)
+        for column in self.columns:
+            np.testing.assert_allclose(streamed[column], expected[column], rtol=1e-9, atol=1e-9)
+
+    def test_forming_bar_is_replaced(self):
+        """Test that a revised last bar replaces the forming one instead of being appended"""
+        df = make_ohlc(120)
+        forming = df.copy()
+        forming.iloc[-1, forming.columns.get_loc("Close")] += 5
+        engine = StreamingIndicatorEngine()
+        engine.seed(forming)
+        streamed = engine.update_frame(df)
+        expected = batch_indicators(df)
+        assert len(streamed) == len(df)
+        for column in self.columns:
+            np.testing.assert_allclose(streamed[column], expected[column], rtol=1e-9, atol=1e-9)
@@ -0,0 +1,34 @@
+from logic.cache.symbol_registry import SymbolRegistry
+
+SEED = {"Reliance Industries": "RELIANCE.NS", "Tata Steel": "TATASTEEL.NS", "Tata Motors": "TATAMOTORS.NS"}
+
+
+class TestSymbolRegistry:
+    def test_results_persist_and_expire(self, tmp_path):
+        """Test that validation results survive a restart and are forgotten after their TTL"""
+        path = str(tmp_path / "symbols.sqlite3")
+        registry = SymbolRegistry(path, seed=SEED)
+        assert registry.lookup("AAPL") is None
+        registry.record("AAPL", True, "Apple Inc.")
+        registry.record("NOPE", False)
+        registry.close()
+
+        reopened = SymbolRegistry(path, seed=SEED)
+        assert reopened.lookup("AAPL") is True
+        assert reopened.lookup("NOPE") is False
+        assert reopened.lookup("RELIANCE.NS") is True
+
+        expired = SymbolRegistry(path, valid_ttl=-1, invalid_ttl=-1, seed=SEED)
+        assert expired.lookup("AAPL") is None
+        assert expired.lookup("NOPE") is None
+
+    def test_search_ranks_prefixes_before_fuzzy_matches(self, tmp_path):
+        """Test symbol and company-name prefix suggestions, with fuzzy matches for typos"""
+        registry = SymbolRegistry(str(tmp_path / "symbols.sqlite3"), seed=SEED)
+        registry.record("AAPL", True, "Apple Inc.")
+
+        assert [symbol for symbol, _ in registry.search("tata")] == ["TATAMOTORS.NS", "TATASTEEL.NS"]
+        assert registry.search("apple") == [("AAPL", "Apple Inc.")]
+        assert registry.search("RELIANC")[0][0] == "RELIANCE.NS"
+        assert registry.search("RELAINCE.NS")[0][0] == "RELIANCE.NS"
+        assert registry.search("") == []
@@ -1,5 +1,7 @@
+import numpy as np
 import pandas as pd
 
+from logic.indicators.indicator_pipeline import IndicatorCache
 from logic.indicators.indicators import IndicatorCalculator
 
 
@@ -26,3 +28,35 @@ class TestIndicatorCalculator:
         wt1, wt2 = calculator.calculate_wavetrend()
         assert len(wt1) == len(test_data)
         assert len(wt2) == len(test_data)
+
+    def test_memoized_indicators_match_individual_indicators(self):
+        """Test that compute_all_indicators' memoized results equal the per-indicator methods"""
+        rng = np.random.default_rng(7)
+        close = 100 + rng.normal(0, 1, 300).cumsum()
+        test_data = pd.DataFrame({"High": close + 1, "Low": close - 1, "Close": close})
+        calculator = IndicatorCalculator(test_data.copy())
+        result = calculator.compute_all_indicators()
+
+        pd.testing.assert_series_equal(result["RSI_14"], calculator.calculate_rsi(14), check_names=False)
+        pd.testing.assert_series_equal(result["CCI_20"], calculator.calculate_cci(20), check_names=False)
+        pd.testing.assert_series_equal(result["ADX_20"], calculator.calculate_adx(20), check_names=False)
+        wt1, wt2 = calculator.calculate_wavetrend()
+        pd.testing.assert_series_equal(result["WT1"], wt1, check_names=False)
+        pd.testing.assert_series_equal(result["WT2"], wt2, check_names=False)
+
+    def test_pipeline_results_are_memoized(self):
+        """Test that the same data and parameters are computed once, while changed data is recomputed"""
+        close = np.linspace(100, 110, 100)
+        test_data = pd.DataFrame({"High": close + 1, "Low": close - 1, "Close": close})
+        pipeline = IndicatorCache()
+
+        first = pipeline.compute(test_data, columns=["RSI_14", "WT1"])
+        second = pipeline.compute(test_data.copy(), columns=["RSI_14", "WT1"])
+        pipeline.compute(test_data, columns=["RSI_14", "WT1"], rsi_periods=(9,))
+        changed = test_data.copy()
+        changed.loc[99, "Close"] += 1
+        pipeline.compute(changed, columns=["RSI_14", "WT1"])
+
+        assert list(first.columns) == ["RSI_14", "WT1"]
+        pd.testing.assert_frame_equal(first, second)
+        assert (pipeline.hits, pipeline.misses) == (1, 3)
@@ -0,0 +1,63 @@
+import pytest
+import pandas as pd
+
+from logic.cache.tiered_cache import TieredCache, bar_close_expiry, cache_key
+
+
+class TestTieredCache:
+    def test_expiry_is_aligned_to_bar_close(self):
+        """Test that entries expire when the current bar closes, not after a fixed TTL"""
+        assert bar_close_expiry("1min", now=120.0 + 45) == pytest.approx(15.0)
+        assert bar_close_expiry("60min", now=3600.0 + 600) == pytest.approx(3000.0)
+        assert bar_close_expiry("5min", now=300.0) == pytest.approx(300.0)
+
+    def test_expiry_is_aligned_to_the_exchange_session(self):
+        """Test that NSE 60min bars close at 10:15 IST and US 60min bars at 10:30 New York"""
+        ist_09_20 = pd.Timestamp("2024-01-02 09:20", tz="Asia/Kolkata").timestamp()
+        assert bar_close_expiry("60min", now=ist_09_20, symbol="RELIANCE.NS") == pytest.approx(55 * 60)
+        assert bar_close_expiry("30min", now=ist_09_20, symbol="^NSEI") == pytest.approx(25 * 60)
+        assert bar_close_expiry("15min", now=ist_09_20, symbol="TCS.BO") == pytest.approx(10 * 60)
+        for day in ("2024-01-02", "2024-07-02"):  # Either side of daylight saving
+            new_york_09_40 = pd.Timestamp(f"{day} 09:40", tz="America/New_York").timestamp()
+            assert bar_close_expiry("60min", now=new_york_09_40, symbol="AAPL") == pytest.approx(50 * 60)
+
+    def test_memory_tier_is_lru_and_disk_tier_survives(self, tmp_path):
+        """Test that evicted memory entries are still served (and counted) from disk"""
+        cache = TieredCache(str(tmp_path / "cache"), memory_items=2)
+        keys = [cache_key("alpha_vantage", symbol, "5min") for symbol in ("AAA", "BBB", "CCC")]
+        for close, key in enumerate(keys):
+            cache.set(key, pd.DataFrame({"Close": [float(close)]}), expire=60)
+
+        assert cache.get(keys[2])["Close"].iloc[0] == 2.0
+        assert cache.get(keys[0])["Close"].iloc[0] == 0.0  # Evicted from memory, read from disk
+        assert cache.get("missing") is None
+
+        stats = cache.stats()
+        assert (stats["memory_hits"], stats["disk_hits"], stats["disk_misses"]) == (1, 1, 1)
+        assert stats["memory_items"] == 2
+        assert cache_key("alpha_vantage", "AAA", "5min") != cache_key("alpha_vantage", "AAA", "1min")
+        cache.close()
+
+    def test_memory_tier_is_bounded_by_bytes(self, tmp_path):
+        """Test that the memory tier evicts by measured frame size, not just entry count"""
+        frame = pd.DataFrame({"Close": [1.0] * 1000})  # About 9 KB with its index
+        cache = TieredCache(str(tmp_path / "cache"), memory_bytes=20_000)
+        for symbol in ("AAA", "BBB", "CCC"):
+            cache.set(symbol, frame, expire=60)
+
+        sizes = cache.entry_sizes()
+        assert list(sizes) == ["BBB", "CCC"]
+        stats = cache.stats()
+        assert stats["memory_bytes"] == sum(sizes.values()) <= stats["memory_bytes_limit"]
+        assert cache.get("AAA") is not None  # Still on disk
+
+        cache.delete("CCC")
+        assert cache.stats()["memory_bytes"] == sum(cache.entry_sizes().values())
+        cache.close()
+
+    def test_expired_entries_are_not_served(self, tmp_path):
+        """Test that an entry past its bar-close deadline is dropped from both tiers"""
+        cache = TieredCache(str(tmp_path / "cache"))
+        cache.set("key", "value", expire=-1)
+        assert cache.get("key") is None
+        cache.close()
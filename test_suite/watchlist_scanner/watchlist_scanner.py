@@ -0,0 +1,75 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from constants.nifty_50_stock_symbols import NIFTY_50_STOCKS
+from logic.cache.market_data_cache import market_data_cache
+from logic.indicators.indicators import IndicatorCalculator
+from logic.indicators.panel_indicators import PANEL_TOLERANCE
+from logic.scanner.watchlist_scanner import WatchlistScanner
+
+
+def make_batch(symbols, rows=60):
+    rng = np.random.default_rng(1)
+    index = pd.date_range("2024-01-02 09:15", periods=rows, freq="5min")
+    frames = {}
+    for symbol in symbols:
+        close = 100 + np.cumsum(rng.normal(0, 1, rows))
+        frames[symbol] = pd.DataFrame({
+            "Open": close, "High": close + 1, "Low": close - 1,
+            "Close": close, "Volume": 1000.0
+        }, index=index)
+    return pd.concat(frames, axis=1)
+
+
+@pytest.mark.asyncio
+class TestWatchlistScanner:
+    async def test_scan_batches_downloads(self, mocker):
+        """Test that symbols are fetched in batches and every symbol gets a row"""
+        stocks = {f"Stock {i}": f"SYM{i}.NS" for i in range(25)}
+        download = mocker.patch("yfinance.download", side_effect=lambda symbols, **kwargs: make_batch(symbols))
+
+        results = await WatchlistScanner(stocks, "5min", batch_size=10)._scan()
+
+        assert download.call_count == 3
+        assert list(results["Symbol"]) == list(stocks.values())
+        assert results["RSI_14"].notna().all()
+
+    async def test_missing_symbols_are_kept_empty(self, mocker):
+        """Test that a symbol missing from the download still shows up without values"""
+        stocks = {"Present": "AAA.NS", "Missing": "BBB.NS"}
+        mocker.patch("yfinance.download", return_value=make_batch(["AAA.NS"]))
+
+        results = await WatchlistScanner(stocks, "5min")._scan()
+
+        by_symbol = results.set_index("Symbol")
+        assert pd.isna(by_symbol.loc["BBB.NS", "RSI_14"])
+        assert by_symbol.loc["AAA.NS", "RSI_14"] > 0
+
+    async def test_panel_values_match_per_symbol_indicators(self, mocker):
+        """Test that the scanner's panel pass reports the same latest values as TA-Lib per symbol"""
+        stocks = {"First": "AAA.NS", "Second": "BBB.NS"}
+        batch = make_batch(list(stocks.values()))
+        mocker.patch("yfinance.download", return_value=batch)
+
+        results = (await WatchlistScanner(stocks, "5min")._scan()).set_index("Symbol")
+
+        for symbol in stocks.values():
+            expected = IndicatorCalculator(batch[symbol].copy()).compute_all_indicators().iloc[-1]
+            for column in ["RSI_14", "RSI_9", "CCI_20", "ADX_20", "WT1", "WT2"]:
+                np.testing.assert_allclose(results.loc[symbol, column], expected[column], **PANEL_TOLERANCE)
+
+    async def test_full_nifty_50_scan_through_shared_cache(self, mocker):
+        """Test that scanning the whole NIFTY 50 through the process-wide cache is not treated as a bar snapshot"""
+        mocker.patch("yfinance.download", side_effect=lambda symbols, **kwargs: make_batch(symbols))
+        read = mocker.patch("logic.cache.market_data_cache.get_shared_snapshots")
+        scanner = WatchlistScanner(NIFTY_50_STOCKS, "5min")
+        scan_key = "scan:" + ",".join(sorted(NIFTY_50_STOCKS.values()))
+        market_data_cache.invalidate(scan_key, "5min")
+
+        results = await scanner.scan()
+
+        assert list(results["Symbol"]) == list(NIFTY_50_STOCKS.values())
+        read.return_value.read.assert_not_called()
+        read.return_value.publish.assert_not_called()
+        market_data_cache.invalidate(scan_key, "5min")
@@ -1,6 +1,9 @@
+import threading
 import pytest
+import pandas as pd
 from unittest.mock import Mock
 
+from logic.cache.bar_store import bar_store
 from services.yahoo_finance_fetcher.yahoo_finance_fetcher import YahooFinanceFetcher
 
 
@@ -25,3 +28,47 @@ class TestYahooFinanceFetcher:
         fetcher = YahooFinanceFetcher("INVALID", "5min")
         result = await fetcher.validate_symbol()
         assert result is False
+
+    async def test_failures_are_reported_without_streamlit(self, mocker):
+        """Test that failed fetches and validations only return None/False: they run off the script thread"""
+        mock_ticker = Mock()
+        mock_ticker.history.side_effect = RuntimeError("upstream down")
+        type(mock_ticker).info = property(Mock(side_effect=RuntimeError("upstream down")))
+        mocker.patch("yfinance.Ticker", return_value=mock_ticker)
+        st_error = mocker.patch("streamlit.error")
+
+        fetcher = YahooFinanceFetcher("DOWN.NS", "5min")
+        assert await fetcher.fetch_stock_data() is None
+        assert await fetcher.validate_symbol() is False
+        st_error.assert_not_called()
+
+    async def test_yfinance_is_only_used_off_the_event_loop_thread(self, mocker):
+        """Test that yfinance, imported on first use, is never imported or called on the shared loop"""
+        threads = []
+        mock_ticker = Mock()
+        mock_ticker.info = {"symbol": "THREAD.NS"}
+        mock_ticker.history.return_value = pd.DataFrame()
+        mocker.patch("yfinance.Ticker",
+                     side_effect=lambda symbol: threads.append(threading.current_thread()) or mock_ticker)
+
+        fetcher = YahooFinanceFetcher("THREAD.NS", "5min", incremental=False)
+        await fetcher.fetch_stock_data()
+        await fetcher.validate_symbol()
+        assert len(threads) == 2 and threading.current_thread() not in threads
+
+    async def test_incremental_fetch_appends_new_bars(self, mocker):
+        """Test that a refresh asks only for bars since the last one and replaces the forming bar"""
+        index = pd.date_range("2024-01-02 09:15", periods=3, freq="1min", tz="Asia/Kolkata")
+        first = pd.DataFrame({"Close": [100.0, 101.0, 102.0]}, index=index)
+        delta = pd.DataFrame({"Close": [102.5, 103.0]}, index=index[-1:].append(index[-1:] + pd.Timedelta("1min")))
+        mock_ticker = Mock()
+        mock_ticker.history.side_effect = [first, delta]
+        mocker.patch("yfinance.Ticker", return_value=mock_ticker)
+        bar_store.reset("yahoo_finance", "INCR.NS", "1m")
+
+        fetcher = YahooFinanceFetcher("INCR.NS", "1min")
+        await fetcher.fetch_stock_data()
+        result = await fetcher.fetch_stock_data()
+
+        assert mock_ticker.history.call_args_list[1].kwargs["start"] == index[-1]
+        assert list(result["Close"]) == [100.0, 101.0, 102.5, 103.0]
@@ -0,0 +1,43 @@
+import asyncio
+import threading
+
+from logging_config import logger
+
+_loop = None
+_thread = None
+_lock = threading.Lock()
+
+
+def get_event_loop():
+    """
+    Return the application's event loop, starting it on a daemon thread on first use.
+
+    Every Streamlit session submits its coroutines to this one long-lived loop, so pooled
+    HTTP sessions, rate limiters and in-flight fetches survive reruns.
+    """
+    global _loop, _thread
+    with _lock:
+        if _thread is None or not _thread.is_alive():
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(target=_loop.run_forever, name="app-event-loop", daemon=True)
+            _thread.start()
+            logger.info("Started application event loop thread.")
+        return _loop
+
+
+def submit(coro):
+    """Schedule ``coro`` on the application loop and return a ``concurrent.futures.Future``."""
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+
+
+def run_coroutine(coro, timeout: float = None):
+    """
+    Run ``coro`` on the application loop and block the calling thread until it finishes.
+
+    Coroutines run without the caller's Streamlit context, so they must not call ``st.*``;
+    render their results in the calling script thread instead.
+    """
+    if threading.current_thread() is _thread:
+        coro.close()
+        raise RuntimeError("run_coroutine() cannot be called from the event loop thread; await the coroutine.")
+    return submit(coro).result(timeout)
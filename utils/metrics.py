@@ -0,0 +1,191 @@
+import os
+import re
+import time
+import threading
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from logging_config import logger
+
+# Upper bounds of the span duration histogram, in seconds
+SPAN_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Durations kept per span series for the in-app panel's percentiles
+RECENT_DURATIONS = 256
+
+
+def _labels(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+class _SpanSeries:
+    def __init__(self):
+        self.bucket_counts = [0] * len(SPAN_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.recent = deque(maxlen=RECENT_DURATIONS)
+
+    def observe(self, seconds):
+        index = bisect_left(SPAN_BUCKETS, seconds)
+        if index < len(SPAN_BUCKETS):
+            self.bucket_counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+        self.recent.append(seconds)
+
+
+class MetricsRegistry:
+    """
+    Process-wide timing spans and counters for the fetch, compute and render stages.
+
+    ``span`` times a block (sync or inside a coroutine) into a histogram per span name and
+    label set; ``increment`` counts events such as cache hits or upstream requests.
+    ``render_prometheus`` writes everything in the Prometheus text format for the metrics
+    endpoint, ``span_summary`` and ``counter_summary`` feed the in-app performance panel.
+    """
+
+    def __init__(self, namespace: str = "dashboard"):
+        self.namespace = namespace
+        self._spans = {}  # (name, labels) -> _SpanSeries
+        self._counters = {}  # (name, labels) -> count
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **labels):
+        """Time the enclosed block as one ``name`` span; recorded even if the block raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            series = self._spans.get(key)
+            if series is None:
+                series = self._spans[key] = _SpanSeries()
+            series.observe(seconds)
+
+    def increment(self, name: str, amount: float = 1, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def counter(self, name: str, **labels):
+        with self._lock:
+            return self._counters.get((name, _labels(labels)), 0)
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+
+    def span_summary(self):
+        """One dict per span series: name, labels, count, mean, p50, p95 and max in milliseconds."""
+        with self._lock:
+            series = [(name, labels, s.count, s.total, s.maximum, sorted(s.recent))
+                      for (name, labels), s in self._spans.items()]
+        rows = []
+        for name, labels, count, total, maximum, recent in sorted(series):
+            rows.append({
+                "span": name,
+                "labels": ", ".join(f"{key}={value}" for key, value in labels),
+                "count": count,
+                "mean_ms": round(total / count * 1000, 2),
+                "p50_ms": round(recent[len(recent) // 2] * 1000, 2),
+                "p95_ms": round(recent[min(len(recent) - 1, int(len(recent) * 0.95))] * 1000, 2),
+                "max_ms": round(maximum * 1000, 2),
+            })
+        return rows
+
+    def counter_summary(self):
+        with self._lock:
+            counters = sorted(self._counters.items())
+        return [{"counter": name, "labels": ", ".join(f"{key}={value}" for key, value in labels), "value": value}
+                for (name, labels), value in counters]
+
+    def render_prometheus(self):
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            spans = sorted((key, list(s.bucket_counts), s.count, s.total) for key, s in self._spans.items())
+            counters = sorted(self._counters.items())
+
+        metric = f"{self.namespace}_span_seconds"
+        lines = [f"# HELP {metric} Duration of instrumented stages.", f"# TYPE {metric} histogram"]
+        for (name, labels), bucket_counts, count, total in spans:
+            labels = (("span", name),) + labels
+            cumulative = 0
+            for bound, bucket_count in zip(SPAN_BUCKETS, bucket_counts):
+                cumulative += bucket_count
+                lines.append(f"{metric}_bucket{_format_labels(labels, [('le', repr(bound))])} {cumulative}")
+            lines.append(f"{metric}_bucket{_format_labels(labels, [('le', '+Inf')])} {count}")
+            lines.append(f"{metric}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{metric}_count{_format_labels(labels)} {count}")
+
+        declared = set()
+        for (name, labels), value in counters:
+            metric = f"{self.namespace}_{re.sub(r'[^a-zA-Z0-9_]', '_', name)}_total"
+            if metric not in declared:
+                declared.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+# Single registry shared by all sessions of this Streamlit process.
+metrics = MetricsRegistry()
+
+_server = None
+_server_lock = threading.Lock()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = metrics.render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Scrapes would flood the application log
+
+
+def start_metrics_server(port: int = None, host: str = "0.0.0.0"):
+    """
+    Serve ``/metrics`` for Prometheus on a daemon thread, once per process.
+
+    The port defaults to the ``METRICS_PORT`` environment variable; without either, no
+    server is started. Returns the server, or None.
+    """
+    global _server
+    if port is None:
+        port = int(os.getenv("METRICS_PORT", "0")) or None
+    if port is None:
+        return None
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            except OSError as e:
+                logger.error("Could not start the metrics endpoint on port %d: %s", port, e)
+                return None
+            threading.Thread(target=_server.serve_forever, name="metrics-endpoint", daemon=True).start()
+            logger.info("Serving metrics on http://%s:%d/metrics", host, _server.server_address[1])
+        return _server
@@ -0,0 +1,19 @@
+import pandas as pd
+import streamlit as st
+
+from utils.metrics import metrics
+
+
+def render_performance_panel():
+    """Show this process's span timings and counters, e.g. to tell a slow provider from slow rendering."""
+    with st.expander("⏱️ Performance", expanded=True):
+        spans = metrics.span_summary()
+        if spans:
+            st.caption("Stage timings since the server started (percentiles over the latest runs)")
+            st.dataframe(pd.DataFrame(spans), use_container_width=True, hide_index=True)
+        else:
+            st.caption("No timings recorded yet.")
+        counters = metrics.counter_summary()
+        if counters:
+            st.caption("Cache, upstream and rate limit counters")
+            st.dataframe(pd.DataFrame(counters), use_container_width=True, hide_index=True)